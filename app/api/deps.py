@@ -1,11 +1,13 @@
-from typing import Generator, Optional
+from typing import Generator, Optional, Type, TypeVar, Union
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.core import security
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.db.session import get_db
 from app.models.user import User
@@ -23,6 +25,35 @@ student_oauth2 = OAuth2PasswordBearer(
     auto_error=False  # Permite endpoints que aceitam ambos os tipos de token
 )
 
+# Colunas de usuários e estudantes autenticados, por (tabela, id do token).
+# Quem alterar um deles (perfil, senha, ativação, privilégios) deve chamar
+# `invalidate_principal` depois do commit.
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_MAX_ENTRIES, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+Principal = TypeVar("Principal", User, Student)
+
+def load_principal(db: Session, model: Type[Principal], principal_id: int) -> Optional[Principal]:
+    """
+    Busca o usuário/estudante do token, usando o cache quando possível.
+    
+    No acerto o objeto é anexado à sessão com `merge(load=False)`, sem SELECT;
+    os endpoints podem alterá-lo e fazer commit normalmente.
+    """
+    key = (model.__tablename__, principal_id)
+    values = principal_cache.get(key)
+    if values is None:
+        principal = db.query(model).filter(model.id == principal_id).first()
+        if principal is not None:
+            principal_cache.set(key, {attr.key: getattr(principal, attr.key) for attr in inspect(model).column_attrs})
+        return principal
+    
+    principal = model(**values)
+    make_transient_to_detached(principal)
+    return db.merge(principal, load=False)
+
+def invalidate_principal(principal: Union[User, Student]) -> None:
+    principal_cache.invalidate((principal.__tablename__, principal.id))
+
 # ========== DEPENDÊNCIAS PARA ADMIN ==========
 
 def get_current_user(
@@ -38,7 +69,7 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(User).filter(User.id == token_data.sub).first()
+    user = load_principal(db, User, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -86,7 +117,7 @@ def get_current_student(
             detail="Could not validate credentials",
         )
     
-    student = db.query(Student).filter(Student.id == token_data.sub).first()
+    student = load_principal(db, Student, token_data.sub)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     return student
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, courses, students, certificates, validate, classes, enrollments
+from app.api.v1.endpoints import auth, courses, students, certificates, validate, classes, enrollments, metrics
 
 api_router = APIRouter()
 api_router.include_router(auth.router, tags=["auth"])
@@ -9,3 +9,4 @@ api_router.include_router(students.router, prefix="/students", tags=["students"]
 api_router.include_router(enrollments.router, prefix="/enrollments", tags=["enrollments"])
 api_router.include_router(certificates.router, prefix="/certificates", tags=["certificates"])
 api_router.include_router(validate.router, prefix="/validate", tags=["validate"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
@@ -1,13 +1,15 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
 from app.core import security
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.user import User
 from app.models.student import Student
 from app.schemas.token import Token
@@ -15,11 +17,35 @@ from app.schemas.student import StudentRegister, StudentLogin, StudentAuth
 
 router = APIRouter()
 
+async def _rehash_if_needed(db: AsyncSession, principal: Any, password: str) -> None:
+    """Regrava o hash com o custo atual do bcrypt se ele foi gerado com outro."""
+    if not security.needs_rehash(principal.hashed_password):
+        return
+    try:
+        principal.hashed_password = await security.password_hasher.hash(password)
+    except HTTPException:
+        # Pool cheio: o login segue e o hash é refeito em um próximo login
+        return
+    await db.commit()
+    deps.invalidate_principal(principal)
+    security.password_hasher.record_rehash()
+
+async def _registration_conflict(db: AsyncSession, student_in: StudentRegister) -> Optional[str]:
+    """Mensagem de erro se o email ou o CPF já estiverem cadastrados."""
+    existing_email = (await db.execute(select(Student.id).where(Student.email == student_in.email))).first()
+    if existing_email:
+        return "Email already registered"
+    
+    existing_cpf = (await db.execute(select(Student.id).where(Student.cpf == student_in.cpf))).first()
+    if existing_cpf:
+        return "CPF already registered"
+    return None
+
 # ========== ENDPOINTS DE ADMIN ==========
 
 @router.post("/login/access-token", response_model=Token)
-def login_access_token(
-    db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login_access_token(
+    db: AsyncSession = Depends(get_async_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     Realizar login e obter token JWT de acesso.
@@ -39,13 +65,16 @@ def login_access_token(
     token = response.json()["access_token"]
     ```
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    user = (await db.execute(select(User).where(User.email == form_data.username))).scalars().first()
+    # Devolve a conexão ao pool antes do bcrypt, que pode esperar na fila
+    await db.commit()
+    if not user or not await security.password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Incorrect email or password"
         )
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    await _rehash_if_needed(db, user, form_data.password)
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
@@ -59,9 +88,9 @@ def login_access_token(
 # ========== ENDPOINTS DE ESTUDANTES ==========
 
 @router.post("/students/register", response_model=StudentAuth)
-def register_student(
+async def register_student(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     student_in: StudentRegister,
 ) -> Any:
     """
@@ -94,38 +123,35 @@ def register_student(
     ```
     """
 
-    existing_email = db.query(Student).filter(Student.email == student_in.email).first()
-    if existing_email:
-        raise HTTPException(
-            status_code=400,
-            detail="Email already registered"
-        )
-    
-    existing_cpf = db.query(Student).filter(Student.cpf == student_in.cpf).first()
-    if existing_cpf:
-        raise HTTPException(
-            status_code=400,
-            detail="CPF already registered"
-        )
+    conflict = await _registration_conflict(db, student_in)
+    if conflict:
+        raise HTTPException(status_code=400, detail=conflict)
+    await db.commit()
     
     student = Student(
         name=student_in.name,
         email=student_in.email,
         cpf=student_in.cpf,
-        hashed_password=security.get_password_hash(student_in.password),
+        hashed_password=await security.password_hasher.hash(student_in.password),
         authorized=True,
         is_active=True,
     )
     db.add(student)
-    db.commit()
-    db.refresh(student)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Outro registro com o mesmo email/CPF entrou enquanto a senha era processada
+        await db.rollback()
+        conflict = await _registration_conflict(db, student_in)
+        raise HTTPException(status_code=400, detail=conflict or "Email already registered")
+    await db.refresh(student)
     
     return student
 
 @router.post("/students/login", response_model=Token)
-def login_student(
+async def login_student(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     login_data: StudentLogin,
 ) -> Any:
     """
@@ -161,7 +187,9 @@ def login_student(
     ```
     """
 
-    student = db.query(Student).filter(Student.email == login_data.email).first()
+    student = (await db.execute(select(Student).where(Student.email == login_data.email))).scalars().first()
+    # Devolve a conexão ao pool antes do bcrypt, que pode esperar na fila
+    await db.commit()
     
     if not student or not student.hashed_password:
         raise HTTPException(
@@ -169,7 +197,7 @@ def login_student(
             detail="Incorrect email or password"
         )
     
-    if not security.verify_password(login_data.password, student.hashed_password):
+    if not await security.password_hasher.verify(login_data.password, student.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect email or password"
@@ -177,6 +205,7 @@ def login_student(
     
     if not student.is_active:
         raise HTTPException(status_code=400, detail="Inactive student account")
+    await _rehash_if_needed(db, student, login_data.password)
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
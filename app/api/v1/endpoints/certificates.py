@@ -1,18 +1,25 @@
 import os
-from typing import Any, List
+import tempfile
+from typing import Any, List, Literal
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.config import settings
 from app.db.session import get_db
 from app.models.certificate import Certificate
+from app.models.certificate_job import CertificateJob
 from app.models.student import Student
 from app.models.course import Course
 from app.models.class_model import Class
 from app.models.enrollment import Enrollment
 from app.schemas.certificate import Certificate as CertificateSchema
-from app.services.pdf_service import generate_certificate_pdf, generate_bulk_certificates_zip
+from app.schemas.certificate_job import CertificateJob as CertificateJobSchema
+from app.services.certificate_jobs import certificate_job_runner
+from app.services.certificate_service import build_certificate_snapshot, certificates_by_cpf_cache, issue_class_certificates
+from app.services.pdf_service import prepare_bulk_jobs, iter_bulk_certificates_zip, write_class_booklet
 from app.services.templates.registry import TemplateRegistry
 
 router = APIRouter()
@@ -33,6 +40,7 @@ def create_certificates_by_class(
     *,
     db: Session = Depends(get_db),
     class_id: int,
+    output: Literal["zip", "booklet"] = "zip",
     current_user = Depends(deps.get_current_active_superuser),
     background_tasks: BackgroundTasks,
 ) -> Any:
@@ -41,7 +49,14 @@ def create_certificates_by_class(
     
     Gera certificados simultaneamente para todos os alunos autorizados de uma turma
     e retorna um arquivo ZIP contendo todos os PDFs para download.
-    O arquivo ZIP é automaticamente apagado após o download.
+    O ZIP é transmitido enquanto é gerado: cada PDF é renderizado em memória e
+    enviado como uma entrada do arquivo, sem arquivos temporários no servidor.
+    
+    Com `output=booklet` retorna um único PDF com todos os certificados em sequência
+    (caderno da turma para impressão), com fontes e imagens compartilhadas. O caderno
+    é montado em memória, então só é aceito para turmas de até
+    `CERTIFICATE_BOOKLET_MAX_PAGES` certificados; o arquivo temporário é removido
+    após o download ou se a geração falhar.
     
     **Exemplo de uso:**
     ```python
@@ -68,7 +83,7 @@ def create_certificates_by_class(
     1. Listar alunos da turma: `GET /classes/{id}/students`
     2. Autorizar alunos aprovados individualmente
     3. Gerar certificados em massa: `POST /certificates/bulk-class`
-    4. Download do ZIP (arquivo é apagado automaticamente após o download)
+    4. Download do ZIP (transmitido à medida que os PDFs são gerados)
     5. Distribuir PDFs individuais aos alunos
     """
     class_obj = db.query(Class).filter(Class.id == class_id).first()
@@ -79,61 +94,156 @@ def create_certificates_by_class(
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
-    enrollments = db.query(Enrollment).filter(Enrollment.class_id == class_id).all()
+    certificates = issue_class_certificates(db, class_obj, course)
     
-    if not enrollments:
-        raise HTTPException(status_code=404, detail="No students enrolled in this class")
+    if not certificates:
+        has_enrollments = db.query(Enrollment.id).filter(Enrollment.class_id == class_id).first()
+        if not has_enrollments:
+            raise HTTPException(status_code=404, detail="No students enrolled in this class")
+        
+        raise HTTPException(
+            status_code=400, 
+            detail="No certificates could be generated for this class."
+        )
     
-    certificates = []
+    if output == "booklet" and len(certificates) > settings.CERTIFICATE_BOOKLET_MAX_PAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Booklets are limited to {settings.CERTIFICATE_BOOKLET_MAX_PAGES} certificates "
+                f"({len(certificates)} in this class). Use output=zip or POST /certificates/bulk-class/jobs."
+            )
+        )
     
-    for enrollment in enrollments:
-        student = db.query(Student).filter(Student.id == enrollment.student_id).first()
-        
-        if not student:
-            continue
+    # Resolve os dados ainda com a sessão aberta; a renderização acontece durante o envio
+    jobs = prepare_bulk_jobs(certificates, db)
+    
+    if output == "booklet":
+        booklet_file = tempfile.NamedTemporaryFile(prefix=f"caderno_turma_{class_id}_", suffix=".pdf", delete=False)
+        booklet_path = booklet_file.name
+        try:
+            with booklet_file:
+                write_class_booklet(jobs, booklet_file)
+        except BaseException:
+            # Não deixa PDFs parciais para trás quando a renderização falha
+            cleanup_file(booklet_path)
+            raise
         
-        existing_cert = db.query(Certificate).filter(
-            Certificate.student_id == student.id,
-            Certificate.course_id == class_obj.course_id
-        ).first()
+        # Agendar remoção do PDF após o download
+        background_tasks.add_task(cleanup_file, booklet_path)
         
-        if existing_cert:
-            certificates.append(existing_cert)
-        else:
-            snapshot = {
-                "student_name": student.name,
-                "student_cpf": student.cpf,
-                "course_name": course.name,
-                "course_workload": course.workload,
-                "class_name": class_obj.name
-            }
-            
-            certificate = Certificate(
-                student_id=student.id,
-                course_id=class_obj.course_id,
-                template_id=class_obj.certificate_template,
-                data_snapshot=snapshot
-            )
-            db.add(certificate)
-            db.commit()
-            db.refresh(certificate)
-            certificates.append(certificate)
+        return FileResponse(
+            booklet_path,
+            media_type="application/pdf",
+            filename=f"certificados_turma_{class_id}.pdf"
+        )
     
-    if not certificates:
-        raise HTTPException(
-            status_code=400, 
-            detail="No certificates could be generated for this class."
+    return StreamingResponse(
+        iter_bulk_certificates_zip(jobs),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="certificados_turma_{class_id}.zip"'}
+    )
+
+@router.post("/bulk-class/jobs", response_model=CertificateJobSchema, status_code=202)
+def create_certificates_by_class_job(
+    *,
+    db: Session = Depends(get_db),
+    class_id: int,
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Agendar a geração de certificados em massa de uma turma (ADMIN - requer autenticação).
+    
+    Retorna imediatamente o job criado. A emissão e a renderização acontecem em
+    segundo plano e o progresso fica salvo no banco: se o servidor reiniciar,
+    o job é retomado de onde parou. Para turmas grandes, prefira este endpoint
+    a `POST /certificates/bulk-class`.
+    
+    **Exemplo de uso:**
+    ```python
+    import time
+    import requests
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    job = requests.post(
+        "http://localhost:8000/api/v1/certificates/bulk-class/jobs?class_id=1",
+        headers=headers
+    ).json()
+    
+    while job["status"] in ("pending", "running"):
+        time.sleep(2)
+        job = requests.get(
+            f"http://localhost:8000/api/v1/certificates/jobs/{job['id']}",
+            headers=headers
+        ).json()
+        print(f"{job['processed']}/{job['total']}")
+    
+    if job["status"] in ("completed", "partial"):
+        # partial: o ZIP não tem os certificados listados em job["failed_uuids"]
+        response = requests.get(
+            f"http://localhost:8000/api/v1/certificates/jobs/{job['id']}/download",
+            headers=headers
         )
+        with open("certificados_turma_1.zip", "wb") as f:
+            f.write(response.content)
+    ```
+    """
+    class_obj = db.query(Class).filter(Class.id == class_id).first()
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    
+    job = CertificateJob(class_id=class_id, created_by=current_user.id)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    
+    certificate_job_runner.submit(job.id)
+    
+    return job
+
+@router.get("/jobs/{job_id}", response_model=CertificateJobSchema)
+def get_certificate_job(
+    *,
+    db: Session = Depends(get_db),
+    job_id: str,
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Consultar status e progresso de um job de certificados (ADMIN - requer autenticação).
+    """
+    job = db.query(CertificateJob).filter(CertificateJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}/download")
+def download_certificate_job(
+    *,
+    db: Session = Depends(get_db),
+    job_id: str,
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Download do ZIP gerado por um job concluído (ADMIN - requer autenticação).
+    
+    Jobs `partial` também podem ser baixados: o ZIP não contém os certificados
+    de `failed_uuids`, que falharam na renderização. O ZIP é apagado
+    `CERTIFICATE_JOB_RETENTION_HOURS` horas após o fim do job (status `expired`).
+    """
+    job = db.query(CertificateJob).filter(CertificateJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
     
-    zip_path = generate_bulk_certificates_zip(certificates, db, class_id)
+    if job.status == "expired":
+        raise HTTPException(status_code=410, detail="Job artifact has expired; create a new job")
     
-    # Agendar remoção do arquivo ZIP após o download
-    background_tasks.add_task(cleanup_file, zip_path)
+    if job.status not in ("completed", "partial") or not job.artifact_path or not os.path.exists(job.artifact_path):
+        raise HTTPException(status_code=409, detail=f"Job is not ready for download (status: {job.status})")
     
     return FileResponse(
-        zip_path,
+        job.artifact_path,
         media_type="application/zip",
-        filename=f"certificados_turma_{class_id}.zip"
+        filename=f"certificados_turma_{job.class_id}.zip"
     )
 
 @router.post("/single", response_model=CertificateSchema)
@@ -174,23 +284,24 @@ def create_single_certificate(
     if existing_cert:
         return existing_cert
         
-    snapshot = {
-        "student_name": student.name,
-        "student_cpf": student.cpf,
-        "course_name": course.name,
-        "course_workload": course.workload,
-        "class_name": class_obj.name
-    }
-    
     certificate = Certificate(
         student_id=student.id,
         course_id=class_obj.course_id,
         template_id=class_obj.certificate_template,
-        data_snapshot=snapshot
+        data_snapshot=build_certificate_snapshot(student, course, class_obj)
     )
     db.add(certificate)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Emitido por uma requisição concorrente depois da checagem acima
+        db.rollback()
+        return db.query(Certificate).filter(
+            Certificate.student_id == student_id,
+            Certificate.course_id == class_obj.course_id
+        ).one()
     db.refresh(certificate)
+    certificates_by_cpf_cache.invalidate(student.cpf)
     
     return certificate
 
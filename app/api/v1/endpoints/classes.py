@@ -1,20 +1,27 @@
 from datetime import datetime
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.db.session import get_db
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate, seek
+from app.db.session import get_async_db, get_db
 from app.models.class_model import Class
 from app.models.course import Course
 from app.models.enrollment import Enrollment
 from app.models.student import Student
-from app.schemas.class_schema import Class as ClassSchema, ClassCreate, ClassUpdate, ClassWithCourse, ClassStudent
+from app.schemas.class_schema import Class as ClassSchema, ClassCreate, ClassUpdate, ClassWithCourse, ClassStudent, ClassStudentPage
 
 from app.services.templates.registry import TemplateRegistry
 
 router = APIRouter()
 
+# Linhas buscadas por vez no cursor do banco ao exportar a lista em NDJSON
+ROSTER_STREAM_BATCH_SIZE = 500
+
 
 @router.post("/", response_model=ClassSchema)
 def create_class(
@@ -77,15 +84,16 @@ def create_class(
 
 
 @router.get("/{class_id}", response_model=ClassSchema)
-def get_class(
+async def get_class(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     class_id: int,
 ) -> Any:
     """
     Obter detalhes de uma turma específica (PÚBLICO - sem autenticação).
     """
-    class_obj = db.query(Class).filter(Class.id == class_id, Class.is_active == True).first()
+    result = await db.execute(select(Class).where(Class.id == class_id, Class.is_active == True))
+    class_obj = result.scalars().first()
     if not class_obj:
         raise HTTPException(status_code=404, detail="Class not found")
     
@@ -150,39 +158,82 @@ def toggle_class_status(
     
     return class_obj
 
-@router.get("/{class_id}/students", response_model=List[ClassStudent])
+@router.get("/{class_id}/students", response_model=ClassStudentPage)
 def get_class_students(
     *,
     db: Session = Depends(get_db),
     class_id: int,
+    sort: Literal["name", "enrollment_date"] = "name",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
     current_user = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
-    Listar todos os alunos inscritos em uma turma (ADMIN - requer autenticação).
+    Listar os alunos inscritos em uma turma (ADMIN - requer autenticação).
+    
+    A lista é paginada por cursor: a resposta traz `items` e `next_cursor`,
+    que deve ser repassado em `cursor` para obter a próxima página (é `null`
+    na última). A ordenação é por nome (`sort=name`) ou data de inscrição
+    (`sort=enrollment_date`).
+    
+    Com `format=ndjson` a turma inteira (a partir de `cursor`, se informado) é
+    enviada em streaming, um aluno JSON por linha, lida do banco em lotes sem
+    carregar todas as linhas em memória. Nesse modo `limit` é ignorado.
+    
+    **Exemplo de uso:**
+    ```python
+    import requests
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"http://localhost:8000/api/v1/classes/{class_id}/students"
+    params = {"sort": "name", "limit": 100}
+    
+    alunos = []
+    while True:
+        page = requests.get(url, headers=headers, params=params).json()
+        alunos.extend(page["items"])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+    ```
     """
     class_obj = db.query(Class).filter(Class.id == class_id, Class.is_active == True).first()
     if not class_obj:
         raise HTTPException(status_code=404, detail="Class not found")
     
-    enrollments = db.query(Enrollment).filter(Enrollment.class_id == class_id).all()
-    
-    students = []
-    for enrollment in enrollments:
-        student = db.query(Student).filter(Student.id == enrollment.student_id).first()
-        if student:
-            students.append({
-                "id": student.id,
-                "name": student.name,
-                "email": student.email,
-                "cpf": student.cpf,
-                "authorized": student.authorized,
-                "enrollment_date": enrollment.enrollment_date,
-                "created_at": student.created_at,
-                "updated_at": student.updated_at 
-                
-            })
-    
-    return students
+    enrollment_id = Enrollment.id.label("enrollment_id")
+    query = (
+        db.query(
+            Student.id,
+            Student.name,
+            Student.email,
+            Student.cpf,
+            Student.authorized,
+            Enrollment.enrollment_date,
+            Student.created_at,
+            Student.updated_at,
+            enrollment_id,
+        )
+        .join(Enrollment, Enrollment.student_id == Student.id)
+        .filter(Enrollment.class_id == class_id)
+    )
+    # O id da inscrição desempata nomes/datas iguais e torna o cursor único
+    sort_column = Student.name if sort == "name" else Enrollment.enrollment_date
+    columns = [sort_column, enrollment_id]
+    
+    if format == "ndjson":
+        rows = seek(query, columns, cursor).yield_per(ROSTER_STREAM_BATCH_SIZE)
+        
+        def iter_ndjson():
+            for row in rows:
+                item = ClassStudent.model_validate(row, from_attributes=True)
+                yield item.model_dump_json() + "\n"
+        
+        return StreamingResponse(iter_ndjson(), media_type="application/x-ndjson")
+    
+    rows, next_cursor = paginate(query, columns, cursor, limit)
+    return {"items": rows, "next_cursor": next_cursor}
 
 @router.delete("/{class_id}", response_model=ClassSchema)
 def delete_class(
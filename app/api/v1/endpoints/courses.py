@@ -1,25 +1,34 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.db.session import get_db
+from app.core.pagination import MAX_PAGE_SIZE, paginate, paginate_async
+from app.db.session import get_async_db, get_db
+from app.models.class_model import Class
 from app.models.course import Course
-from app.schemas.course import Course as CourseSchema, CourseCreate, CourseUpdate
+from app.models.enrollment import Enrollment
+from app.schemas.course import Course as CourseSchema, CourseCreate, CourseUpdate, CoursePage
 
 router = APIRouter()
 
-@router.get("/", response_model=List[CourseSchema])
-def read_courses(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+@router.get("/", response_model=CoursePage)
+async def read_courses(
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
 ) -> Any:
     """
     Listar todos os cursos disponíveis (PÚBLICO - sem autenticação).
+    
+    Paginado por cursor: repasse `next_cursor` em `cursor` para obter a
+    próxima página (é `null` na última).
     """
-    courses = db.query(Course).filter(Course.is_active == True).offset(skip).limit(limit).all()
-    return courses
+    stmt = select(Course).where(Course.is_active == True)
+    courses, next_cursor = await paginate_async(db, stmt, [Course.id], cursor, limit)
+    return {"items": courses, "next_cursor": next_cursor}
 
 @router.post("/", response_model=CourseSchema)
 def create_course(
@@ -44,41 +53,60 @@ def create_course(
 @router.get("/with-classes")
 def read_courses_with_classes(
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
 ) -> Any:
     """
     Listar todos os cursos com suas turmas disponíveis (PÚBLICO - sem autenticação).
+    
+    Usa no máximo duas consultas, independente do número de cursos e turmas.
+    Paginado por cursor sobre os cursos, como `GET /courses/`.
     """
-    from app.models.class_model import Class
-    from app.models.enrollment import Enrollment
+    query = db.query(Course).filter(Course.is_active == True)
+    courses, next_cursor = paginate(query, [Course.id], cursor, limit)
     
-    courses = db.query(Course).filter(Course.is_active == True).offset(skip).limit(limit).all()
-    result = []
+    # Segunda (e última) consulta: turmas ativas dos cursos da página com a
+    # contagem de inscritos agrupada por turma
+    class_rows = []
+    if courses:
+        class_rows = (
+            db.query(
+                Class.id,
+                Class.course_id,
+                Class.name,
+                Class.total_slots,
+                Class.available_slots,
+                Class.is_open,
+                Class.start_date,
+                Class.end_date,
+                func.count(Enrollment.id),
+            )
+            .outerjoin(Enrollment, Enrollment.class_id == Class.id)
+            .filter(
+                Class.course_id.in_([course.id for course in courses]),
+                Class.is_active == True
+            )
+            .group_by(Class.id)
+            .order_by(Class.id)
+            .all()
+        )
     
+    classes_by_course = {}
+    for class_id, course_id, name, total_slots, available_slots, is_open, start_date, end_date, enrolled_count in class_rows:
+        classes_by_course.setdefault(course_id, []).append({
+            "id": class_id,
+            "name": name,
+            "total_slots": total_slots,
+            "available_slots": available_slots,
+            "is_open": is_open,
+            "start_date": start_date,
+            "end_date": end_date,
+            "enrolled_students": enrolled_count
+        })
+    
+    result = []
     for course in courses:
-        classes = db.query(Class).filter(
-            Class.course_id == course.id,
-            Class.is_active == True
-        ).all()
-        
-        classes_data = []
-        for class_obj in classes:
-            enrolled_count = db.query(Enrollment).filter(
-                Enrollment.class_id == class_obj.id
-            ).count()
-            
-            classes_data.append({
-                "id": class_obj.id,
-                "name": class_obj.name,
-                "total_slots": class_obj.total_slots,
-                "available_slots": class_obj.available_slots,
-                "is_open": class_obj.is_open,
-                "start_date": class_obj.start_date,
-                "end_date": class_obj.end_date,
-                "enrolled_students": enrolled_count
-            })
-        
+        classes_data = classes_by_course.get(course.id, [])
         result.append({
             "id": course.id,
             "name": course.name,
@@ -88,7 +116,7 @@ def read_courses_with_classes(
             "total_classes": len(classes_data)
         })
     
-    return result
+    return {"items": result, "next_cursor": next_cursor}
 
 @router.put("/{course_id}", response_model=CourseSchema)
 def update_course(
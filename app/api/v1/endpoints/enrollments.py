@@ -1,23 +1,35 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Any, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.config import settings
+from app.core.pagination import MAX_PAGE_SIZE, paginate
 from app.db.session import get_db
 from app.models.class_model import Class
 from app.models.course import Course
 from app.models.enrollment import Enrollment
 from app.models.student import Student
-from app.schemas.class_schema import ClassWithCourse
-from app.schemas.enrollment import EnrollmentResponse, EnrollmentDetail
+from app.schemas.class_schema import ClassWithCoursePage
+from app.schemas.enrollment import EnrollmentResponse, EnrollmentDetail, EnrollmentImportReport
+from app.services.enrollment_import import InvalidImportFile, RowParser, import_enrollment_batch, iter_records, row_error
 
 router = APIRouter()
 
-@router.get("/classes/available", response_model=List[ClassWithCourse])
+@router.get("/classes/available", response_model=ClassWithCoursePage)
 def list_available_classes(
     *,
     db: Session = Depends(get_db),
     current_student: Student = Depends(deps.get_current_active_student),
+    course_id: Optional[int] = None,
+    starts_after: Optional[datetime] = None,
+    starts_before: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
 ) -> Any:
     """
     Listar turmas disponíveis para inscrição (ESTUDANTE - requer autenticação).
@@ -25,6 +37,12 @@ def list_available_classes(
     Retorna apenas turmas que estão abertas para inscrição (is_open=True)
     e que possuem vagas disponíveis (available_slots > 0).
     
+    Filtros opcionais: `course_id` e uma janela de data de início
+    (`starts_after` / `starts_before`, ISO 8601).
+    
+    Paginado por cursor: repasse `next_cursor` em `cursor` para obter a
+    próxima página (é `null` na última).
+    
     **Exemplo de uso:**
     ```python
     import requests
@@ -35,33 +53,46 @@ def list_available_classes(
         headers=headers
     )
     
-    turmas = response.json()
+    turmas = response.json()["items"]
     for turma in turmas:
         print(f"{turma['course_name']} - {turma['name']}")
         print(f"  Vagas: {turma['available_slots']}/{turma['total_slots']}")
     ```
     """
-    classes = db.query(Class).filter(
-        Class.is_open == True,
-        Class.available_slots > 0,
-        Class.is_active == True
-    ).all()
+    query = (
+        db.query(
+            Class.id,
+            Class.course_id,
+            Class.name,
+            Class.total_slots,
+            Class.available_slots,
+            Class.certificate_template,
+            Class.is_open,
+            Class.is_active,
+            Class.start_date,
+            Class.end_date,
+            func.coalesce(Course.name, "Unknown").label("course_name"),
+            func.count(Enrollment.id).label("enrollment_count"),
+        )
+        .outerjoin(Course, Course.id == Class.course_id)
+        .outerjoin(Enrollment, Enrollment.class_id == Class.id)
+        .filter(
+            Class.is_open == True,
+            Class.available_slots > 0,
+            Class.is_active == True
+        )
+    )
     
-    result = []
-    for class_obj in classes:
-        course = db.query(Course).filter(Course.id == class_obj.course_id).first()
-        enrolled_count = db.query(Enrollment).filter(Enrollment.class_id == class_obj.id).count()
-        
-        result.append({
-            **class_obj.__dict__,
-            "course_name": course.name if course else "Unknown",
-            "enrollment_count": enrolled_count,
-            "is_open": class_obj.is_open,
-            "available_slots": class_obj.available_slots,
-            "total_slots": class_obj.total_slots,
-        })
+    if course_id is not None:
+        query = query.filter(Class.course_id == course_id)
+    if starts_after is not None:
+        query = query.filter(Class.start_date >= starts_after)
+    if starts_before is not None:
+        query = query.filter(Class.start_date <= starts_before)
     
-    return result
+    rows, next_cursor = paginate(query.group_by(Class.id, Course.name), [Class.id], cursor, limit)
+    
+    return {"items": [row._asdict() for row in rows], "next_cursor": next_cursor}
 
 @router.post("/", response_model=EnrollmentResponse)
 def enroll_in_class(
@@ -94,51 +125,154 @@ def enroll_in_class(
     ```
     """
 
-    class_obj = db.query(Class).filter(Class.id == class_id).first()
-
-    if not class_obj:
-        raise HTTPException(status_code=404, detail="Class not found")
-
-    if not class_obj.is_open:
+    # Checagem barata antes de reservar: um aluno já inscrito em turma lotada
+    # deve receber "already enrolled", não "No available slots"
+    already_enrolled = db.query(Enrollment.id).filter(
+        Enrollment.student_id == current_student.id,
+        Enrollment.class_id == class_id
+    ).first()
+    if already_enrolled:
         raise HTTPException(
             status_code=400,
-            detail="Class is closed for enrollment"
+            detail="You are already enrolled in this class"
         )
-    
 
-    if class_obj.available_slots <= 0:
-        raise HTTPException(
-            status_code=400,
-            detail="No available slots in this class"
+    # Reserva a vaga com um único UPDATE condicional: o banco só decrementa
+    # enquanto houver vagas, então requisições concorrentes nunca vendem a
+    # mesma vaga e não há leitura-modificação-escrita para disputar
+    reserved = db.execute(
+        update(Class)
+        .where(
+            Class.id == class_id,
+            Class.is_open == True,
+            Class.available_slots > 0
         )
-    
-    existing_enrollment = db.query(Enrollment).filter(
-        Enrollment.student_id == current_student.id,
-        Enrollment.class_id == class_id
+        .values(available_slots=Class.available_slots - 1)
+        .returning(Class.name)
+        .execution_options(synchronize_session=False)
     ).first()
-    
-    if existing_enrollment:
+
+    if reserved is None:
+        db.rollback()
+        class_obj = db.query(Class).filter(Class.id == class_id).first()
+        if not class_obj:
+            raise HTTPException(status_code=404, detail="Class not found")
+        if not class_obj.is_open:
+            raise HTTPException(
+                status_code=400,
+                detail="Class is closed for enrollment"
+            )
         raise HTTPException(
             status_code=400,
-            detail="You are already enrolled in this class"
+            detail="No available slots in this class"
         )
     
+    # O índice único (student_id, class_id) barra a inscrição duplicada feita
+    # em paralelo após a checagem acima; o rollback devolve a vaga reservada
     enrollment = Enrollment(
         student_id=current_student.id,
         class_id=class_id,
     )
     db.add(enrollment)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="You are already enrolled in this class"
+        )
     
-    class_obj.available_slots -= 1
-    
+    enrollment_id = enrollment.id
     db.commit()
-    db.refresh(enrollment)
     
     return {
         "message": "Successfully enrolled in class",
-        "enrollment_id": enrollment.id,
+        "enrollment_id": enrollment_id,
         "class_id": class_id,
-        "class_name": class_obj.name
+        "class_name": reserved.name
+    }
+
+@router.post("/import", response_model=EnrollmentImportReport)
+async def import_enrollments(
+    *,
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Inscrever alunos em massa a partir de um arquivo (ADMIN - requer autenticação).
+    
+    O corpo da requisição é o próprio arquivo, enviado em streaming:
+    
+    - `format=csv` (padrão): cabeçalho `class_id,cpf,email`; cada linha
+      identifica o aluno pelo CPF ou, se vazio, pelo email. Campos entre aspas
+      podem conter vírgulas e quebras de linha.
+    - `format=ndjson`: um objeto JSON por linha com as mesmas chaves.
+    
+    O arquivo é processado em lotes de `ENROLLMENT_IMPORT_BATCH_SIZE` linhas,
+    cada um em uma transação, à medida que chega. As vagas de cada turma são
+    descontadas uma vez por lote. Linhas inválidas (aluno ou turma
+    inexistente, turma fechada, inscrição repetida, sem vagas...) são ignoradas
+    e listadas em `errors` com o número da linha no arquivo.
+    
+    **Exemplo de uso:**
+    ```python
+    import requests
+    
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "text/csv"}
+    with open("turma.csv", "rb") as f:
+        response = requests.post(
+            "http://localhost:8000/api/v1/enrollments/import",
+            headers=headers,
+            data=f  # enviado em streaming
+        )
+    
+    relatorio = response.json()
+    print(f"{relatorio['enrolled']} inscritos, {relatorio['failed']} erros")
+    for erro in relatorio["errors"]:
+        print(f"  linha {erro['row']}: {erro['detail']}")
+    ```
+    """
+    parser = RowParser(format)
+    errors: List[dict] = []
+    enrolled_by_class: dict = {}
+    total_rows = 0
+    batch = []
+    
+    async def flush():
+        batch_errors, batch_enrolled = await run_in_threadpool(import_enrollment_batch, batch)
+        errors.extend(batch_errors)
+        for class_id, count in batch_enrolled.items():
+            enrolled_by_class[class_id] = enrolled_by_class.get(class_id, 0) + count
+        batch.clear()
+    
+    async for line_number, record in iter_records(request.stream(), format):
+        try:
+            row = parser.parse(line_number, record)
+        except InvalidImportFile as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        except ValueError as exc:
+            total_rows += 1
+            errors.append(row_error(line_number, str(exc)))
+            continue
+        if row is None:
+            continue
+        total_rows += 1
+        batch.append(row)
+        if len(batch) >= settings.ENROLLMENT_IMPORT_BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+    
+    errors.sort(key=lambda error: error["row"])
+    enrolled = sum(enrolled_by_class.values())
+    return {
+        "total_rows": total_rows,
+        "enrolled": enrolled,
+        "failed": len(errors),
+        "enrolled_by_class": enrolled_by_class,
+        "errors": errors
     }
 
 @router.get("/me", response_model=List[EnrollmentDetail])
@@ -242,11 +376,20 @@ def cancel_enrollment(
             status_code=400,
             detail="Cannot cancel enrollment in a closed class"
         ) 
- 
-    db.delete(enrollment)
-    
-    class_obj.available_slots += 1
+
+    # DELETE pelo id: se dois cancelamentos concorrerem, só o que remover a
+    # linha devolve a vaga
+    deleted = db.query(Enrollment).filter(Enrollment.id == enrollment.id).delete(synchronize_session=False)
+    if not deleted:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Enrollment not found")
     
+    db.execute(
+        update(Class)
+        .where(Class.id == class_obj.id)
+        .values(available_slots=Class.available_slots + 1)
+        .execution_options(synchronize_session=False)
+    )
     db.commit()
     
     return {
@@ -0,0 +1,30 @@
+from typing import Any
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.core import security
+from app.models.user import User
+from app.services.certificate_service import certificates_by_cpf_cache
+from app.services.pdf_cache import pdf_cache
+from app.services.templates.html_template import template_cache
+
+router = APIRouter()
+
+@router.get("/")
+def read_metrics(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Métricas internas do processo (ADMIN).
+    
+    Contadores do pool de senhas (fila, recusas, tempos, rehashes) e dos caches
+    de usuários autenticados, de certificados por CPF, de templates HTML
+    compilados e de PDFs renderizados. Os valores são por processo e zeram ao reiniciar.
+    """
+    return {
+        "password_hashing": security.password_hasher.stats(),
+        "principal_cache": deps.principal_cache.stats(),
+        "certificates_by_cpf_cache": certificates_by_cpf_cache.stats(),
+        "template_cache": template_cache.stats(),
+        "pdf_cache": pdf_cache.stats(),
+    }
@@ -1,23 +1,34 @@
 import os
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+import uuid
+from typing import Any, List, Literal, Optional
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.services.pdf_service import generate_certificate_pdf
+from app.services.certificate_service import certificates_by_cpf_cache
+from app.services.pdf_service import get_cached_certificate_pdf
+from app.services.student_import import check_header, errors_path, source_path, student_import_runner
 
 from app.api import deps
-from app.db.session import get_db
+from app.core.pagination import MAX_PAGE_SIZE, paginate
+from app.db.session import get_async_db, get_db
 from app.models.student import Student
 from app.models.class_model import Class
 from app.models.enrollment import Enrollment
 from app.models.certificate import Certificate
 from app.models.course import Course
+from app.models.student_import_job import StudentImportJob
+from app.schemas.student_import_job import StudentImportJob as StudentImportJobSchema
 from app.schemas.student import (
     Student as StudentSchema, 
     StudentCreate, 
     StudentCertificatesResponse, 
     StudentInfoResponse,
     StudentAuth,
+    StudentPage,
     StudentDashboard,
     EnrollmentInfo,
     StudentCertificateResponse,
@@ -27,58 +38,188 @@ from app.core import security
 
 router = APIRouter()
 
-
-def cleanup_file(file_path: str):
-    """Remove o arquivo após o download."""
-    try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            print(f"✓ Arquivo removido: {file_path}")
-    except Exception as e:
-        print(f"✗ Erro ao remover arquivo {file_path}: {e}")
-
 # ========== ENDPOINTS PARA ADMINISTRADORES ==========
 
-@router.get("/", response_model=List[StudentAuth])
+@router.get("/", response_model=StudentPage)
 def list_all_students(
     *,
     db: Session = Depends(get_db),
     current_user = Depends(deps.get_current_active_superuser),
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
 ) -> Any:
     """
     Listar todos os estudantes cadastrados (ADMIN - requer autenticação).
     
     Permite que administradores visualizem todos os estudantes do sistema
-    com paginação. Útil para gerenciamento e auditoria.
+    com paginação por cursor. Útil para gerenciamento e auditoria.
+    
+    A resposta traz `items` e `next_cursor`; repasse `next_cursor` em `cursor`
+    para obter a próxima página (é `null` na última). O custo de cada página
+    não depende de quantas vieram antes.
     
     **Exemplo de uso:**
     ```python
     import requests
     
     headers = {"Authorization": f"Bearer {admin_token}"}
-    response = requests.get(
-        "http://localhost:8000/api/v1/students/?skip=0&limit=50",
-        headers=headers
-    )
+    params = {"limit": 50}
+    
+    students = []
+    while True:
+        page = requests.get(
+            "http://localhost:8000/api/v1/students/",
+            headers=headers,
+            params=params
+        ).json()
+        students.extend(page["items"])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
     
-    students = response.json()
     for student in students:
         print(f"{student['name']} - {student['email']}")
         print(f"  CPF: {student['cpf']}")
         print(f"  Autorizado: {student['authorized']}\n")
     ```
     """
-    students = db.query(Student).offset(skip).limit(limit).all()
-    return students
+    students, next_cursor = paginate(db.query(Student), [Student.id], cursor, limit)
+    return {"items": students, "next_cursor": next_cursor}
+
+@router.post("/import", response_model=StudentImportJobSchema, status_code=202)
+async def import_students(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Importar estudantes em massa a partir de um arquivo (ADMIN - requer autenticação).
+    
+    O corpo da requisição é o próprio arquivo, enviado em streaming e gravado
+    em disco; a importação roda em segundo plano e esta chamada retorna o job.
+    
+    - `format=csv` (padrão): cabeçalho com `name,email,cpf` e `password` ou
+      `hashed_password` (hash bcrypt já calculado, gravado como veio).
+    - `format=ndjson`: um objeto JSON por linha com as mesmas chaves.
+    
+    As senhas em texto são convertidas em hash em um pool de processos. O
+    progresso fica salvo no banco por lote: se o servidor reiniciar, o job
+    continua da última linha gravada. Linhas inválidas ou com CPF/email já
+    cadastrado são ignoradas e listadas em `GET /students/import/{job_id}/errors`.
+    
+    **Exemplo de uso:**
+    ```python
+    import time
+    import requests
+    
+    headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"}
+    with open("alunos.csv", "rb") as f:
+        job = requests.post(
+            "http://localhost:8000/api/v1/students/import",
+            headers=headers,
+            data=f  # enviado em streaming
+        ).json()
+    
+    while job["status"] in ("pending", "running"):
+        time.sleep(5)
+        job = requests.get(
+            f"http://localhost:8000/api/v1/students/import/{job['id']}",
+            headers=headers
+        ).json()
+        print(f"{job['processed']}/{job['total']} ({job['failed']} erros)")
+    ```
+    """
+    job_id = str(uuid.uuid4())
+    path = source_path(job_id, format)
+    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        async for chunk in request.stream():
+            await run_in_threadpool(f.write, chunk)
+    
+    try:
+        check_header(path, format)
+    except (ValueError, UnicodeDecodeError) as exc:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail=str(exc))
+    
+    job = StudentImportJob(id=job_id, format=format, source_path=path, created_by=current_user.id)
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    
+    student_import_runner.submit(job.id)
+    return job
+
+@router.get("/import/{job_id}", response_model=StudentImportJobSchema)
+def get_student_import(
+    *,
+    db: Session = Depends(get_db),
+    job_id: str,
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Consultar status e progresso de uma importação de estudantes (ADMIN - requer autenticação).
+    """
+    job = db.query(StudentImportJob).filter(StudentImportJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/import/{job_id}/errors")
+def download_student_import_errors(
+    *,
+    db: Session = Depends(get_db),
+    job_id: str,
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Erros por linha de uma importação, em NDJSON (ADMIN - requer autenticação).
+    
+    Cada linha traz `row` (linha no arquivo enviado), `cpf`, `email` e `detail`.
+    Enquanto o job roda, contém os erros dos lotes já gravados.
+    """
+    job = db.query(StudentImportJob).filter(StudentImportJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    path = errors_path(job.id)
+    if not os.path.exists(path):
+        return Response(content=b"", media_type="application/x-ndjson")
+    return FileResponse(path, media_type="application/x-ndjson", filename=f"erros_importacao_{job.id}.ndjson")
+
+@router.post("/import/{job_id}/resume", response_model=StudentImportJobSchema, status_code=202)
+def resume_student_import(
+    *,
+    db: Session = Depends(get_db),
+    job_id: str,
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Retomar uma importação que falhou, a partir da última linha gravada (ADMIN - requer autenticação).
+    """
+    job = db.query(StudentImportJob).filter(StudentImportJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == "completed":
+        raise HTTPException(status_code=409, detail="Job is already completed")
+    
+    if job.status == "failed":
+        job.status = "pending"
+        job.error = None
+        db.commit()
+        db.refresh(job)
+    student_import_runner.submit(job.id)
+    return job
 
 # ========== ENDPOINT PÚBLICO DE CONSULTA DE CERTIFICADOS ==========
 
 @router.get("/cpf/{cpf}/certificates", response_model=StudentCertificatesResponse)
-def get_certificates_by_cpf(
+async def get_certificates_by_cpf(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     cpf: str,
 ) -> Any:
     """
@@ -86,6 +227,8 @@ def get_certificates_by_cpf(
     
     Endpoint público que permite que alunos consultem seus certificados
     usando apenas o CPF, sem necessidade de login.
+    As respostas ficam em cache por CPF até que um novo certificado seja emitido
+    para o aluno (ou até expirar `CPF_CACHE_TTL_SECONDS`).
     
     **Exemplo de uso:**
     ```python
@@ -110,39 +253,55 @@ def get_certificates_by_cpf(
         print("CPF não encontrado no sistema")
     ```
     """
-    students = db.query(Student).filter(Student.cpf == cpf).all()
+    cached = certificates_by_cpf_cache.get(cpf)
+    if cached is not None:
+        return cached
+    # Lida antes da consulta: uma emissão concorrente invalida o CPF e o
+    # resultado desta leitura não é gravado no cache
+    cache_version = certificates_by_cpf_cache.version()
+    
+    result = await db.execute(
+        select(
+            Student.name,
+            Student.cpf,
+            Student.email,
+            Certificate.id,
+            Certificate.uuid,
+            Certificate.course_id,
+            Certificate.issue_date,
+            Course.name,
+        )
+        .outerjoin(Certificate, Certificate.student_id == Student.id)
+        .outerjoin(Course, Course.id == Certificate.course_id)
+        .where(Student.cpf == cpf)
+        .order_by(Student.id, Certificate.id)
+    )
+    rows = result.all()
     
-    if not students:
+    if not rows:
         raise HTTPException(status_code=404, detail="No student found with this CPF")
     
-    all_certificates = []
-    student_info = None
-    
-    for student in students:
-        if not student_info:
-            student_info = {
-                "name": student.name,
-                "cpf": student.cpf,
-                "email": student.email
-            }
-        
-        certificates = db.query(Certificate).filter(Certificate.student_id == student.id).all()
-        for cert in certificates:
-            course = db.query(Course).filter(Course.id == cert.course_id).first()
-            all_certificates.append({
-                "certificate_id": cert.id,
-                "uuid": cert.uuid,
-                "course_name": course.name if course else "Unknown",
-                "course_id": cert.course_id,
-                "issue_date": cert.issue_date,
-                "download_url": f"/api/v1/certificates/{cert.id}/download"
-            })
-    
-    return StudentCertificatesResponse(
-       student=StudentInfoResponse(**student_info),
+    student_name, student_cpf, student_email = rows[0][:3]
+    all_certificates = [
+        {
+            "certificate_id": cert_id,
+            "uuid": cert_uuid,
+            "course_name": course_name if course_name else "Unknown",
+            "course_id": course_id,
+            "issue_date": issue_date,
+            "download_url": f"/api/v1/certificates/{cert_id}/download"
+        }
+        for _, _, _, cert_id, cert_uuid, course_id, issue_date, course_name in rows
+        if cert_id is not None
+    ]
+    
+    response = StudentCertificatesResponse(
+        student=StudentInfoResponse(name=student_name, cpf=student_cpf, email=student_email),
         certificates=all_certificates,
         total_certificates=len(all_certificates)
     )
+    certificates_by_cpf_cache.set(cpf, response, version=cache_version)
+    return response
 
 # ========== ENDPOINTS PARA ESTUDANTES AUTENTICADOS ==========
 
@@ -176,7 +335,7 @@ def get_my_info(
     return current_student
 
 @router.put("/me", response_model=StudentAuth)
-def update_my_profile(
+async def update_my_profile(
     *,
     db: Session = Depends(get_db),
     student_in: StudentProfileUpdate,
@@ -185,6 +344,13 @@ def update_my_profile(
     """
     Atualizar perfil do estudante (ESTUDANTE - requer autenticação).
     """
+    # O bcrypt roda no pool de senhas; o restante usa a sessão síncrona fora do event loop
+    hashed_password = await security.password_hasher.hash(student_in.password) if student_in.password else None
+    return await run_in_threadpool(_apply_profile_update, db, current_student, student_in, hashed_password)
+
+def _apply_profile_update(
+    db: Session, current_student: Student, student_in: StudentProfileUpdate, hashed_password: Optional[str]
+) -> Student:
     if student_in.email and student_in.email != current_student.email:
         existing_email = db.query(Student).filter(Student.email == student_in.email).first()
         if existing_email:
@@ -194,11 +360,13 @@ def update_my_profile(
     if student_in.name:
         current_student.name = student_in.name
         
-    if student_in.password:
-        current_student.hashed_password = security.get_password_hash(student_in.password)
+    if hashed_password:
+        current_student.hashed_password = hashed_password
         
     db.commit()
     db.refresh(current_student)
+    deps.invalidate_principal(current_student)
+    certificates_by_cpf_cache.invalidate(current_student.cpf)
     return current_student
 
 @router.get("/me/dashboard", response_model=StudentDashboard)
@@ -229,28 +397,49 @@ def get_my_dashboard(
     ```
     """
 
-    enrollments = db.query(Enrollment).filter(
-        Enrollment.student_id == current_student.id
-    ).all()
+    # Uma única consulta: inscrições + turma + curso, com a contagem de certificados
+    # calculada como subconsulta escalar. Partir de Student garante ao menos uma
+    # linha (com a contagem) mesmo para quem não tem inscrições.
+    certificates_count_subquery = (
+        select(func.count(Certificate.id))
+        .where(Certificate.student_id == current_student.id)
+        .scalar_subquery()
+    )
     
-    enrollment_infos = []
-    for enrollment in enrollments:
-        class_obj = db.query(Class).filter(Class.id == enrollment.class_id).first()
-        if class_obj:
-            course = db.query(Course).filter(Course.id == class_obj.course_id).first()
-            enrollment_infos.append(EnrollmentInfo(
-                enrollment_id=enrollment.id,
-                class_id=class_obj.id,
-                class_name=class_obj.name,
-                course_id=course.id if course else 0,
-                course_name=course.name if course else "Unknown",
-                enrollment_date=enrollment.enrollment_date,
-                is_open=class_obj.is_open
-            ))
-    
-    certificates_count = db.query(Certificate).filter(
-        Certificate.student_id == current_student.id
-    ).count()
+    rows = (
+        db.query(
+            certificates_count_subquery,
+            Enrollment.id,
+            Enrollment.enrollment_date,
+            Class.id,
+            Class.name,
+            Class.is_open,
+            Course.id,
+            Course.name,
+        )
+        .select_from(Student)
+        .outerjoin(Enrollment, Enrollment.student_id == Student.id)
+        .outerjoin(Class, Class.id == Enrollment.class_id)
+        .outerjoin(Course, Course.id == Class.course_id)
+        .filter(Student.id == current_student.id)
+        .order_by(Enrollment.id)
+        .all()
+    )
+    
+    certificates_count = rows[0][0] if rows else 0
+    enrollment_infos = [
+        EnrollmentInfo(
+            enrollment_id=enrollment_id,
+            class_id=class_id,
+            class_name=class_name,
+            course_id=course_id if course_id else 0,
+            course_name=course_name if course_name else "Unknown",
+            enrollment_date=enrollment_date,
+            is_open=is_open
+        )
+        for _, enrollment_id, enrollment_date, class_id, class_name, is_open, course_id, course_name in rows
+        if class_id is not None
+    ]
     
     return StudentDashboard(
         student=StudentAuth.from_orm(current_student),
@@ -309,11 +498,10 @@ def download_my_certificate(
     db: Session = Depends(get_db),
     certificate_id: int,
     current_student: Student = Depends(deps.get_current_active_student),
-    background_tasks: BackgroundTasks,
 ) -> Any:
     """
     Download de certificado próprio em PDF (ESTUDANTE - requer autenticação).
-    O arquivo PDF é automaticamente apagado após o download.
+    O PDF é mantido em cache: downloads repetidos não renderizam o certificado novamente.
     """
 
     certificate = db.query(Certificate).filter(Certificate.id == certificate_id).first()
@@ -329,16 +517,13 @@ def download_my_certificate(
     
     course = db.query(Course).filter(Course.id == certificate.course_id).first()
     
-    pdf_path = generate_certificate_pdf(certificate, current_student, course)
+    pdf_bytes = get_cached_certificate_pdf(certificate, current_student, course)
     
     filename = f"certificado_{course.name.replace(' ', '_')}_{current_student.name.replace(' ', '_')}.pdf" if course else f"certificado_{certificate_id}.pdf"
     
-    # Agendar remoção do PDF após o download
-    background_tasks.add_task(cleanup_file, pdf_path)
-    
-    return FileResponse(
-        pdf_path,
+    return Response(
+        content=pdf_bytes,
         media_type="application/pdf",
-        filename=filename
+        headers={"Content-Disposition": f"attachment; filename*=utf-8''{quote(filename)}"}
     )
 
@@ -1,8 +1,9 @@
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.certificate import Certificate
 from app.models.student import Student
 from app.models.course import Course
@@ -11,9 +12,9 @@ from app.schemas.certificate import CertificateValidation
 router = APIRouter()
 
 @router.get("/{uuid}", response_model=CertificateValidation)
-def validate_certificate(
+async def validate_certificate(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     uuid: str,
 ) -> Any:
     """
@@ -42,17 +43,21 @@ def validate_certificate(
         print("✗ Certificado INVÁLIDO ou não encontrado")
     ```
     """
-    certificate = db.query(Certificate).filter(Certificate.uuid == uuid).first()
-    if not certificate:
+    result = await db.execute(
+        select(Student.name, Course.name, Certificate.issue_date, Certificate.uuid)
+        .join(Student, Student.id == Certificate.student_id)
+        .join(Course, Course.id == Certificate.course_id)
+        .where(Certificate.uuid == uuid)
+    )
+    row = result.first()
+    if not row:
         raise HTTPException(status_code=404, detail="Certificate not found or invalid")
     
-    student = db.query(Student).filter(Student.id == certificate.student_id).first()
-    course = db.query(Course).filter(Course.id == certificate.course_id).first()
-    
+    student_name, course_name, issue_date, certificate_uuid = row
     return CertificateValidation(
         valid=True,
-        student=student.name,
-        course=course.name,
-        issue_date=certificate.issue_date,
-        uuid=certificate.uuid
+        student=student_name,
+        course=course_name,
+        issue_date=issue_date,
+        uuid=certificate_uuid
     )
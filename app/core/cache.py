@@ -0,0 +1,95 @@
+"""
+Cache em memória reutilizável pelos serviços e endpoints.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Cache em memória com número máximo de entradas (LRU) e tempo de vida (TTL).
+    
+    É local ao processo: cada worker do servidor tem o seu. Quem altera os
+    dados em cache deve chamar `invalidate` explicitamente, depois do commit.
+    
+    Para não gravar um valor lido antes de uma invalidação, quem popula o cache
+    lê `version()` antes de consultar a origem e a repassa para `set`: se a
+    chave foi invalidada nesse meio tempo, o valor é descartado.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Versão da última invalidação de cada chave (limitado a `max_entries`
+        # chaves; versões anteriores a `_floor` são tratadas como invalidadas)
+        self._version = 0
+        self._floor = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retorna o valor em cache ou None se ausente/expirado."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def version(self) -> int:
+        """Marca a ler antes de consultar a origem do valor e passar para `set`."""
+        with self._lock:
+            return self._version
+    
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        """Grava o valor, a menos que `key` tenha sido invalidada depois de `version`."""
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            if version is not None and (version < self._floor or self._invalidated.get(key, 0) > version):
+                return
+            self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._version += 1
+            self._invalidated[key] = self._version
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > max(self._max_entries, 1):
+                _, version = self._invalidated.popitem(last=False)
+                self._floor = max(self._floor, version)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+            self._floor = self._version
+            self._invalidated.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas de uso do cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl_seconds
+            }
@@ -0,0 +1,127 @@
+"""
+Paginação por cursor (keyset) reutilizável pelos endpoints de listagem.
+
+O cursor é opaco para o cliente: um JSON com os valores de ordenação da
+última linha da página, codificado em base64 url-safe. A próxima página é
+obtida com `WHERE (coluna, id) > (valor, último_id)`, que usa o índice em vez
+de percorrer e descartar linhas como faz OFFSET.
+
+As colunas são comparadas como estão (sem funções em volta), senão nenhum
+índice atende a ordenação. No SQLite datas são texto: colunas de data usadas
+como chave de ordenação precisam ser gravadas sempre no formato do SQLAlchemy
+(ver `Enrollment.enrollment_date`), para que a ordem do texto siga a das datas.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codifica os valores de ordenação da última linha em um cursor opaco."""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decodifica um cursor gerado por `encode_cursor`.
+
+    Raises:
+        HTTPException: 400 se o cursor estiver malformado
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, KeyError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _seek_clauses(columns: Sequence[Any], cursor: Optional[str]):
+    """Filtro (ou None, sem cursor) e ordenação equivalentes a `(c1, c2, ...) > (v1, v2, ...)`."""
+    condition = None
+    if cursor:
+        values = decode_cursor(cursor, len(columns))
+        clauses = []
+        for i, (column, value) in enumerate(zip(columns, values)):
+            equal = [columns[j] == values[j] for j in range(i)]
+            clauses.append(and_(*equal, column > value))
+        condition = or_(*clauses)
+    return condition, list(columns)
+
+
+def seek(query, columns: Sequence[Any], cursor: Optional[str]):
+    """
+    Ordena a query por `columns` (ascendente) e, se houver cursor, mantém só as
+    linhas posteriores a ele. Equivale a `(c1, c2, ...) > (v1, v2, ...)` sem
+    depender de suporte do banco a comparação de tuplas.
+    A última coluna de `columns` deve ser única (normalmente o id).
+    """
+    condition, order_by = _seek_clauses(columns, cursor)
+    if condition is not None:
+        query = query.filter(condition)
+    return query.order_by(*order_by)
+
+
+def _next_page(rows: List[Any], columns: Sequence[Any], limit: int):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return rows, next_cursor
+
+
+def paginate(query, columns: Sequence[Any], cursor: Optional[str], limit: int):
+    """
+    Retorna uma página da query ordenada por `columns` e o cursor da próxima
+    (None na última).
+    
+    Busca `limit + 1` linhas para saber se existe próxima página sem um COUNT.
+    """
+    rows = seek(query, columns, cursor).limit(limit + 1).all()
+    return _next_page(rows, columns, limit)
+
+
+async def paginate_async(db: AsyncSession, stmt: Select, columns: Sequence[Any], cursor: Optional[str], limit: int):
+    """
+    Versão de `paginate` para um `select()` executado em uma `AsyncSession`.
+    Com um único elemento ORM no select (ex.: `select(Course)`) as linhas são
+    as entidades.
+    """
+    condition, order_by = _seek_clauses(columns, cursor)
+    if condition is not None:
+        stmt = stmt.where(condition)
+    result = await db.execute(stmt.order_by(*order_by).limit(limit + 1))
+    descriptions = stmt.column_descriptions
+    single_entity = len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+    rows = result.scalars().all() if single_entity else result.all()
+    return _next_page(list(rows), columns, limit)
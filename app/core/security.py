@@ -1,5 +1,11 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Dict, Optional, Union
+from fastapi import HTTPException
 from jose import jwt
 import bcrypt
 from app.core.config import settings
@@ -17,6 +23,111 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
-def get_password_hash(password: str) -> str:
-    salt = bcrypt.gensalt()
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    salt = bcrypt.gensalt(rounds or settings.PASSWORD_BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Indica se o hash foi gerado com um custo diferente de `PASSWORD_BCRYPT_ROUNDS`."""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.PASSWORD_BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+class PasswordHasher:
+    """
+    Pool de processos dedicado ao bcrypt, separado do threadpool do Starlette.
+    
+    Os endpoints aguardam o resultado com `await`, sem ocupar uma thread. No
+    máximo `max_pending` operações ficam na fila ou em execução; acima disso a
+    requisição é recusada com 503 em vez de atrasar o resto da API durante um
+    pico de logins.
+    """
+    
+    def __init__(self, workers: int, max_pending: int):
+        self._workers = max(1, workers)
+        self._max_pending = max(1, max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.max_pending_seen = 0
+        self.completed: Dict[str, int] = {"hash": 0, "verify": 0}
+        self.rejected = 0
+        self.failed = 0
+        self.rehashed = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+    
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", get_password_hash, password)
+    
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run("verify", verify_password, password, hashed_password)
+    
+    async def _run(self, operation: str, func, *args) -> Any:
+        with self._lock:
+            if self._pending >= self._max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many password operations in progress, try again shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+            self.max_pending_seen = max(self.max_pending_seen, self._pending)
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            executor = self._executor
+        
+        start = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # Um worker morreu: descarta o pool para a próxima chamada criar outro
+            with self._lock:
+                self.failed += 1
+                if self._executor is executor:
+                    self._executor = None
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._pending -= 1
+                self._total_seconds += elapsed
+                self._max_seconds = max(self._max_seconds, elapsed)
+        
+        with self._lock:
+            self.completed[operation] += 1
+        return result
+    
+    def record_rehash(self) -> None:
+        with self._lock:
+            self.rehashed += 1
+    
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Métricas do pool (tempos incluem a espera na fila)."""
+        with self._lock:
+            completed = sum(self.completed.values())
+            return {
+                "workers": self._workers,
+                "max_pending": self._max_pending,
+                "pending": self._pending,
+                "max_pending_seen": self.max_pending_seen,
+                "completed": dict(self.completed),
+                "rejected": self.rejected,
+                "failed": self.failed,
+                "rehashed": self.rehashed,
+                "avg_ms": round(self._total_seconds / completed * 1000, 2) if completed else 0.0,
+                "max_ms": round(self._max_seconds * 1000, 2),
+                "bcrypt_rounds": settings.PASSWORD_BCRYPT_ROUNDS,
+            }
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
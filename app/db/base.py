@@ -5,3 +5,5 @@ from app.models.student import Student
 from app.models.certificate import Certificate
 from app.models.enrollment import Enrollment
 from app.models.class_model import Class
+from app.models.certificate_job import CertificateJob
+from app.models.student_import_job import StudentImportJob
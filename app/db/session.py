@@ -1,13 +1,159 @@
-from sqlalchemy import create_engine
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import StaticPool
 
 from app.core.config import settings
 
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI, connect_args={"check_same_thread": False}
-)
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    """Aplica o perfil de PRAGMAs configurado em `settings` a uma conexão SQLite."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    # Valor negativo = tamanho em KiB, por conexão
+    cursor.execute(f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_MB) * 1024}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+    cursor.close()
+
+
+def is_memory_sqlite(url: URL) -> bool:
+    """Indica se a URI SQLite aponta para um banco em memória (`sqlite://`, `:memory:`, `mode=memory`)."""
+    database = url.database or ""
+    return database in ("", ":memory:") or database.startswith("file::memory:") or url.query.get("mode") == "memory"
+
+
+def sqlite_pool_args(url: URL) -> Dict[str, Any]:
+    """
+    Argumentos de pool para o SQLite.
+    
+    Arquivos usam QueuePool dimensionado pelos `DB_POOL_*`. Bancos em memória
+    existem só dentro de uma conexão: usam StaticPool (uma conexão compartilhada
+    por todas as threads), que não aceita `pool_size`/`max_overflow`/`pool_timeout`.
+    Os engines síncrono e assíncrono abrem bancos em memória distintos.
+    """
+    if is_memory_sqlite(url):
+        return {"poolclass": StaticPool}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+
+
+def create_db_engine(database_uri: str) -> Engine:
+    """
+    Cria o engine da aplicação de acordo com o banco da URI.
+    
+    No SQLite aplica os PRAGMAs do perfil em cada conexão e dimensiona o pool
+    para as threads que atendem as requisições: com WAL várias conexões leem
+    em paralelo enquanto uma escreve, e `busy_timeout` faz escritores
+    concorrentes esperarem a vez em vez de falharem com "database is locked".
+    
+    Em bancos servidor (PostgreSQL) usa o pool com reciclagem e pre-ping, para
+    não entregar conexões derrubadas pelo servidor ou por um proxy após um
+    failover ou tempo ocioso.
+    """
+    url = make_url(database_uri)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(
+            database_uri,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    
+    engine = create_engine(
+        database_uri,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+        **sqlite_pool_args(url),
+    )
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    return engine
+
+
+# Driver assíncrono usado para cada backend quando a URI não o informa
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def async_database_uri(database_uri: str) -> str:
+    """
+    Converte a URI síncrona na equivalente com driver assíncrono
+    (`sqlite://` -> `sqlite+aiosqlite://`, `postgresql+psycopg://` -> `postgresql+asyncpg://`).
+    """
+    url = make_url(database_uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def create_async_db_engine(database_uri: str) -> AsyncEngine:
+    """
+    Cria o engine assíncrono usado pelos endpoints públicos de leitura.
+    
+    Segue o mesmo perfil de `create_db_engine`: no SQLite (aiosqlite) aplica os
+    PRAGMAs em cada conexão; no PostgreSQL (asyncpg) usa o pool com reciclagem
+    e pre-ping. O pool é separado do engine síncrono.
+    """
+    url = make_url(database_uri)
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(
+            database_uri,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    
+    engine = create_async_engine(
+        database_uri,
+        connect_args={"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        **sqlite_pool_args(url),
+    )
+    event.listen(engine.sync_engine, "connect", apply_sqlite_pragmas)
+    return engine
+
+
+engine = create_db_engine(settings.SQLALCHEMY_DATABASE_URI)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# O engine assíncrono só é criado no primeiro uso: importar este módulo não
+# exige o driver assíncrono nem uma URI com driver assíncrono conhecido
+_async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine(
+            settings.ASYNC_SQLALCHEMY_DATABASE_URI or async_database_uri(settings.SQLALCHEMY_DATABASE_URI)
+        )
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Fecha as conexões do engine assíncrono, se ele chegou a ser criado."""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
 class Base(DeclarativeBase):
     pass
 
@@ -17,3 +163,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -3,9 +3,12 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
 from app.core.config import settings
-from app.db.session import engine, Base
-from app.models import user, course, student, class_model, enrollment, certificate
+from app.core.security import password_hasher
+from app.db.session import dispose_async_engine, engine, Base
+from app.models import user, course, student, class_model, enrollment, certificate, certificate_job, student_import_job
 from app.services.cleanup_service import CleanupService
+from app.services.certificate_jobs import certificate_job_runner
+from app.services.student_import import student_import_runner
 from apscheduler.schedulers.background import BackgroundScheduler
 import logging
 
@@ -58,6 +61,27 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+def resume_background_jobs():
+    """
+    Retoma jobs de certificados e importações interrompidos por um reinício e
+    inicia a limpeza periódica dos ZIPs de jobs antigos.
+    """
+    certificate_job_runner.resume_incomplete()
+    certificate_job_runner.start_cleanup()
+    student_import_runner.resume_incomplete()
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    certificate_job_runner.shutdown()
+    student_import_runner.shutdown()
+    password_hasher.shutdown()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    """Fecha as conexões do engine assíncrono (e as threads do aiosqlite)."""
+    await dispose_async_engine()
+
 @app.get("/", tags=["Informações"])
 def read_root():
     """
@@ -4,6 +4,8 @@ from .student import Student
 from .class_model import Class
 from .enrollment import Enrollment
 from .certificate import Certificate
+from .certificate_job import CertificateJob
+from .student_import_job import StudentImportJob
 
 
 __all__ = [
@@ -12,5 +14,7 @@ __all__ = [
     "Student", 
     "Class",
     "Enrollment",
-    "Certificate"
+    "Certificate",
+    "CertificateJob",
+    "StudentImportJob"
 ]
\ No newline at end of file
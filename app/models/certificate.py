@@ -1,5 +1,6 @@
 import uuid
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -7,13 +8,17 @@ from app.db.session import Base
 
 class Certificate(Base):
     __tablename__ = "certificates"
+    __table_args__ = (
+        # Um certificado por aluno e curso: emissões concorrentes não duplicam
+        Index("ix_certificates_student_course", "student_id", "course_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(String, unique=True, index=True, default=lambda: str(uuid.uuid4()))
     student_id = Column(Integer, ForeignKey("students.id"))
     course_id = Column(Integer, ForeignKey("courses.id"))
     template_id = Column(String, nullable=True)
-    data_snapshot = Column(JSON, nullable=True)
+    data_snapshot = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     issue_date = Column(DateTime(timezone=True), server_default=func.now())
     
     student = relationship("Student", back_populates="certificates")
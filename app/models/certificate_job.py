@@ -0,0 +1,25 @@
+import uuid
+from sqlalchemy import Column, DateTime, Integer, JSON, String, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.session import Base
+from app.models.mixins import TimestampMixin
+
+
+class CertificateJob(Base, TimestampMixin):
+    """Geração assíncrona de certificados em massa para uma turma."""
+    __tablename__ = "certificate_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    class_id = Column(Integer, ForeignKey("classes.id"), nullable=False, index=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    status = Column(String, default="pending", nullable=False, index=True)  # pending, running, completed, partial, failed, expired
+    total = Column(Integer, default=0, nullable=False)
+    processed = Column(Integer, default=0, nullable=False)  # PDFs gravados
+    failed = Column(Integer, default=0, nullable=False)
+    failed_uuids = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # certificados que não renderizaram
+    # Posse do job: só o worker em `claimed_by` processa o job até `lease_expires_at`,
+    # que é renovado a cada gravação de progresso
+    claimed_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    artifact_path = Column(String, nullable=True)
+    error = Column(String, nullable=True)
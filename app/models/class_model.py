@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -7,6 +7,9 @@ from app.models.mixins import TimestampMixin, SoftDeleteMixin
 
 class Class(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "classes"
+    __table_args__ = (
+        Index("ix_classes_course_active", "course_id", "is_active"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
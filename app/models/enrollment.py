@@ -1,16 +1,30 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class Enrollment(Base):
     __tablename__ = "enrollments"
+    __table_args__ = (
+        # Um aluno só pode se inscrever uma vez por turma; também atende buscas por student_id
+        Index("uq_enrollments_student_class", "student_id", "class_id", unique=True),
+        Index("ix_enrollments_class_id", "class_id"),
+        # Lista de alunos da turma paginada por data de inscrição (desempate pelo id)
+        Index("ix_enrollments_class_date", "class_id", "enrollment_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
     class_id = Column(Integer, ForeignKey("classes.id"), nullable=False)
-    enrollment_date = Column(DateTime(timezone=True), server_default=func.now())
+    # Preenchida pelo SQLAlchemy (e não só pelo CURRENT_TIMESTAMP do banco) para que,
+    # no SQLite, todas as datas tenham o mesmo formato de texto e ordenem corretamente
+    enrollment_date = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
     
     student = relationship("Student", back_populates="enrollments")
     class_ = relationship("Class", back_populates="enrollments")
@@ -0,0 +1,26 @@
+import uuid
+from sqlalchemy import Column, DateTime, Integer, String, ForeignKey
+from app.db.session import Base
+from app.models.mixins import TimestampMixin
+
+
+class StudentImportJob(Base, TimestampMixin):
+    """Importação em massa de estudantes a partir de um arquivo enviado por um admin."""
+    __tablename__ = "student_import_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    status = Column(String, default="pending", nullable=False, index=True)  # pending, running, completed, failed
+    format = Column(String, nullable=False)  # csv, ndjson
+    source_path = Column(String, nullable=False)
+    total = Column(Integer, default=0, nullable=False)
+    processed = Column(Integer, default=0, nullable=False)
+    imported = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    # Última linha do arquivo já gravada; a retomada continua a partir dela
+    resume_line = Column(Integer, default=0, nullable=False)
+    # Posse do job: só o worker em `claimed_by` grava lotes até `lease_expires_at`,
+    # que é renovado a cada lote
+    claimed_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    error = Column(String, nullable=True)
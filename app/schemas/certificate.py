@@ -1,8 +1,6 @@
 from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
-from app.schemas.student import StudentInfoResponse
-from app.schemas.course import CourseInfoResponse
 
 class CertificateBase(BaseModel):
     student_id: int
@@ -26,7 +24,7 @@ class Certificate(CertificateBase):
 
 class CertificateValidation(BaseModel):
     valid: bool
-    student: StudentInfoResponse
-    course: CourseInfoResponse
+    student: str
+    course: str
     issue_date: datetime
     uuid: str
\ No newline at end of file
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class CertificateJob(BaseModel):
+    id: str
+    class_id: int
+    status: str
+    total: int
+    processed: int
+    failed: int = 0
+    failed_uuids: Optional[List[str]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
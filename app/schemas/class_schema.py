@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 
 
@@ -41,6 +41,11 @@ class ClassWithCourse(Class):
     enrollment_count: int
 
 
+class ClassWithCoursePage(BaseModel):
+    items: List[ClassWithCourse]
+    next_cursor: Optional[str] = None
+
+
 class ClassStudent(BaseModel):
     id: int
     name: str
@@ -50,3 +55,8 @@ class ClassStudent(BaseModel):
     enrollment_date: datetime
     created_at: datetime
     updated_at: datetime
+
+
+class ClassStudentPage(BaseModel):
+    items: List[ClassStudent]
+    next_cursor: Optional[str] = None
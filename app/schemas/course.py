@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -29,6 +29,11 @@ class Course(CourseBase):
         from_attributes = True
 
 
+class CoursePage(BaseModel):
+    items: List[Course]
+    next_cursor: Optional[str] = None
+
+
 class CourseInfoResponse(CourseBase):
     id: int
     name: str
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -32,4 +32,17 @@ class EnrollmentDetail(BaseModel):
     course_id: Optional[int]
     course_name: str
     enrollment_date: datetime
-    is_open: bool
\ No newline at end of file
+    is_open: bool
+
+class EnrollmentImportError(BaseModel):
+    row: int
+    class_id: Optional[int] = None
+    student: Optional[str] = None  # CPF ou email informado na linha
+    detail: str
+
+class EnrollmentImportReport(BaseModel):
+    total_rows: int
+    enrolled: int
+    failed: int
+    enrolled_by_class: Dict[int, int]
+    errors: List[EnrollmentImportError]
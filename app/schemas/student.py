@@ -1,5 +1,6 @@
+import re
 from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 from datetime import datetime
 from app.core.validators import validate_cpf
 
@@ -33,6 +34,41 @@ class StudentRegister(BaseModel):
         return validate_cpf(v)
 
 
+BCRYPT_HASH_RE = re.compile(r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$")
+
+
+class StudentImportRow(BaseModel):
+    """Linha da importação em massa: senha em texto ou hash bcrypt já calculado."""
+    name: str = Field(..., min_length=1)
+    email: EmailStr
+    cpf: str
+    password: Optional[str] = Field(None, min_length=6)
+    hashed_password: Optional[str] = None
+
+    @field_validator('cpf')
+    @classmethod
+    def validate_cpf_format(cls, v):
+        return validate_cpf(v.strip())
+
+    @field_validator('password', 'hashed_password', mode='before')
+    @classmethod
+    def empty_as_none(cls, v):
+        return v or None
+
+    @field_validator('hashed_password')
+    @classmethod
+    def validate_bcrypt_hash(cls, v):
+        if v is not None and not BCRYPT_HASH_RE.match(v):
+            raise ValueError('hashed_password deve ser um hash bcrypt ($2a$, $2b$ ou $2y$)')
+        return v
+
+    @model_validator(mode='after')
+    def require_one_password(self):
+        if (self.password is None) == (self.hashed_password is None):
+            raise ValueError('informe exatamente um entre password e hashed_password')
+        return self
+
+
 class StudentLogin(BaseModel):
     email: EmailStr
     password: str
@@ -74,6 +110,11 @@ class StudentAuth(BaseModel):
         from_attributes = True
 
 
+class StudentPage(BaseModel):
+    items: List[StudentAuth]
+    next_cursor: Optional[str] = None
+
+
 class StudentInfoResponse(BaseModel):
     name: str
     cpf: str
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class StudentImportJob(BaseModel):
+    id: str
+    status: str
+    format: str
+    total: int
+    processed: int
+    imported: int
+    failed: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
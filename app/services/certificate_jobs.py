@@ -0,0 +1,309 @@
+import logging
+import os
+import shutil
+import socket
+import threading
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import and_, or_, update
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.certificate_job import CertificateJob
+from app.models.class_model import Class
+from app.models.course import Course
+from app.services.certificate_service import issue_class_certificates
+from app.services.pdf_service import OUTPUT_DIR, prepare_bulk_jobs, iter_rendered_pdfs
+
+logger = logging.getLogger(__name__)
+
+JOBS_DIR = os.path.join(OUTPUT_DIR, "jobs")
+
+# Frequência (em certificados) com que o progresso é gravado no banco
+PROGRESS_COMMIT_INTERVAL = 10
+
+# Intervalo entre limpezas de artefatos de jobs antigos
+CLEANUP_INTERVAL_SECONDS = 3600
+
+
+class LeaseLost(Exception):
+    """Outro worker assumiu o job depois que a posse deste expirou."""
+
+
+class CertificateJobRunner:
+    """
+    Executa jobs de geração de certificados em massa em threads locais.
+    
+    O estado de cada job fica na tabela `certificate_jobs`. Antes de processar,
+    o runner toma posse do job com um UPDATE condicional (`claimed_by` +
+    `lease_expires_at`), renovado a cada gravação de progresso: vários workers
+    ou processos iniciando juntos não renderizam o mesmo job, e um job cujo
+    dono morreu é assumido quando a posse expira.
+    
+    Cada PDF é gravado em `generated_certificates/jobs/<job_id>/` assim que fica
+    pronto; ao retomar um job interrompido os PDFs já gerados são reaproveitados
+    e apenas os restantes são renderizados. Ao final os PDFs são empacotados em
+    `generated_certificates/jobs/<job_id>.zip`. Certificados que não
+    renderizam ficam em `failed_uuids` e o job termina como `partial`.
+    
+    O ZIP fica disponível por `retention_hours` após o fim do job; depois
+    `purge_expired` o apaga e o job passa a `expired`.
+    """
+    
+    def __init__(self, workers: int, lease_seconds: int, retention_hours: int):
+        self._workers = max(1, workers)
+        self._lease = timedelta(seconds=max(1, lease_seconds))
+        self._retention = timedelta(hours=max(1, retention_hours))
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._active: Set[str] = set()
+        self._retries: Dict[str, threading.Timer] = {}
+        self._cleanup_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+    
+    def submit(self, job_id: str) -> None:
+        """Agenda a execução de um job (ignorado se já estiver em andamento)."""
+        with self._lock:
+            self._retries.pop(job_id, None)
+            if job_id in self._active:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers,
+                    thread_name_prefix="certificate-job"
+                )
+            self._active.add(job_id)
+            self._executor.submit(self._run, job_id)
+    
+    def resume_incomplete(self) -> int:
+        """Reagenda jobs pendentes ou interrompidos. Retorna quantos foram retomados."""
+        db = SessionLocal()
+        try:
+            job_ids = [
+                job_id for (job_id,) in db.query(CertificateJob.id).filter(
+                    CertificateJob.status.in_(("pending", "running"))
+                ).order_by(CertificateJob.created_at).all()
+            ]
+        finally:
+            db.close()
+        
+        for job_id in job_ids:
+            self.submit(job_id)
+        if job_ids:
+            logger.info(f"{len(job_ids)} job(s) de certificados retomado(s)")
+        return len(job_ids)
+    
+    def purge_expired(self) -> int:
+        """
+        Apaga os arquivos de jobs terminados há mais de `retention_hours`: o ZIP
+        de jobs `completed`/`partial` (que passam a `expired`) e os PDFs parciais
+        deixados por jobs `failed`. Retorna quantos jobs expiraram.
+        """
+        cutoff = datetime.utcnow() - self._retention
+        db = SessionLocal()
+        try:
+            finished = db.query(CertificateJob.id, CertificateJob.status, CertificateJob.artifact_path).filter(
+                CertificateJob.status.in_(("completed", "partial", "failed")),
+                CertificateJob.updated_at < cutoff,
+            ).all()
+            
+            expired = 0
+            for job_id, status, artifact_path in finished:
+                shutil.rmtree(os.path.join(JOBS_DIR, job_id), ignore_errors=True)
+                if status == "failed":
+                    continue
+                # Condicional: um download pode estar lendo o job neste momento
+                result = db.execute(
+                    update(CertificateJob)
+                    .where(CertificateJob.id == job_id, CertificateJob.status == status)
+                    .values(status="expired", artifact_path=None)
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                if result.rowcount == 1:
+                    expired += 1
+                    if artifact_path:
+                        try:
+                            os.remove(artifact_path)
+                        except FileNotFoundError:
+                            pass
+        finally:
+            db.close()
+        
+        if expired:
+            logger.info(f"{expired} ZIP(s) de jobs de certificados expirado(s)")
+        return expired
+    
+    def start_cleanup(self) -> None:
+        """Executa `purge_expired` agora e a cada CLEANUP_INTERVAL_SECONDS, em uma thread daemon."""
+        try:
+            self.purge_expired()
+        except Exception:
+            logger.exception("Limpeza de jobs de certificados falhou")
+        
+        timer = threading.Timer(CLEANUP_INTERVAL_SECONDS, self.start_cleanup)
+        timer.daemon = True
+        with self._lock:
+            self._cleanup_timer = timer
+        timer.start()
+    
+    def shutdown(self) -> None:
+        """Para de aceitar jobs; os que não começaram serão retomados no próximo início."""
+        with self._lock:
+            for timer in self._retries.values():
+                timer.cancel()
+            self._retries.clear()
+            if self._cleanup_timer is not None:
+                self._cleanup_timer.cancel()
+                self._cleanup_timer = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._active.clear()
+    
+    def _claim(self, db, job_id: str) -> bool:
+        """Toma posse de um job pendente ou de um `running` cuja posse expirou."""
+        now = datetime.utcnow()
+        result = db.execute(
+            update(CertificateJob)
+            .where(
+                CertificateJob.id == job_id,
+                or_(
+                    CertificateJob.status == "pending",
+                    and_(
+                        CertificateJob.status == "running",
+                        or_(CertificateJob.lease_expires_at.is_(None), CertificateJob.lease_expires_at < now),
+                    ),
+                ),
+            )
+            .values(status="running", claimed_by=self._owner, lease_expires_at=now + self._lease)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+    
+    def _save(self, db, job_id: str, **values) -> None:
+        """
+        Grava o estado do job e renova a posse, desde que ela ainda seja deste runner.
+        
+        Raises:
+            LeaseLost: se outro worker assumiu o job
+        """
+        result = db.execute(
+            update(CertificateJob)
+            .where(CertificateJob.id == job_id, CertificateJob.claimed_by == self._owner)
+            .values(lease_expires_at=datetime.utcnow() + self._lease, **values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if result.rowcount != 1:
+            raise LeaseLost(job_id)
+    
+    def _retry_when_lease_expires(self, db, job_id: str) -> None:
+        """Se outro worker detém o job, tenta de novo quando a posse dele expirar."""
+        job = db.query(CertificateJob).filter(CertificateJob.id == job_id).first()
+        if not job or job.status != "running" or not job.lease_expires_at:
+            return
+        delay = max((job.lease_expires_at - datetime.utcnow()).total_seconds(), 0) + 1
+        timer = threading.Timer(delay, self.submit, args=(job_id,))
+        timer.daemon = True
+        with self._lock:
+            if self._executor is None:
+                return
+            self._retries[job_id] = timer
+        timer.start()
+    
+    def _run(self, job_id: str) -> None:
+        db = SessionLocal()
+        try:
+            if not self._claim(db, job_id):
+                self._retry_when_lease_expires(db, job_id)
+                return
+            
+            job = db.query(CertificateJob).filter(CertificateJob.id == job_id).first()
+            try:
+                self._process(db, job)
+            except LeaseLost:
+                logger.warning(f"Job de certificados {job_id} assumido por outro worker")
+            except Exception as e:
+                logger.exception(f"Job de certificados {job_id} falhou")
+                db.rollback()
+                try:
+                    self._save(db, job_id, status="failed", error=str(e))
+                except LeaseLost:
+                    pass
+        finally:
+            db.close()
+            with self._lock:
+                self._active.discard(job_id)
+    
+    def _process(self, db, job: CertificateJob) -> None:
+        class_obj = db.query(Class).filter(Class.id == job.class_id).first()
+        if not class_obj:
+            raise ValueError("Class not found")
+        
+        course = db.query(Course).filter(Course.id == class_obj.course_id).first()
+        if not course:
+            raise ValueError("Course not found")
+        
+        certificates = issue_class_certificates(db, class_obj, course)
+        if not certificates:
+            raise ValueError("No certificates could be generated for this class.")
+        
+        render_jobs = prepare_bulk_jobs(certificates, db)
+        work_dir = os.path.join(JOBS_DIR, job.id)
+        os.makedirs(work_dir, exist_ok=True)
+        
+        def part_path(cert_uuid: str) -> str:
+            return os.path.join(work_dir, f"{cert_uuid}.pdf")
+        
+        pending = [item for item in render_jobs if not os.path.exists(part_path(item[0]))]
+        processed = len(render_jobs) - len(pending)
+        self._save(db, job.id, total=len(render_jobs), processed=processed, failed=0, failed_uuids=None)
+        
+        failures: List[str] = []
+        uuid_by_arcname = {arcname: cert_uuid for cert_uuid, arcname, _, _ in pending}
+        for arcname, pdf_bytes in iter_rendered_pdfs(pending, failures=failures):
+            path = part_path(uuid_by_arcname[arcname])
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(f"{path}.tmp", path)
+            
+            processed += 1
+            if processed % PROGRESS_COMMIT_INTERVAL == 0:
+                self._save(db, job.id, processed=processed, failed=len(failures))
+        
+        if not processed:
+            raise ValueError(f"None of the {len(render_jobs)} certificates could be rendered")
+        
+        zip_path = os.path.join(JOBS_DIR, f"{job.id}.zip")
+        written = 0
+        with zipfile.ZipFile(f"{zip_path}.tmp", 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for cert_uuid, arcname, _, _ in render_jobs:
+                if os.path.exists(part_path(cert_uuid)):
+                    zipf.write(part_path(cert_uuid), arcname=arcname)
+                    written += 1
+                    if written % PROGRESS_COMMIT_INTERVAL == 0:
+                        self._save(db, job.id)
+        os.replace(f"{zip_path}.tmp", zip_path)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        
+        self._save(
+            db, job.id,
+            processed=written,
+            failed=len(failures),
+            failed_uuids=failures or None,
+            artifact_path=zip_path,
+            status="partial" if failures else "completed",
+        )
+
+
+certificate_job_runner = CertificateJobRunner(
+    settings.CERTIFICATE_JOB_WORKERS,
+    settings.CERTIFICATE_JOB_LEASE_SECONDS,
+    settings.CERTIFICATE_JOB_RETENTION_HOURS,
+)
@@ -0,0 +1,105 @@
+import uuid
+from typing import Any, Dict, List
+from sqlalchemy import and_, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.certificate import Certificate
+from app.models.class_model import Class
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+
+# Respostas de GET /students/cpf/{cpf}/certificates, por CPF.
+# Invalidadas sempre que um certificado é emitido para o aluno.
+certificates_by_cpf_cache = TTLCache(settings.CPF_CACHE_MAX_ENTRIES, settings.CPF_CACHE_TTL_SECONDS)
+
+
+def build_certificate_snapshot(student: Student, course: Course, class_obj: Class) -> Dict[str, Any]:
+    """Dados históricos gravados no certificado no momento da emissão."""
+    return {
+        "student_name": student.name,
+        "student_cpf": student.cpf,
+        "course_name": course.name,
+        "course_workload": course.workload,
+        "class_name": class_obj.name
+    }
+
+
+def issue_class_certificates(db: Session, class_obj: Class, course: Course) -> List[Certificate]:
+    """
+    Emite os certificados de todos os alunos inscritos em uma turma.
+    Certificados já existentes para o aluno/curso são reaproveitados, então a
+    operação é idempotente e pode ser repetida com segurança.
+    
+    Usa um número constante de consultas, independente do tamanho da turma:
+    uma consulta com join (inscrições, alunos e certificados existentes),
+    um insert em lote (executemany) dos certificados faltantes, um único
+    commit e uma releitura dos certificados.
+    """
+    try:
+        return _issue_class_certificates(db, class_obj, course)
+    except IntegrityError:
+        # Outra requisição emitiu certificados desta turma ao mesmo tempo e o
+        # índice único (aluno, curso) barrou o lote; a nova leitura os reaproveita
+        db.rollback()
+        return _issue_class_certificates(db, class_obj, course)
+
+
+def _issue_class_certificates(db: Session, class_obj: Class, course: Course) -> List[Certificate]:
+    rows = (
+        db.query(Student, Certificate)
+        .join(Enrollment, Enrollment.student_id == Student.id)
+        .outerjoin(Certificate, and_(
+            Certificate.student_id == Student.id,
+            Certificate.course_id == class_obj.course_id
+        ))
+        .filter(Enrollment.class_id == class_obj.id)
+        .order_by(Enrollment.id, Certificate.id)
+        .all()
+    )
+    
+    existing_certificates: List[Certificate] = []
+    certificate_uuids: List[str] = []
+    new_certificates: List[Dict[str, Any]] = []
+    affected_cpfs: List[str] = []
+    seen_students = set()
+    
+    for student, existing_cert in rows:
+        if student.id in seen_students:
+            continue
+        seen_students.add(student.id)
+        
+        if existing_cert:
+            existing_certificates.append(existing_cert)
+            certificate_uuids.append(existing_cert.uuid)
+            continue
+        
+        new_certificate = {
+            "uuid": str(uuid.uuid4()),
+            "student_id": student.id,
+            "course_id": class_obj.course_id,
+            "template_id": class_obj.certificate_template,
+            "data_snapshot": build_certificate_snapshot(student, course, class_obj)
+        }
+        new_certificates.append(new_certificate)
+        certificate_uuids.append(new_certificate["uuid"])
+        affected_cpfs.append(student.cpf)
+    
+    if not new_certificates:
+        return existing_certificates
+    
+    # executemany sem RETURNING: um único statement para todos os certificados novos
+    db.execute(insert(Certificate), new_certificates)
+    db.commit()
+    
+    for cpf in affected_cpfs:
+        certificates_by_cpf_cache.invalidate(cpf)
+    
+    # O commit expira os objetos; recarrega todos de uma vez em vez de um refresh por certificado
+    loaded = {
+        certificate.uuid: certificate
+        for certificate in db.query(Certificate).filter(Certificate.uuid.in_(certificate_uuids)).all()
+    }
+    return [loaded[certificate_uuid] for certificate_uuid in certificate_uuids]
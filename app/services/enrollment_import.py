@@ -0,0 +1,286 @@
+"""
+Importação em massa de inscrições (CSV ou NDJSON) enviada por administradores.
+
+O arquivo é lido em streaming e processado em lotes de
+`ENROLLMENT_IMPORT_BATCH_SIZE` linhas. Cada lote usa um número constante de
+consultas: uma para resolver os alunos (por CPF ou email), uma para as turmas,
+uma para as inscrições já existentes, um UPDATE de `available_slots` por turma
+e um insert em lote (executemany) das inscrições. Cada lote é uma transação;
+linhas inválidas não impedem as demais e voltam no relatório de erros.
+"""
+
+import codecs
+import csv
+import json
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import insert, or_, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.validators import validate_cpf
+from app.db.session import SessionLocal
+from app.models.class_model import Class
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+
+# Tentativas por lote quando uma inscrição ou vaga concorrente muda o cenário
+BATCH_ATTEMPTS = 3
+
+
+class ImportRow:
+    """Linha do arquivo já validada: turma e aluno (por CPF ou email)."""
+
+    __slots__ = ("row", "class_id", "cpf", "email")
+
+    def __init__(self, row: int, class_id: int, cpf: Optional[str], email: Optional[str]):
+        self.row = row
+        self.class_id = class_id
+        self.cpf = cpf
+        self.email = email
+
+    @property
+    def student(self) -> str:
+        return self.cpf or self.email
+
+
+class InvalidImportFile(ValueError):
+    """O arquivo como um todo não pode ser importado (ex.: cabeçalho inválido)."""
+
+
+class _ConcurrentChange(Exception):
+    """As vagas de uma turma mudaram entre a leitura e o UPDATE do lote."""
+
+
+def row_error(row: int, detail: str, class_id: Optional[int] = None, student: Optional[str] = None) -> Dict[str, Any]:
+    return {"row": row, "class_id": class_id, "student": student, "detail": detail}
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Decodifica o corpo recebido em pedaços e produz `(número da linha, linha)`,
+    sem manter o arquivo inteiro em memória. Aceita BOM e finais CRLF.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    line_number = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield line_number + 1, pending.rstrip("\r")
+
+
+class _LineQueue:
+    """Fonte do csv.reader: entrega as linhas já recebidas, uma por vez."""
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, List[str]]]:
+    """
+    Lê o CSV em streaming com um único csv.reader e produz `(número da linha
+    inicial, valores)` por registro, aceitando campos entre aspas com quebras
+    de linha. As linhas são acumuladas até as aspas do registro fecharem
+    (número par de `"`), então o reader nunca fica sem entrada no meio de um
+    registro.
+    """
+    source = _LineQueue()
+    reader = csv.reader(source)
+    start = None
+    quotes = 0
+    async for line_number, line in iter_lines(chunks):
+        if start is None:
+            start = line_number
+        source.lines.append(line + "\n")
+        quotes += line.count('"')
+        if quotes % 2 == 0:
+            yield start, next(reader)
+            start, quotes = None, 0
+    if start is not None:
+        # Aspas não fechadas até o fim do arquivo: o reader entrega o que leu
+        yield start, next(reader)
+
+
+def iter_records(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[Tuple[int, Union[str, List[str]]]]:
+    """Registros do arquivo: valores do CSV ou linhas do NDJSON, com o número da linha."""
+    return iter_csv_rows(chunks) if format == "csv" else iter_lines(chunks)
+
+
+class RowParser:
+    """
+    Converte linhas de CSV (com cabeçalho `class_id,cpf,email`; `cpf` ou
+    `email` pode ser omitido) ou NDJSON (objetos com as mesmas chaves) em
+    `ImportRow`.
+    """
+
+    def __init__(self, format: str):
+        self.format = format
+        self._header: Optional[List[str]] = None
+
+    def parse(self, row: int, record: Union[str, List[str]]) -> Optional[ImportRow]:
+        """
+        Valida um registro de `iter_records` (linha NDJSON ou valores do CSV).
+        Retorna None para linhas em branco e o cabeçalho.
+
+        Raises:
+            InvalidImportFile: se o cabeçalho do CSV for inválido
+            ValueError: com a mensagem que vai para o relatório de erros
+        """
+        if self.format == "ndjson":
+            if not record.strip():
+                return None
+            try:
+                record = json.loads(record)
+            except json.JSONDecodeError:
+                raise ValueError("Invalid JSON")
+            if not isinstance(record, dict):
+                raise ValueError("Each line must be a JSON object")
+        else:
+            values = record
+            if not any(value.strip() for value in values):
+                return None
+            if self._header is None:
+                self._header = [value.strip().lower() for value in values]
+                if "class_id" not in self._header or not {"cpf", "email"} & set(self._header):
+                    raise InvalidImportFile("CSV header must have class_id and cpf and/or email")
+                return None
+            record = dict(zip(self._header, values))
+
+        try:
+            class_id = int(str(record.get("class_id", "")).strip())
+        except ValueError:
+            raise ValueError("Invalid class_id")
+
+        cpf = str(record.get("cpf") or "").strip() or None
+        email = str(record.get("email") or "").strip() or None
+        if cpf:
+            validate_cpf(cpf)
+        elif not email:
+            raise ValueError("Row must have cpf or email")
+        return ImportRow(row, class_id, cpf, email)
+
+
+def _import_rows(db: Session, rows: List[ImportRow]) -> Tuple[List[Dict[str, Any]], Dict[int, int]]:
+    cpfs = {row.cpf for row in rows if row.cpf}
+    emails = {row.email for row in rows if not row.cpf}
+    conditions = []
+    if cpfs:
+        conditions.append(Student.cpf.in_(cpfs))
+    if emails:
+        conditions.append(Student.email.in_(emails))
+    students = db.query(Student.id, Student.cpf, Student.email, Student.is_active).filter(or_(*conditions)).all()
+    by_cpf = {student.cpf: student for student in students}
+    by_email = {student.email: student for student in students}
+
+    classes = {
+        class_obj.id: class_obj
+        for class_obj in db.query(Class.id, Class.is_open, Class.available_slots).filter(
+            Class.id.in_({row.class_id for row in rows}),
+            Class.is_active == True
+        )
+    }
+
+    resolved = [(row, by_cpf.get(row.cpf) if row.cpf else by_email.get(row.email)) for row in rows]
+    pairs = {
+        (student.id, row.class_id)
+        for row, student in resolved
+        if student is not None and row.class_id in classes
+    }
+    existing = set()
+    if pairs:
+        existing = set(
+            db.query(Enrollment.student_id, Enrollment.class_id).filter(
+                tuple_(Enrollment.student_id, Enrollment.class_id).in_(pairs)
+            ).all()
+        )
+
+    errors: List[Dict[str, Any]] = []
+    accepted: Dict[int, List[Tuple[ImportRow, int]]] = {}
+    seen = set()
+    for row, student in resolved:
+        class_obj = classes.get(row.class_id)
+        if student is None:
+            errors.append(row_error(row.row, "Student not found", row.class_id, row.student))
+        elif not student.is_active:
+            errors.append(row_error(row.row, "Inactive student account", row.class_id, row.student))
+        elif class_obj is None:
+            errors.append(row_error(row.row, "Class not found", row.class_id, row.student))
+        elif not class_obj.is_open:
+            errors.append(row_error(row.row, "Class is closed for enrollment", row.class_id, row.student))
+        elif (student.id, row.class_id) in existing:
+            errors.append(row_error(row.row, "Student is already enrolled in this class", row.class_id, row.student))
+        elif (student.id, row.class_id) in seen:
+            errors.append(row_error(row.row, "Duplicated row", row.class_id, row.student))
+        else:
+            seen.add((student.id, row.class_id))
+            accepted.setdefault(row.class_id, []).append((row, student.id))
+
+    new_enrollments = []
+    enrolled_by_class: Dict[int, int] = {}
+    # Turmas em ordem de id: lotes concorrentes travam as linhas na mesma ordem
+    for class_id, class_rows in sorted(accepted.items()):
+        granted = min(len(class_rows), classes[class_id].available_slots)
+        for row, _ in class_rows[granted:]:
+            errors.append(row_error(row.row, "No available slots in this class", class_id, row.student))
+        if not granted:
+            continue
+
+        # Um UPDATE por turma; a condição falha se outra inscrição consumiu
+        # vagas depois da leitura acima, e o lote é refeito
+        result = db.execute(
+            update(Class)
+            .where(Class.id == class_id, Class.available_slots >= granted)
+            .values(available_slots=Class.available_slots - granted)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            raise _ConcurrentChange(class_id)
+        enrolled_by_class[class_id] = granted
+        new_enrollments.extend(
+            {"student_id": student_id, "class_id": class_id} for _, student_id in class_rows[:granted]
+        )
+
+    if new_enrollments:
+        db.execute(insert(Enrollment), new_enrollments)
+    db.commit()
+
+    errors.sort(key=lambda error: error["row"])
+    return errors, enrolled_by_class
+
+
+def import_enrollment_batch(rows: List[ImportRow]) -> Tuple[List[Dict[str, Any]], Dict[int, int]]:
+    """
+    Inscreve um lote de linhas em uma transação.
+
+    Returns:
+        (erros por linha, inscrições criadas por turma)
+    """
+    db = SessionLocal()
+    try:
+        for _ in range(BATCH_ATTEMPTS):
+            try:
+                return _import_rows(db, rows)
+            except (IntegrityError, _ConcurrentChange):
+                # Uma inscrição concorrente ocupou a vaga ou o par aluno/turma
+                db.rollback()
+        return [
+            row_error(row.row, "Concurrent enrollments changed this class; retry the row", row.class_id, row.student)
+            for row in rows
+        ], {}
+    finally:
+        db.close()
@@ -0,0 +1,187 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+
+class PdfCache:
+    """
+    Cache persistente de PDFs renderizados, endereçado por conteúdo.
+    
+    As chaves combinam o UUID do certificado com um hash do template e dos
+    dados (ver `pdf_service.certificate_cache_key`), portanto uma entrada nunca
+    fica desatualizada: se o template mudar, a chave muda. O tamanho total é
+    limitado e as entradas menos usadas recentemente são removidas (LRU).
+    A ordem de uso é persistida no mtime dos arquivos e sobrevive a reinícios.
+    
+    O lock global cobre só o índice em memória; o I/O de arquivos é feito fora
+    dele. Se um arquivo do índice sumir do disco (ex.: uma remoção concorrente),
+    a entrada é descartada no próximo `get` e tratada como miss.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        # UUID do certificado -> chave atual, para descartar a versão anterior em O(1)
+        self._keys_by_uuid: Dict[str, str] = {}
+        self._total_bytes = 0
+        # `_lock` protege apenas o índice e os contadores; leitura, escrita e
+        # remoção de arquivos acontecem fora dele
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def path_for(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.pdf")
+    
+    @staticmethod
+    def _uuid_of(key: str) -> str:
+        return key.split("_", 1)[0]
+    
+    def _load(self) -> None:
+        """Reconstrói o índice LRU a partir dos arquivos em disco (mais antigo primeiro)."""
+        if self._entries is not None:
+            return
+        
+        with self._load_lock:
+            if self._entries is not None:
+                return
+            
+            os.makedirs(self._directory, exist_ok=True)
+            found = []
+            for filename in os.listdir(self._directory):
+                if not filename.endswith(".pdf"):
+                    continue
+                try:
+                    file_stat = os.stat(os.path.join(self._directory, filename))
+                except FileNotFoundError:
+                    continue
+                found.append((file_stat.st_mtime, filename[:-4], file_stat.st_size))
+            
+            entries: "OrderedDict[str, int]" = OrderedDict()
+            keys_by_uuid: Dict[str, str] = {}
+            stale_paths = []
+            total_bytes = 0
+            for _, key, size in sorted(found):
+                # Versões anteriores do mesmo certificado: vale a mais recente
+                previous = keys_by_uuid.get(self._uuid_of(key))
+                if previous is not None:
+                    total_bytes -= entries.pop(previous)
+                    stale_paths.append(self.path_for(previous))
+                keys_by_uuid[self._uuid_of(key)] = key
+                entries[key] = size
+                total_bytes += size
+            
+            with self._lock:
+                self._keys_by_uuid = keys_by_uuid
+                self._total_bytes = total_bytes
+                self._entries = entries
+        
+        self._unlink(stale_paths)
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna os bytes do PDF em cache ou None."""
+        self._load()
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+        
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+        except FileNotFoundError:
+            # Removido por outra thread (ou fora do processo) depois da consulta ao índice
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+        
+        try:
+            os.utime(path, None)
+        except FileNotFoundError:
+            pass
+        return pdf_bytes
+    
+    def put(self, key: str, pdf_bytes: bytes) -> None:
+        """
+        Grava um PDF renderizado no cache (escrita atômica via arquivo temporário).
+        Entradas antigas do mesmo certificado (template ou dados anteriores) são descartadas.
+        """
+        self._load()
+        path = self.path_for(key)
+        
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self._directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        removed = []
+        with self._lock:
+            self._forget(key)
+            
+            previous = self._keys_by_uuid.get(self._uuid_of(key))
+            if previous is not None:
+                self._forget(previous)
+                removed.append(previous)
+            
+            self._entries[key] = len(pdf_bytes)
+            self._keys_by_uuid[self._uuid_of(key)] = key
+            self._total_bytes += len(pdf_bytes)
+            
+            while self._total_bytes > self._max_bytes and len(self._entries) > 1:
+                oldest_key = next(iter(self._entries))
+                self._forget(oldest_key)
+                removed.append(oldest_key)
+                self.evictions += 1
+        
+        self._unlink(self.path_for(k) for k in removed)
+    
+    def _forget(self, key: str) -> None:
+        """Remove a chave do índice (chamado com `_lock` adquirido)."""
+        size = self._entries.pop(key, None)
+        if size is None:
+            return
+        self._total_bytes -= size
+        if self._keys_by_uuid.get(self._uuid_of(key)) == key:
+            del self._keys_by_uuid[self._uuid_of(key)]
+    
+    @staticmethod
+    def _unlink(paths) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    def stats(self) -> Dict[str, int]:
+        """Estatísticas de uso do cache."""
+        self._load()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self._max_bytes
+            }
+
+
+pdf_cache = PdfCache(settings.PDF_CACHE_DIR, settings.PDF_CACHE_MAX_MB * 1024 * 1024)
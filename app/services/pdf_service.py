@@ -1,32 +1,38 @@
+import hashlib
+import io
+import json
+import logging
 import os
 import zipfile
-from typing import List, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from pypdf import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import landscape, A4
 from datetime import datetime
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.certificate import Certificate
 from app.models.student import Student
 from app.models.course import Course
+from app.services.pdf_cache import pdf_cache
 from app.services.templates.registry import TemplateRegistry
+from app.services.templates.stamped import StampedTemplate
 
-def generate_certificate_pdf(certificate: Certificate, student: Optional[Student] = None, course: Optional[Course] = None) -> str:
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = "generated_certificates"
+
+
+def build_certificate_data(certificate: Certificate, student: Optional[Student] = None, course: Optional[Course] = None) -> Dict[str, Any]:
     """
-    Gera um arquivo PDF para o certificado usando o sistema de templates.
+    Monta o dicionário de dados usado pelos templates.
     Prioriza dados do snapshot (histórico) se disponíveis.
     """
-
-    output_dir = "generated_certificates"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    
-    filename = f"{output_dir}/{certificate.uuid}.pdf"
-    
-    data = {}
-    
-  
     if certificate.data_snapshot:
-        data = certificate.data_snapshot
+        # Cópia para não alterar o snapshot persistido no modelo
+        data = dict(certificate.data_snapshot)
         data['issue_date'] = certificate.issue_date
         data['uuid'] = certificate.uuid
     else:
@@ -45,62 +51,259 @@ def generate_certificate_pdf(certificate: Certificate, student: Optional[Student
     if isinstance(data.get('issue_date'), str):
         try:
             data['issue_date'] = datetime.fromisoformat(data['issue_date'])
-        except:
+        except ValueError:
             pass 
-            
+    
+    return data
+
+
+def _render_certificate_file(template_name: str, data: Dict[str, Any], filename: str) -> str:
+    """Renderiza um certificado em disco."""
+    template = TemplateRegistry.get_template(template_name)
+    template.generate(data, filename)
+    return filename
+
+
+def _render_certificate_bytes(template_name: str, data: Dict[str, Any]) -> bytes:
+    """
+    Renderiza um certificado em memória. Executado tanto no processo principal
+    quanto nos workers do pool, por isso recebe apenas dados serializáveis.
+    """
+    template = TemplateRegistry.get_template(template_name)
+    return template.render_bytes(data)
+
+
+def generate_certificate_pdf(certificate: Certificate, student: Optional[Student] = None, course: Optional[Course] = None) -> str:
+    """
+    Gera um arquivo PDF para o certificado usando o sistema de templates.
+    Prioriza dados do snapshot (histórico) se disponíveis.
+    """
+    if not os.path.exists(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+    
+    filename = f"{OUTPUT_DIR}/{certificate.uuid}.pdf"
+    data = build_certificate_data(certificate, student, course)
     template_name = certificate.template_id or "default"
+    
+    return _render_certificate_file(template_name, data, filename)
+
+
+def render_certificate_pdf(certificate: Certificate, student: Optional[Student] = None, course: Optional[Course] = None) -> bytes:
+    """
+    Renderiza o PDF do certificado em memória e retorna seus bytes.
+    Prioriza dados do snapshot (histórico) se disponíveis.
+    """
+    data = build_certificate_data(certificate, student, course)
+    return _render_certificate_bytes(certificate.template_id or "default", data)
+
+
+def certificate_cache_key(certificate_uuid: str, template_name: str, data: Dict[str, Any]) -> str:
+    """
+    Chave do cache de PDFs: UUID do certificado + hash da versão do template e dos dados.
+    """
     template = TemplateRegistry.get_template(template_name)
+    payload = json.dumps(
+        {"template": template.name, "version": template.version, "data": data},
+        sort_keys=True,
+        default=str
+    )
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+    return f"{certificate_uuid}_{digest}"
+
+
+def get_cached_certificate_pdf(certificate: Certificate, student: Optional[Student] = None, course: Optional[Course] = None) -> bytes:
+    """
+    Retorna os bytes do PDF do certificado, renderizando-o em memória apenas
+    se não estiver no cache.
+    """
+    data = build_certificate_data(certificate, student, course)
+    template_name = certificate.template_id or "default"
+    key = certificate_cache_key(certificate.uuid, template_name, data)
     
-    template.generate(data, filename)
+    pdf_bytes = pdf_cache.get(key)
+    if pdf_bytes is not None:
+        return pdf_bytes
     
-    return filename
+    pdf_bytes = _render_certificate_bytes(template_name, data)
+    pdf_cache.put(key, pdf_bytes)
+    return pdf_bytes
+
 
-def generate_bulk_certificates_zip(certificates: List[Certificate], db: Session, class_id: int) -> str:
+def prepare_bulk_jobs(certificates: List[Certificate], db: Session) -> List[Tuple[str, str, str, Dict[str, Any]]]:
+    """
+    Resolve os dados de cada certificado do lote.
+    Retorna tuplas (uuid, nome no ZIP, template, dados) na ordem original,
+    sem referências a objetos do ORM (podem ser usadas após fechar a sessão).
     """
-    Gera múltiplos certificados em PDF e os empacota em um arquivo ZIP.
-    Os PDFs individuais são removidos automaticamente após serem adicionados ao ZIP.
+    jobs = []
+    for certificate in certificates:
+        student = None
+        course = None
+        
+        if not certificate.data_snapshot:
+            student = db.query(Student).filter(Student.id == certificate.student_id).first()
+            course = db.query(Course).filter(Course.id == certificate.course_id).first()
+            if not student or not course:
+                continue
+        
+        data = build_certificate_data(certificate, student, course)
+        
+        safe_name = "".join(c for c in data['student_name'] if c.isalnum() or c in (' ', '-', '_')).strip()
+        safe_name = safe_name.replace(' ', '_')
+        pdf_name_in_zip = f"certificado_{safe_name}_{certificate.uuid}.pdf"
+        
+        jobs.append((certificate.uuid, pdf_name_in_zip, certificate.template_id or "default", data))
+    return jobs
+
+
+def iter_rendered_pdfs(
+    jobs: List[Tuple[str, str, str, Dict[str, Any]]],
+    workers: Optional[int] = None,
+    failures: Optional[List[str]] = None,
+) -> Iterator[Tuple[str, bytes]]:
     """
-    output_dir = "generated_certificates"
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    Renderiza os PDFs do lote e os entrega na ordem original como (nome no ZIP, bytes).
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    zip_filename = f"{output_dir}/certificados_turma_{class_id}_{timestamp}.zip"
+    Com `workers` > 1 (padrão: `settings.CERTIFICATE_RENDER_WORKERS`) usa um pool
+    de processos, mantendo no máximo 2 renderizações por worker em andamento
+    para que o consumo de memória não cresça com o tamanho da turma.
+    Certificados que falham são registrados no log, ignorados e, se `failures`
+    for informada, têm o UUID adicionado a ela.
+    """
+    if workers is None:
+        workers = settings.CERTIFICATE_RENDER_WORKERS
     
-    with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for certificate in certificates:
-            student = None
-            course = None
-            
-            if not certificate.data_snapshot:
-                student = db.query(Student).filter(Student.id == certificate.student_id).first()
-                course = db.query(Course).filter(Course.id == certificate.course_id).first()
-                if not student or not course:
-                    continue
-            
+    if not workers or workers <= 1 or len(jobs) <= 1:
+        for cert_uuid, arcname, template_name, data in jobs:
             try:
-                pdf_path = generate_certificate_pdf(certificate, student, course)
-                
-                student_name = certificate.data_snapshot.get('student_name') if certificate.data_snapshot else student.name
-                
-                safe_name = "".join(c for c in student_name if c.isalnum() or c in (' ', '-', '_')).strip()
-                safe_name = safe_name.replace(' ', '_')
-                pdf_name_in_zip = f"certificado_{safe_name}_{certificate.uuid}.pdf"
-                
-                # Adicionar PDF ao ZIP
-                zipf.write(pdf_path, arcname=pdf_name_in_zip)
-                
-                # Remover o PDF individual após adicioná-lo ao ZIP
-                try:
-                    if os.path.exists(pdf_path):
-                        os.remove(pdf_path)
-                        print(f"✓ PDF individual removido: {pdf_path}")
-                except Exception as e:
-                    print(f"⚠ Erro ao remover PDF {pdf_path}: {e}")
-                
-            except Exception as e:
-                print(f"Error generating certificate {certificate.uuid}: {e}")
+                pdf_bytes = _render_certificate_bytes(template_name, data)
+            except Exception:
+                logger.exception(f"Falha ao gerar o certificado {cert_uuid}")
+                if failures is not None:
+                    failures.append(cert_uuid)
                 continue
+            yield arcname, pdf_bytes
+        return
     
-    return zip_filename
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        job_iter = iter(jobs)
+        
+        def submit_next() -> None:
+            job = next(job_iter, None)
+            if job is not None:
+                cert_uuid, arcname, template_name, data = job
+                pending.append((cert_uuid, arcname, executor.submit(_render_certificate_bytes, template_name, data)))
+        
+        for _ in range(workers * 2):
+            submit_next()
+        
+        while pending:
+            cert_uuid, arcname, future = pending.popleft()
+            try:
+                pdf_bytes = future.result()
+            except Exception:
+                logger.exception(f"Falha ao gerar o certificado {cert_uuid}")
+                if failures is not None:
+                    failures.append(cert_uuid)
+                pdf_bytes = None
+            # Só agora o resultado saiu da fila: nunca há mais de `workers * 2`
+            # renderizações submetidas e não consumidas
+            submit_next()
+            if pdf_bytes is not None:
+                yield arcname, pdf_bytes
+
+
+class _ZipStreamBuffer:
+    """
+    Destino não-pesquisável (sem seek/tell) para o zipfile.
+    O zipfile passa a usar data descriptors e os bytes gravados podem ser
+    drenados e enviados ao cliente a cada entrada.
+    """
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
 
+def iter_bulk_certificates_zip(jobs: List[Tuple[str, str, str, Dict[str, Any]]], workers: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Gera o ZIP dos certificados como um fluxo de bytes, sem arquivos temporários.
+    Cada PDF é renderizado em memória e enviado como uma entrada do ZIP
+    assim que fica pronto. Use com `prepare_bulk_jobs` e um StreamingResponse.
+    """
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for arcname, pdf_bytes in iter_rendered_pdfs(jobs, workers):
+            zipf.writestr(arcname, pdf_bytes)
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk
+
+
+def write_class_booklet(jobs: List[Tuple[str, str, str, Dict[str, Any]]], output: BinaryIO, workers: Optional[int] = None) -> int:
+    """
+    Renderiza todos os certificados do lote em sequência em um único PDF,
+    para impressão. Retorna o número de certificados incluídos.
+    
+    Templates estampados (StampedTemplate) desenham todas as páginas em um único
+    canvas, compartilhando a camada estática, fontes e imagens. Para os demais
+    templates cada certificado é renderizado, anexado ao documento e descartado;
+    ao final, objetos idênticos (fontes, imagens) são deduplicados.
+    
+    Limitação: o caderno inteiro fica em memória até ser gravado em `output`
+    (o canvas do ReportLab só grava no `save` e o `PdfWriter` no `write`), então
+    o pico cresce com o número de páginas. Quem chama deve limitar o tamanho
+    do lote (ver `CERTIFICATE_BOOKLET_MAX_PAGES`).
+    """
+    template_names = {template_name for _, _, template_name, _ in jobs}
+    if len(template_names) == 1:
+        template = TemplateRegistry.get_template(next(iter(template_names)))
+        if isinstance(template, StampedTemplate):
+            template.render_many((data for _, _, _, data in jobs), output)
+            return len(jobs)
+    
+    writer = PdfWriter()
+    count = 0
+    for _, pdf_bytes in iter_rendered_pdfs(jobs, workers):
+        writer.append(PdfReader(io.BytesIO(pdf_bytes)))
+        count += 1
+    
+    writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+    writer.write(output)
+    return count
+
+
+def generate_bulk_certificates_zip(certificates: List[Certificate], db: Session, class_id: int, workers: Optional[int] = None) -> str:
+    """
+    Gera múltiplos certificados em PDF e os empacota em um arquivo ZIP em disco.
+    Os PDFs são renderizados em memória e gravados diretamente no ZIP.
+    """
+    if not os.path.exists(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    zip_filename = f"{OUTPUT_DIR}/certificados_turma_{class_id}_{timestamp}.zip"
+    
+    jobs = prepare_bulk_jobs(certificates, db)
+    
+    with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for arcname, pdf_bytes in iter_rendered_pdfs(jobs, workers):
+            zipf.writestr(arcname, pdf_bytes)
+    
+    return zip_filename
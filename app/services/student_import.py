@@ -0,0 +1,413 @@
+"""
+Importação em massa de estudantes (CSV ou NDJSON) como job persistente.
+
+O arquivo enviado é gravado em disco e processado em segundo plano em lotes de
+`STUDENT_IMPORT_BATCH_SIZE` linhas. Em cada lote:
+
+- as linhas são validadas com `StudentImportRow` (CPF via `validate_cpf`);
+- CPFs e emails repetidos são barrados com duas consultas `IN` por lote, além
+  das repetições dentro do próprio arquivo;
+- senhas em texto são convertidas em hash bcrypt em um pool de processos
+  (`STUDENT_IMPORT_HASH_WORKERS`); hashes bcrypt já calculados são gravados
+  como vieram;
+- os estudantes são inseridos com um único insert em lote (executemany).
+
+O progresso (`processed`, `imported`, `failed` e a última linha gravada) é
+salvo na mesma transação dos inserts, então um job interrompido é retomado
+exatamente do lote seguinte. Os erros por linha vão para um arquivo NDJSON.
+
+Como nos jobs de certificados, cada job tem um dono (`claimed_by` +
+`lease_expires_at`): com vários workers da API, só quem tomou posse grava
+lotes, e um job cujo dono morreu é assumido quando a posse expira.
+"""
+
+import csv
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import and_, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core import security
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.student import Student
+from app.models.student_import_job import StudentImportJob
+from app.schemas.student import StudentImportRow
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ("name", "email", "cpf")
+
+# Tentativas por lote quando um cadastro concorrente ocupa um CPF/email do lote
+BATCH_ATTEMPTS = 3
+
+# Senhas enviadas por vez a cada processo do pool de hash
+HASH_CHUNK_SIZE = 8
+
+
+def source_path(job_id: str, format: str) -> str:
+    return os.path.join(settings.STUDENT_IMPORT_DIR, f"{job_id}.{format}")
+
+
+def errors_path(job_id: str) -> str:
+    return os.path.join(settings.STUDENT_IMPORT_DIR, f"{job_id}.errors.ndjson")
+
+
+def check_header(path: str, format: str) -> None:
+    """
+    Confere o cabeçalho do CSV enviado (NDJSON não tem cabeçalho).
+
+    Raises:
+        ValueError: se faltar alguma coluna obrigatória
+    """
+    if format != "csv":
+        return
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f), [])
+    missing = [field for field in REQUIRED_FIELDS if field not in {h.strip().lower() for h in header}]
+    if missing:
+        raise ValueError(f"CSV header is missing: {', '.join(missing)}")
+
+
+def iter_records(path: str, format: str, after_line: int = 0) -> Iterator[Tuple[int, Any]]:
+    """
+    Produz `(número da linha, registro)` das linhas após `after_line`. O
+    registro é um dict ou, para NDJSON inválido, a mensagem de erro.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if format == "ndjson":
+            for line_number, line in enumerate(f, start=1):
+                if line_number <= after_line or not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = "Invalid JSON"
+                yield line_number, record if isinstance(record, (dict, str)) else "Each line must be a JSON object"
+            return
+
+        reader = csv.DictReader(f)
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+        for record in reader:
+            # line_num é a última linha física do registro (campos entre aspas podem quebrar linha)
+            if reader.line_num <= after_line or not any((value or "").strip() for value in record.values()):
+                continue
+            yield reader.line_num, record
+
+
+class LeaseLost(Exception):
+    """Outro worker assumiu o job depois que a posse deste expirou."""
+
+
+def _validation_message(exc: ValidationError) -> str:
+    messages = []
+    for error in exc.errors():
+        message = error['msg'].removeprefix('Value error, ')
+        # Erros do model_validator não têm campo (loc vazio)
+        if error['loc']:
+            message = f"{'.'.join(str(part) for part in error['loc'])}: {message}"
+        messages.append(message)
+    return "; ".join(messages)
+
+
+@contextmanager
+def hashing_pool(workers: int):
+    """Pool de processos para o bcrypt (None se `workers` <= 1: hash no próprio processo)."""
+    if not workers or workers <= 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield executor
+
+
+def hash_passwords(passwords: List[str], executor: Optional[ProcessPoolExecutor]) -> List[str]:
+    if executor is None:
+        return [security.get_password_hash(password) for password in passwords]
+    return list(executor.map(security.get_password_hash, passwords, chunksize=HASH_CHUNK_SIZE))
+
+
+class StudentImportRunner:
+    """
+    Executa jobs de importação de estudantes em uma thread local, um por vez
+    (o paralelismo fica no hash das senhas). O estado fica na tabela
+    `student_import_jobs`; jobs pendentes ou interrompidos são retomados com
+    `resume_incomplete`.
+
+    Antes de processar, o runner toma posse do job com um UPDATE condicional,
+    renovado na transação de cada lote: se outro worker assumiu o job, o lote
+    é desfeito e o runner para.
+    """
+
+    def __init__(self, hash_workers: int, batch_size: int, lease_seconds: int):
+        self._hash_workers = hash_workers
+        self._batch_size = max(1, batch_size)
+        self._lease = timedelta(seconds=max(1, lease_seconds))
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._active: Set[str] = set()
+        self._retries: Dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def submit(self, job_id: str) -> None:
+        """Agenda a execução de um job (ignorado se já estiver em andamento)."""
+        with self._lock:
+            self._retries.pop(job_id, None)
+            if job_id in self._active:
+                return
+            if self._executor is None:
+                self._stopping.clear()
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="student-import")
+            self._active.add(job_id)
+            self._executor.submit(self._run, job_id)
+
+    def resume_incomplete(self) -> int:
+        """Reagenda jobs pendentes ou interrompidos. Retorna quantos foram retomados."""
+        db = SessionLocal()
+        try:
+            job_ids = [
+                job_id for (job_id,) in db.query(StudentImportJob.id).filter(
+                    StudentImportJob.status.in_(("pending", "running"))
+                ).order_by(StudentImportJob.created_at).all()
+            ]
+        finally:
+            db.close()
+
+        for job_id in job_ids:
+            self.submit(job_id)
+        if job_ids:
+            logger.info(f"{len(job_ids)} importação(ões) de estudantes retomada(s)")
+        return len(job_ids)
+
+    def shutdown(self) -> None:
+        """Interrompe após o lote atual; o job continua da última linha gravada no próximo início."""
+        self._stopping.set()
+        with self._lock:
+            for timer in self._retries.values():
+                timer.cancel()
+            self._retries.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._active.clear()
+
+    def _claim(self, db, job_id: str) -> bool:
+        """Toma posse de um job pendente ou de um `running` cuja posse expirou."""
+        now = datetime.utcnow()
+        result = db.execute(
+            update(StudentImportJob)
+            .where(
+                StudentImportJob.id == job_id,
+                or_(
+                    StudentImportJob.status == "pending",
+                    and_(
+                        StudentImportJob.status == "running",
+                        or_(StudentImportJob.lease_expires_at.is_(None), StudentImportJob.lease_expires_at < now),
+                    ),
+                ),
+            )
+            .values(status="running", claimed_by=self._owner, lease_expires_at=now + self._lease)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def _renew(self, db, job_id: str, **values) -> None:
+        """
+        Grava o estado do job e renova a posse na transação atual, sem commit.
+
+        Raises:
+            LeaseLost: se outro worker assumiu o job (a transação é desfeita)
+        """
+        result = db.execute(
+            update(StudentImportJob)
+            .where(StudentImportJob.id == job_id, StudentImportJob.claimed_by == self._owner)
+            .values(lease_expires_at=datetime.utcnow() + self._lease, **values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            db.rollback()
+            raise LeaseLost(job_id)
+
+    def _save(self, db, job_id: str, **values) -> None:
+        self._renew(db, job_id, **values)
+        db.commit()
+
+    def _retry_when_lease_expires(self, db, job_id: str) -> None:
+        """Se outro worker detém o job, tenta de novo quando a posse dele expirar."""
+        job = db.query(StudentImportJob).filter(StudentImportJob.id == job_id).first()
+        if not job or job.status != "running" or not job.lease_expires_at:
+            return
+        delay = max((job.lease_expires_at - datetime.utcnow()).total_seconds(), 0) + 1
+        timer = threading.Timer(delay, self.submit, args=(job_id,))
+        timer.daemon = True
+        with self._lock:
+            if self._executor is None:
+                return
+            self._retries[job_id] = timer
+        timer.start()
+
+    def _run(self, job_id: str) -> None:
+        db = SessionLocal()
+        try:
+            if not self._claim(db, job_id):
+                self._retry_when_lease_expires(db, job_id)
+                return
+
+            job = db.query(StudentImportJob).filter(StudentImportJob.id == job_id).first()
+            # Daqui em diante o objeto é só o estado em memória; o banco é
+            # atualizado apenas via `_renew`/`_save`, condicionados à posse
+            db.expunge(job)
+            try:
+                self._process(db, job)
+            except LeaseLost:
+                logger.warning(f"Importação de estudantes {job_id} assumida por outro worker")
+            except Exception as e:
+                logger.exception(f"Importação de estudantes {job_id} falhou")
+                db.rollback()
+                try:
+                    self._save(db, job_id, status="failed", error=str(e))
+                except LeaseLost:
+                    pass
+        finally:
+            db.close()
+            with self._lock:
+                self._active.discard(job_id)
+
+    def _process(self, db, job: StudentImportJob) -> None:
+        if not job.total:
+            job.total = sum(1 for _ in iter_records(job.source_path, job.format))
+            self._save(db, job.id, total=job.total)
+        _truncate_errors(job.id, job.resume_line)
+
+        with hashing_pool(self._hash_workers) as executor, open(errors_path(job.id), "a", encoding="utf-8") as errors_file:
+            batch: List[Tuple[int, Any]] = []
+            for record in iter_records(job.source_path, job.format, after_line=job.resume_line):
+                batch.append(record)
+                if len(batch) >= self._batch_size:
+                    self._import_batch(db, job, batch, executor, errors_file)
+                    batch = []
+                    if self._stopping.is_set():
+                        return
+            if batch:
+                self._import_batch(db, job, batch, executor, errors_file)
+
+        self._save(db, job.id, status="completed")
+
+    def _import_batch(self, db, job: StudentImportJob, batch: List[Tuple[int, Any]], executor, errors_file) -> None:
+        hashes: Dict[int, str] = {}
+        for attempt in range(BATCH_ATTEMPTS):
+            try:
+                students, errors = _prepare_batch(db, batch, executor, hashes)
+                if students:
+                    db.execute(insert(Student), students)
+                break
+            except IntegrityError:
+                # Um cadastro concorrente usou um CPF/email do lote; refaz a checagem
+                db.rollback()
+                if attempt == BATCH_ATTEMPTS - 1:
+                    raise
+
+        # A posse é renovada antes de gravar os erros: a linha do job fica
+        # travada até o commit, então outro worker não assume o job no meio
+        self._renew(
+            db, job.id,
+            processed=job.processed + len(batch),
+            imported=job.imported + len(students),
+            failed=job.failed + len(errors),
+            resume_line=batch[-1][0],
+        )
+
+        # Erros antes do commit: se ele não acontecer, a retomada descarta as
+        # linhas após `resume_line` e as refaz
+        for error in errors:
+            errors_file.write(json.dumps(error, ensure_ascii=False) + "\n")
+        errors_file.flush()
+        db.commit()
+
+        job.processed += len(batch)
+        job.imported += len(students)
+        job.failed += len(errors)
+        job.resume_line = batch[-1][0]
+
+
+def _prepare_batch(db, batch: List[Tuple[int, Any]], executor, hashes: Dict[int, str]):
+    """Valida o lote e retorna (estudantes a inserir, erros por linha)."""
+    errors: List[Dict[str, Any]] = []
+    valid: List[Tuple[int, StudentImportRow]] = []
+    for line_number, record in batch:
+        if isinstance(record, str):
+            errors.append({"row": line_number, "detail": record})
+            continue
+        try:
+            valid.append((line_number, StudentImportRow.model_validate(record)))
+        except ValidationError as exc:
+            errors.append({"row": line_number, "cpf": record.get("cpf"), "email": record.get("email"), "detail": _validation_message(exc)})
+
+    cpfs = {row.cpf for _, row in valid}
+    emails = {row.email for _, row in valid}
+    taken_cpfs = {cpf for (cpf,) in db.query(Student.cpf).filter(Student.cpf.in_(cpfs))} if cpfs else set()
+    taken_emails = {email for (email,) in db.query(Student.email).filter(Student.email.in_(emails))} if emails else set()
+
+    accepted: List[Tuple[int, StudentImportRow]] = []
+    for line_number, row in valid:
+        detail = None
+        if row.cpf in taken_cpfs:
+            detail = "CPF already registered"
+        elif row.email in taken_emails:
+            detail = "Email already registered"
+        if detail:
+            errors.append({"row": line_number, "cpf": row.cpf, "email": row.email, "detail": detail})
+            continue
+        # Repetições dentro do arquivo: a primeira ocorrência vence
+        taken_cpfs.add(row.cpf)
+        taken_emails.add(row.email)
+        accepted.append((line_number, row))
+
+    to_hash = [(line_number, row.password) for line_number, row in accepted if row.password and line_number not in hashes]
+    if to_hash:
+        hashes.update(zip(
+            (line_number for line_number, _ in to_hash),
+            hash_passwords([password for _, password in to_hash], executor)
+        ))
+
+    students = [
+        {
+            "name": row.name,
+            "email": row.email,
+            "cpf": row.cpf,
+            "hashed_password": hashes.get(line_number, row.hashed_password),
+            "authorized": True,
+            "is_active": True,
+        }
+        for line_number, row in accepted
+    ]
+    errors.sort(key=lambda error: error["row"])
+    return students, errors
+
+
+def _truncate_errors(job_id: str, resume_line: int) -> None:
+    """Mantém no arquivo de erros só as linhas já gravadas (até `resume_line`)."""
+    path = errors_path(job_id)
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        kept = [line for line in f if line.strip() and json.loads(line)["row"] <= resume_line]
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        f.writelines(kept)
+    os.replace(f"{path}.tmp", path)
+
+
+student_import_runner = StudentImportRunner(
+    settings.STUDENT_IMPORT_HASH_WORKERS, settings.STUDENT_IMPORT_BATCH_SIZE, settings.STUDENT_IMPORT_LEASE_SECONDS
+)
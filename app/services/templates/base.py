@@ -1,5 +1,9 @@
+import hashlib
+import inspect
+import io
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import landscape, A4
 
@@ -9,6 +13,9 @@ class CertificateTemplate(ABC):
     Novos templates devem herdar desta classe.
     """
     
+    # Tamanho da página (largura, altura) em pontos, usado pelos templates ReportLab
+    pagesize = landscape(A4)
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -21,17 +28,44 @@ class CertificateTemplate(ABC):
         """Descrição legível do template"""
         pass
 
+    @property
+    def version(self) -> str:
+        """
+        Identificador da versão visual do template, usado na chave do cache de PDFs.
+        
+        Por padrão é o hash do código-fonte da classe do template e das classes
+        de que ela herda: qualquer alteração no desenho invalida os PDFs em cache.
+        Templates que leem outros arquivos (imagens, fontes) devem sobrescrevê-lo
+        incluindo esses arquivos.
+        """
+        return _source_digest(type(self))
+
     def generate(self, data: Dict[str, Any], output_path: str) -> str:
         """
-        Gera o arquivo PDF do certificado.
+        Gera o arquivo PDF do certificado no caminho informado.
+        """
+        with open(output_path, "wb") as output_file:
+            self.render_to(data, output_file)
+        return output_path
+
+    def render_to(self, data: Dict[str, Any], buffer: BinaryIO) -> BinaryIO:
+        """
+        Renderiza o PDF do certificado em um buffer binário fornecido pelo chamador
+        (ex.: io.BytesIO), sem tocar o disco.
         
         A implementação padrão usa o ReportLab e chama o método 'draw'.
         Templates baseados em HTML devem sobrescrever este método.
         """
-        c = canvas.Canvas(output_path, pagesize=landscape(A4))
+        c = canvas.Canvas(buffer, pagesize=self.pagesize)
         self.draw(c, data)
         c.save()
-        return output_path
+        return buffer
+
+    def render_bytes(self, data: Dict[str, Any]) -> bytes:
+        """Renderiza o PDF do certificado em memória e retorna seus bytes."""
+        buffer = io.BytesIO()
+        self.render_to(data, buffer)
+        return buffer.getvalue()
 
     def draw(self, canvas: Any, data: Dict[str, Any]) -> None:
         """
@@ -41,4 +75,21 @@ class CertificateTemplate(ABC):
             canvas: Objeto canvas do ReportLab
             data: Dicionário contendo os dados do certificado
         """
-        raise NotImplementedError("Templates que não sobrescrevem 'generate' devem implementar 'draw'")
+        raise NotImplementedError("Templates que não sobrescrevem 'render_to' devem implementar 'draw'")
+
+
+@lru_cache(maxsize=None)
+def _source_digest(template_class: type) -> str:
+    """Hash (SHA-256) dos arquivos-fonte de `template_class` e de suas bases até CertificateTemplate."""
+    digest = hashlib.sha256()
+    paths = []
+    for cls in template_class.__mro__:
+        if not issubclass(cls, CertificateTemplate):
+            continue
+        path = inspect.getsourcefile(cls)
+        if path not in paths:
+            paths.append(path)
+    for path in paths:
+        with open(path, "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
@@ -0,0 +1,141 @@
+from typing import Any, Dict
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from .stamped import StampedTemplate
+
+BROWN = colors.HexColor("#8b7355")
+DARK_BROWN = colors.HexColor("#5d4e37")
+INK = colors.HexColor("#2c1810")
+GOLD = colors.HexColor("#d4af37")
+LIGHT_GOLD = colors.HexColor("#f4e4c1")
+PAPER = colors.HexColor("#fdfbf7")
+MUTED = colors.HexColor("#a0826d")
+
+
+class ClassicStampedTemplate(StampedTemplate):
+    """
+    Versão ReportLab do template HTML `classic`, com a mesma paleta e disposição.
+
+    Moldura, selo e textos fixos formam a camada estática; nome, CPF, curso,
+    carga horária, data e código de autenticidade são os campos variáveis.
+    Por ser estampado, gera cadernos de turma menores e mais rápidos que os
+    templates HTML.
+    """
+
+    @property
+    def name(self) -> str:
+        return "classic_stamped"
+
+    @property
+    def description(self) -> str:
+        return "Clássico (ReportLab, camada estática estampada)"
+
+    def draw_static(self, canvas: Any) -> None:
+        width, height = self.pagesize
+
+        # Fundo e moldura externa
+        canvas.setFillColor(PAPER)
+        canvas.rect(0, 0, width, height, stroke=0, fill=1)
+        canvas.setStrokeColor(BROWN)
+        canvas.setLineWidth(15)
+        canvas.rect(7.5, 7.5, width - 15, height - 15)
+
+        # Borda dupla dourada
+        canvas.setStrokeColor(GOLD)
+        canvas.setLineWidth(1)
+        for inset in (34, 38):
+            canvas.rect(inset, inset, width - 2 * inset, height - 2 * inset)
+
+        # Ornamentos dos cantos
+        canvas.setLineWidth(1.5)
+        size, inset = 45, 26
+        for x, y, dx, dy in (
+            (inset, height - inset, 1, -1),
+            (width - inset, height - inset, -1, -1),
+            (inset, inset, 1, 1),
+            (width - inset, inset, -1, 1),
+        ):
+            canvas.line(x, y, x + dx * size, y)
+            canvas.line(x, y, x, y + dy * size)
+
+        # Selo
+        seal_x, seal_y = 95, height / 2
+        canvas.setFillColor(LIGHT_GOLD)
+        canvas.setStrokeColor(GOLD)
+        canvas.setLineWidth(4)
+        canvas.circle(seal_x, seal_y, 38, stroke=1, fill=1)
+        canvas.setFillColor(BROWN)
+        canvas.setFont("Times-Bold", 9)
+        canvas.drawCentredString(seal_x, seal_y + 2, "OFFICIAL")
+        canvas.drawCentredString(seal_x, seal_y - 9, "SEAL")
+
+        # Textos fixos
+        center = width / 2
+        canvas.setFillColor(BROWN)
+        canvas.setFont("Times-BoldItalic", 44)
+        canvas.drawCentredString(center, height - 115, "CERTIFICADO")
+        canvas.setFillColor(MUTED)
+        canvas.setFont("Times-Italic", 15)
+        canvas.drawCentredString(center, height - 142, "Certificado de Mérito Acadêmico")
+        canvas.setFillColor(DARK_BROWN)
+        canvas.setFont("Times-Italic", 14)
+        canvas.drawCentredString(center, height - 180, "Outorga-se o presente certificado a")
+        canvas.drawCentredString(center, height - 290, "em reconhecimento à conclusão do curso")
+
+        # Linha sob o nome do aluno
+        canvas.setStrokeColor(GOLD)
+        canvas.setLineWidth(2)
+        canvas.line(center - 200, height - 232, center + 200, height - 232)
+
+        # Rodapé
+        canvas.setFillColor(BROWN)
+        canvas.setFont("Times-Roman", 10)
+        canvas.drawString(100, 115, "Código de Autenticidade:")
+        canvas.setFillColor(DARK_BROWN)
+        canvas.setFont("Times-Roman", 12)
+        canvas.drawRightString(width - 100, 115, "Emitido em:")
+
+    def draw_fields(self, canvas: Any, data: Dict[str, Any]) -> None:
+        width, height = self.pagesize
+        center = width / 2
+
+        canvas.setFillColor(INK)
+        self._draw_fitted(canvas, data["student_name"], "Times-BoldItalic", 32, center, height - 224, 520)
+        canvas.setFillColor(BROWN)
+        canvas.setFont("Times-Roman", 12)
+        canvas.drawCentredString(center, height - 252, f"CPF: {data['student_cpf']}")
+
+        canvas.setFillColor(DARK_BROWN)
+        self._draw_fitted(canvas, data["course_name"], "Times-BoldItalic", 24, center, height - 326, 560)
+        canvas.setFont("Times-Roman", 14)
+        canvas.drawCentredString(center, height - 352, f"Carga Horária: {data['course_workload']} horas")
+        if data.get("course_description"):
+            canvas.setFillColor(BROWN)
+            self._draw_fitted(canvas, data["course_description"], "Times-Roman", 12, center, height - 374, 560)
+
+        # Código de autenticidade em destaque
+        code = str(data.get("uuid", ""))
+        code_width = stringWidth(code, "Courier", 9)
+        canvas.setFillColor(LIGHT_GOLD)
+        canvas.setStrokeColor(GOLD)
+        canvas.setLineWidth(0.75)
+        canvas.roundRect(100, 90, code_width + 12, 16, 3, stroke=1, fill=1)
+        canvas.setFillColor(BROWN)
+        canvas.setFont("Courier", 9)
+        canvas.drawString(106, 95, code)
+
+        issue_date = data.get("issue_date")
+        if hasattr(issue_date, "strftime"):
+            issue_date = issue_date.strftime("%d/%m/%Y")
+        canvas.setFillColor(DARK_BROWN)
+        canvas.setFont("Times-Bold", 12)
+        canvas.drawRightString(width - 100, 97, str(issue_date or ""))
+
+    @staticmethod
+    def _draw_fitted(canvas: Any, text: str, font: str, size: float, x: float, y: float, max_width: float) -> None:
+        """Desenha o texto centralizado, reduzindo a fonte se ele não couber em `max_width`."""
+        text_width = stringWidth(text, font, size)
+        if text_width > max_width:
+            size = size * max_width / text_width
+        canvas.setFont(font, size)
+        canvas.drawCentredString(x, y, text)
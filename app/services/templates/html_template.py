@@ -1,9 +1,87 @@
+import hashlib
 import os
-from typing import Any, Dict
-from jinja2 import Template
+import threading
+from typing import Any, BinaryIO, Dict, NamedTuple
+from jinja2 import Environment, Template
 from xhtml2pdf import pisa
 from .base import CertificateTemplate
 
+
+class _CachedTemplate(NamedTuple):
+    mtime: float
+    digest: str
+    template: Template
+
+
+class TemplateCache:
+    """
+    Cache de templates Jinja compilados, compartilhando um único Environment.
+    
+    A cada acesso o mtime do arquivo é verificado; se mudou, o conteúdo é
+    relido e só é recompilado quando o hash (SHA-256) também mudou.
+    """
+    
+    def __init__(self, environment: Environment):
+        self._environment = environment
+        self._entries: Dict[str, _CachedTemplate] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, file_path: str) -> Template:
+        """Retorna o template compilado, recarregando-o se o arquivo mudou."""
+        return self._entry(file_path).template
+    
+    def digest(self, file_path: str) -> str:
+        """Hash do conteúdo atual do template (carrega-o se necessário)."""
+        return self._entry(file_path).digest
+    
+    def _entry(self, file_path: str) -> _CachedTemplate:
+        mtime = os.path.getmtime(file_path)
+        
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry and entry.mtime == mtime:
+                self.hits += 1
+                return entry
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry and entry.digest == digest:
+                entry = entry._replace(mtime=mtime)
+                self._entries[file_path] = entry
+                self.hits += 1
+                return entry
+            
+            entry = _CachedTemplate(mtime, digest, self._environment.from_string(content))
+            self._entries[file_path] = entry
+            self.misses += 1
+            return entry
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Estatísticas de uso do cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries)
+            }
+
+
+jinja_env = Environment()
+template_cache = TemplateCache(jinja_env)
+
+
 class HtmlTemplate(CertificateTemplate):
     def __init__(self, name: str, file_path: str):
         self._name = name
@@ -17,26 +95,27 @@ class HtmlTemplate(CertificateTemplate):
     def description(self) -> str:
         return f"Template HTML: {self._name}"
 
-    def generate(self, data: Dict[str, Any], output_path: str) -> str:
+    @property
+    def version(self) -> str:
+        return template_cache.digest(self._file_path)
+
+    def render_to(self, data: Dict[str, Any], buffer: BinaryIO) -> BinaryIO:
   
-        with open(self._file_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()  
+        template = template_cache.get(self._file_path)
     
         template_data = data.copy()
         if 'issue_date' in template_data and hasattr(template_data['issue_date'], 'strftime'):
             template_data['issue_date'] = template_data['issue_date'].strftime("%d/%m/%Y")
             
-        template = Template(template_content)
         rendered_html = template.render(**template_data)
         
-        with open(output_path, "wb") as output_file:
-            pisa_status = pisa.CreatePDF(
-                src=rendered_html,
-                dest=output_file,
-                encoding='utf-8'
-            )
+        pisa_status = pisa.CreatePDF(
+            src=rendered_html,
+            dest=buffer,
+            encoding='utf-8'
+        )
             
         if pisa_status.err:
             raise Exception(f"Erro ao gerar PDF: {pisa_status.err}")
         
-        return output_path
+        return buffer
@@ -1,6 +1,7 @@
 import os
 from typing import Dict, Type, List, Union
 from .base import CertificateTemplate
+from .classic_stamped import ClassicStampedTemplate
 from .html_template import HtmlTemplate
 
 class TemplateRegistry:
@@ -8,9 +9,13 @@ class TemplateRegistry:
     
     @classmethod
     def register(cls, template_cls: Type[CertificateTemplate]):
-        """Registra uma nova classe de template"""
+        """
+        Registra uma nova classe de template.
+        A instância é mantida no registro para que caches do template
+        (ex.: camada estática e imagens de StampedTemplate) sejam reaproveitados.
+        """
         instance = template_cls()
-        cls._templates[instance.name] = template_cls
+        cls._templates[instance.name] = instance
         return template_cls
         
     @classmethod
@@ -31,8 +36,6 @@ class TemplateRegistry:
             if not template_or_cls:
                 raise ValueError(f"Template '{name}' not found and no default available")
         
-        if isinstance(template_or_cls, type):
-            return template_or_cls()
         if isinstance(template_or_cls, type):
             return template_or_cls()
         return template_or_cls
@@ -72,3 +75,7 @@ class TemplateRegistry:
                 template = HtmlTemplate(name, file_path)
                 cls.register_instance(template)
 
+
+
+# Templates ReportLab embutidos (os templates HTML são descobertos sob demanda)
+TemplateRegistry.register(ClassicStampedTemplate)
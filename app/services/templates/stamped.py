@@ -0,0 +1,82 @@
+import re
+import threading
+from typing import Any, BinaryIO, Dict, Iterable
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from .base import CertificateTemplate
+
+
+class StampedTemplate(CertificateTemplate):
+    """
+    Template ReportLab em duas camadas: estática e variável.
+    
+    A camada estática (moldura, logos, assinaturas, textos fixos) é desenhada
+    por `draw_static` uma única vez por documento, como um Form XObject do PDF,
+    e apenas carimbada em cada página. `draw_fields` desenha somente os dados
+    que mudam por aluno (nome, CPF, curso, data, UUID).
+    
+    Imagens carregadas com `image` são decodificadas uma vez por instância
+    do template e reaproveitadas entre documentos.
+    """
+    
+    def __init__(self):
+        self._images: Dict[str, ImageReader] = {}
+        self._images_lock = threading.Lock()
+    
+    @property
+    def static_form_name(self) -> str:
+        """Nome do Form XObject da camada estática (apenas caracteres válidos em nomes PDF)."""
+        return "Static_" + re.sub(r"[^A-Za-z0-9_]", "_", self.name)
+    
+    def draw_static(self, canvas: Any) -> None:
+        """
+        Desenha a camada estática do certificado.
+        
+        Args:
+            canvas: Objeto canvas do ReportLab (dentro de um Form XObject)
+        """
+        raise NotImplementedError("Templates estampados devem implementar 'draw_static'")
+    
+    def draw_fields(self, canvas: Any, data: Dict[str, Any]) -> None:
+        """
+        Desenha os campos variáveis sobre a camada estática.
+        
+        Args:
+            canvas: Objeto canvas do ReportLab
+            data: Dicionário contendo os dados do certificado
+        """
+        raise NotImplementedError("Templates estampados devem implementar 'draw_fields'")
+    
+    def image(self, path: str) -> ImageReader:
+        """Retorna a imagem decodificada, carregando-a apenas no primeiro uso."""
+        with self._images_lock:
+            reader = self._images.get(path)
+            if reader is None:
+                reader = ImageReader(path)
+                self._images[path] = reader
+            return reader
+    
+    def ensure_static_layer(self, canvas: Any) -> None:
+        """Cria o Form XObject da camada estática no documento, se ainda não existir."""
+        form_name = self.static_form_name
+        if not canvas.hasForm(form_name):
+            canvas.beginForm(form_name)
+            self.draw_static(canvas)
+            canvas.endForm()
+    
+    def draw(self, canvas: Any, data: Dict[str, Any]) -> None:
+        self.ensure_static_layer(canvas)
+        canvas.doForm(self.static_form_name)
+        self.draw_fields(canvas, data)
+    
+    def render_many(self, data_list: Iterable[Dict[str, Any]], buffer: BinaryIO) -> BinaryIO:
+        """
+        Renderiza vários certificados como páginas de um único PDF,
+        todas compartilhando a mesma camada estática.
+        """
+        c = canvas.Canvas(buffer, pagesize=self.pagesize)
+        for data in data_list:
+            self.draw(c, data)
+            c.showPage()
+        c.save()
+        return buffer
@@ -138,6 +138,25 @@ const ApiClient = {
         });
     },
 
+    /**
+     * Busca todas as páginas de um endpoint paginado por cursor
+     * (respostas no formato { items, next_cursor })
+     */
+    async getAll(endpoint, options = {}) {
+        const items = [];
+        let cursor = null;
+
+        do {
+            const separator = endpoint.includes('?') ? '&' : '?';
+            const url = cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint;
+            const page = await this.get(url, options);
+            items.push(...page.items);
+            cursor = page.next_cursor;
+        } while (cursor);
+
+        return items;
+    },
+
     /**
      * Método POST
      */
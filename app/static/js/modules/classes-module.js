@@ -17,7 +17,7 @@ const ClassesModule = {
         try {
             // Fetch courses and templates
             const [courses, templates] = await Promise.all([
-                ApiClient.get(API_CONFIG.ENDPOINTS.COURSES.WITH_CLASSES),
+                ApiClient.getAll(API_CONFIG.ENDPOINTS.COURSES.WITH_CLASSES),
                 ApiClient.get('/classes/templates')
             ]);
             this.courses = courses;
@@ -96,7 +96,7 @@ const ClassesModule = {
         try {
             const [classDetails, students] = await Promise.all([
                 ApiClient.get(API_CONFIG.ENDPOINTS.CLASSES.GET(classId)),
-                ApiClient.get(API_CONFIG.ENDPOINTS.CLASSES.STUDENTS(classId))
+                ApiClient.getAll(API_CONFIG.ENDPOINTS.CLASSES.STUDENTS(classId))
             ]);
 
             const formHtml = `
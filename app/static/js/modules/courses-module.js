@@ -20,7 +20,7 @@ const CoursesModule = {
      */
     async loadCourses() {
         try {
-            this.courses = await ApiClient.get(API_CONFIG.ENDPOINTS.COURSES.WITH_CLASSES);
+            this.courses = await ApiClient.getAll(API_CONFIG.ENDPOINTS.COURSES.WITH_CLASSES);
         } catch (error) {
             console.error('Error loading courses:', error);
             this.courses = [];
@@ -14,7 +14,7 @@ const EnrollmentsModule = {
 
     async loadAvailableClasses() {
         try {
-            const classes = await ApiClient.get(API_CONFIG.ENDPOINTS.ENROLLMENTS.AVAILABLE);
+            const classes = await ApiClient.getAll(API_CONFIG.ENDPOINTS.ENROLLMENTS.AVAILABLE);
             this.renderAvailableClasses(classes);
         } catch (error) {
             console.error('Error loading classes:', error);
@@ -0,0 +1,252 @@
+"""
+Benchmark: endpoints públicos de leitura síncronos (threadpool) x assíncronos (AsyncSession).
+
+Popula um banco SQLite temporário com cursos, turmas, estudantes e
+certificados e, durante `--duration` segundos, mantém `--clients` clientes
+concorrentes (500 por padrão) fazendo requisições em sequência a:
+
+- GET /validate/{uuid}
+- GET /courses/
+- GET /classes/{id}
+- GET /students/cpf/{cpf}/certificates
+
+O cenário roda contra as versões `def` com `get_db` (como eram antes, cada
+requisição ocupa uma thread do pool do Starlette) e contra os endpoints atuais
+`async def` com `get_async_db`. As requisições vão pelo transporte ASGI do
+httpx, no mesmo processo, para medir só a aplicação e o banco. O cache de CPF
+é desligado para que a consulta ao banco seja medida.
+
+Executa: python -m benchmarks.async_endpoints --clients 500 --duration 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+_tmp_dir = tempfile.TemporaryDirectory()
+# Precisa valer antes de importar `app`: o engine e o cache são criados na importação
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(_tmp_dir.name, 'async.db')}"
+os.environ["CPF_CACHE_MAX_ENTRIES"] = "0"
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import classes, courses, students, validate
+from app.core.pagination import MAX_PAGE_SIZE, paginate
+from app.db.session import Base, dispose_async_engine, engine, get_db
+from app.models.certificate import Certificate
+from app.models.class_model import Class
+from app.models.course import Course
+from app.models.student import Student
+from app.schemas.certificate import CertificateValidation
+from app.schemas.class_schema import Class as ClassSchema
+from app.schemas.course import CoursePage
+from app.schemas.student import StudentCertificatesResponse, StudentInfoResponse
+from benchmarks.common import environment_info, write_results
+
+
+# ========== ENDPOINTS SÍNCRONOS (versão anterior) ==========
+
+legacy_router = APIRouter()
+
+
+@legacy_router.get("/validate/{uuid}", response_model=CertificateValidation)
+def legacy_validate(uuid: str, db: Session = Depends(get_db)) -> Any:
+    certificate = db.query(Certificate).filter(Certificate.uuid == uuid).first()
+    if not certificate:
+        raise HTTPException(status_code=404, detail="Certificate not found or invalid")
+    student = db.query(Student).filter(Student.id == certificate.student_id).first()
+    course = db.query(Course).filter(Course.id == certificate.course_id).first()
+    return CertificateValidation(
+        valid=True, student=student.name, course=course.name,
+        issue_date=certificate.issue_date, uuid=certificate.uuid
+    )
+
+
+@legacy_router.get("/courses/", response_model=CoursePage)
+def legacy_courses(
+    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Any:
+    query = db.query(Course).filter(Course.is_active == True)
+    items, next_cursor = paginate(query, [Course.id], cursor, limit)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@legacy_router.get("/classes/{class_id}", response_model=ClassSchema)
+def legacy_class(class_id: int, db: Session = Depends(get_db)) -> Any:
+    class_obj = db.query(Class).filter(Class.id == class_id, Class.is_active == True).first()
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    return class_obj
+
+
+@legacy_router.get("/students/cpf/{cpf}/certificates", response_model=StudentCertificatesResponse)
+def legacy_cpf(cpf: str, db: Session = Depends(get_db)) -> Any:
+    rows = (
+        db.query(
+            Student.name, Student.cpf, Student.email,
+            Certificate.id, Certificate.uuid, Certificate.course_id, Certificate.issue_date, Course.name,
+        )
+        .outerjoin(Certificate, Certificate.student_id == Student.id)
+        .outerjoin(Course, Course.id == Certificate.course_id)
+        .filter(Student.cpf == cpf)
+        .order_by(Student.id, Certificate.id)
+        .all()
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail="No student found with this CPF")
+    certificates = [
+        {
+            "certificate_id": cert_id, "uuid": cert_uuid, "course_name": course_name or "Unknown",
+            "course_id": course_id, "issue_date": issue_date,
+            "download_url": f"/api/v1/certificates/{cert_id}/download"
+        }
+        for _, _, _, cert_id, cert_uuid, course_id, issue_date, course_name in rows
+        if cert_id is not None
+    ]
+    return StudentCertificatesResponse(
+        student=StudentInfoResponse(name=rows[0][0], cpf=rows[0][1], email=rows[0][2]),
+        certificates=certificates,
+        total_certificates=len(certificates)
+    )
+
+
+def build_apps() -> Dict[str, FastAPI]:
+    legacy = FastAPI()
+    legacy.include_router(legacy_router)
+
+    current = FastAPI()
+    current.include_router(validate.router, prefix="/validate")
+    current.include_router(courses.router, prefix="/courses")
+    current.include_router(classes.router, prefix="/classes")
+    current.include_router(students.router, prefix="/students")
+    return {"sync": legacy, "async": current}
+
+
+def seed(args) -> List[str]:
+    """Popula o banco e retorna os UUIDs dos certificados emitidos."""
+    Base.metadata.create_all(bind=engine)
+    uuids = [str(uuid.UUID(int=i + 1)) for i in range(args.students)]
+    with engine.begin() as conn:
+        conn.execute(insert(Course), [
+            {"name": f"Curso {i}", "description": "Curso sintético", "workload": 40}
+            for i in range(args.courses)
+        ])
+        conn.execute(insert(Class), [
+            {
+                "course_id": i % args.courses + 1,
+                "name": f"Turma {i}",
+                "total_slots": 50,
+                "available_slots": 50,
+                "certificate_template": "default",
+                "is_open": True,
+            }
+            for i in range(args.classes)
+        ])
+        conn.execute(insert(Student), [
+            {"name": f"Aluno {i}", "email": f"aluno{i}@example.com", "cpf": f"{i:011d}"}
+            for i in range(args.students)
+        ])
+        conn.execute(insert(Certificate), [
+            {
+                "uuid": uuids[i],
+                "student_id": i + 1,
+                "course_id": i % args.courses + 1,
+                "template_id": "default",
+                "data_snapshot": {},
+            }
+            for i in range(args.students)
+        ])
+    return uuids
+
+
+async def run_scenario(app: FastAPI, uuids: List[str], args) -> Dict[str, Any]:
+    paths = [
+        lambda n: f"/validate/{uuids[n % len(uuids)]}",
+        lambda n: "/courses/?limit=20",
+        lambda n: f"/classes/{n % args.classes + 1}",
+        lambda n: f"/students/cpf/{n % args.students:011d}/certificates",
+    ]
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+    # Erros da aplicação (ex.: timeout do pool) viram 500 e contam em `errors`
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + args.duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                n = next(counter)
+                start = time.perf_counter()
+                response = await client.get(paths[n % len(paths)](n))
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "errors": errors,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+async def run_all(uuids: List[str], args) -> Dict[str, Any]:
+    results = {}
+    for name, app in build_apps().items():
+        results[name] = await run_scenario(app, uuids, args)
+    await dispose_async_engine()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--classes", type=int, default=200)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--output", default="benchmarks/results/async_endpoints.json")
+    args = parser.parse_args()
+
+    uuids = seed(args)
+    results = {
+        "environment": environment_info(),
+        "clients": args.clients,
+        "duration_s": args.duration,
+    }
+    results.update(asyncio.run(run_all(uuids, args)))
+    engine.dispose()
+    _tmp_dir.cleanup()
+
+    print(f"{'modo':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>9} {'max ms':>9} {'erros':>6}")
+    for name in ("sync", "async"):
+        r = results[name]
+        print(f"{name:<6} {r['requests_per_s']:>8} {r['p50_ms']!s:>8} {r['p95_ms']!s:>9} {r['max_ms']!s:>9} {r['errors']:>6}")
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
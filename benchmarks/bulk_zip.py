@@ -0,0 +1,44 @@
+"""
+Benchmark: geração do ZIP de certificados em massa (serial x pool de processos).
+
+Usa certificados sintéticos com snapshot, sem banco de dados nem rede.
+
+Executa: python -m benchmarks.bulk_zip --sizes 50 500 2000 --workers 4
+"""
+
+import argparse
+import os
+import time
+from typing import List
+
+from app.models.certificate import Certificate
+from app.services.pdf_service import generate_bulk_certificates_zip
+from benchmarks.common import make_certificates
+
+
+def time_bulk_zip(certificates: List[Certificate], workers: int) -> float:
+    """Retorna o tempo (s) para gerar o ZIP e remove o arquivo gerado."""
+    start = time.perf_counter()
+    zip_path = generate_bulk_certificates_zip(certificates, db=None, class_id=0, workers=workers)
+    elapsed = time.perf_counter() - start
+    os.remove(zip_path)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--template", default="default")
+    args = parser.parse_args()
+
+    print(f"{'alunos':>8} {'serial (s)':>12} {'paralelo (s)':>14} {'speedup':>9}")
+    for size in args.sizes:
+        certificates = make_certificates(size, args.template)
+        serial = time_bulk_zip(certificates, workers=0)
+        parallel = time_bulk_zip(certificates, workers=args.workers)
+        print(f"{size:>8} {serial:>12.2f} {parallel:>14.2f} {serial / parallel:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: GET /courses/with-classes contra um catálogo sintético.
+
+Popula um banco SQLite temporário (padrão: 1.000 cursos, 3 turmas por curso,
+20 inscrições por turma) e compara a implementação atual com a versão
+anterior (N+1 consultas), medindo tempo e número de consultas.
+
+Executa: python -m benchmarks.catalog --courses 1000 --output benchmarks/results/catalog.json
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.models.class_model import Class
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+from app.api.v1.endpoints.courses import read_courses_with_classes
+from benchmarks.common import environment_info, write_results
+
+
+def seed_catalog(engine, courses: int, classes_per_course: int, enrollments_per_class: int) -> None:
+    """Popula o catálogo com inserts em lote."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Student), [
+            {"name": f"Aluno {i}", "email": f"aluno{i}@bench.local", "cpf": f"{i:011d}"}
+            for i in range(enrollments_per_class)
+        ])
+        conn.execute(insert(Course), [
+            {"name": f"Curso {i}", "description": "Curso sintético", "workload": 40}
+            for i in range(courses)
+        ])
+        conn.execute(insert(Class), [
+            {
+                "course_id": course_id,
+                "name": f"Turma {course_id}.{n}",
+                "total_slots": enrollments_per_class * 2,
+                "available_slots": enrollments_per_class,
+                "certificate_template": "default",
+                "is_open": True,
+            }
+            for course_id in range(1, courses + 1)
+            for n in range(classes_per_course)
+        ])
+        conn.execute(insert(Enrollment), [
+            {"student_id": student_id, "class_id": class_id}
+            for class_id in range(1, courses * classes_per_course + 1)
+            for student_id in range(1, enrollments_per_class + 1)
+        ])
+
+
+def legacy_courses_with_classes(db, skip: int = 0, limit: int = 100):
+    """Implementação anterior (uma consulta por curso e uma contagem por turma), para comparação."""
+    courses = db.query(Course).filter(Course.is_active == True).offset(skip).limit(limit).all()
+    result = []
+    for course in courses:
+        classes = db.query(Class).filter(Class.course_id == course.id, Class.is_active == True).all()
+        classes_data = []
+        for class_obj in classes:
+            enrolled_count = db.query(Enrollment).filter(Enrollment.class_id == class_obj.id).count()
+            classes_data.append({"id": class_obj.id, "enrolled_students": enrolled_count})
+        result.append({"id": course.id, "classes": classes_data, "total_classes": len(classes_data)})
+    return result
+
+
+def measure(engine, func: Callable, limit: int, repeat: int) -> Dict[str, Any]:
+    SessionLocal = sessionmaker(bind=engine)
+    statements = [0]
+
+    def count_statement(*args):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        timings = []
+        for _ in range(repeat):
+            db = SessionLocal()
+            statements[0] = 0
+            start = time.perf_counter()
+            result = func(db=db, limit=limit)
+            timings.append(time.perf_counter() - start)
+            db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    return {
+        "courses_returned": len(result["items"] if isinstance(result, dict) else result),
+        "queries": statements[0],
+        "best_ms": round(min(timings) * 1000, 2),
+        "mean_ms": round(sum(timings) / len(timings) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=1000)
+    parser.add_argument("--classes-per-course", type=int, default=3)
+    parser.add_argument("--enrollments-per-class", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmarks/results/catalog.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'catalog.db')}")
+        seed_catalog(engine, args.courses, args.classes_per_course, args.enrollments_per_class)
+
+        results = {
+            "environment": environment_info(),
+            "catalog": {
+                "courses": args.courses,
+                "classes_per_course": args.classes_per_course,
+                "enrollments_per_class": args.enrollments_per_class,
+            },
+            "current": measure(engine, read_courses_with_classes, args.courses, args.repeat),
+            "legacy": measure(engine, legacy_courses_with_classes, args.courses, args.repeat),
+        }
+        engine.dispose()
+
+    for name in ("current", "legacy"):
+        r = results[name]
+        print(f"{name:<8} {r['queries']:>6} consultas  {r['best_ms']:>10.2f} ms (melhor)  {r['mean_ms']:>10.2f} ms (média)")
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
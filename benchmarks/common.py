@@ -0,0 +1,168 @@
+"""
+Utilitários compartilhados pelos benchmarks: dados sintéticos, templates
+ReportLab de referência, medição de memória e gravação de resultados.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+from reportlab.lib import colors
+
+from app.models.certificate import Certificate
+from app.services.templates.base import CertificateTemplate
+from app.services.templates.registry import TemplateRegistry
+from app.services.templates.stamped import StampedTemplate
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def make_snapshot(index: int) -> Dict[str, Any]:
+    """Snapshot sintético de um certificado."""
+    return {
+        "student_name": f"Aluno Benchmark {index + 1:05d}",
+        "student_cpf": f"{index:011d}",
+        "course_name": "Curso de Benchmark",
+        "course_workload": 40,
+        "class_name": "Turma Benchmark",
+    }
+
+
+def make_template_data(index: int) -> Dict[str, Any]:
+    """Dados completos (snapshot + data de emissão + UUID) como recebidos pelos templates."""
+    data = make_snapshot(index)
+    data["issue_date"] = datetime(2024, 1, 15, 10, 0, 0)
+    data["uuid"] = str(uuid.UUID(int=index))
+    return data
+
+
+def make_certificates(count: int, template_id: str = "default") -> List[Certificate]:
+    """Cria certificados transitórios (não persistidos) com snapshot sintético."""
+    issue_date = datetime(2024, 1, 15, 10, 0, 0)
+    return [
+        Certificate(
+            id=i + 1,
+            uuid=str(uuid.uuid4()),
+            student_id=i + 1,
+            course_id=1,
+            template_id=template_id,
+            issue_date=issue_date,
+            data_snapshot=make_snapshot(i),
+        )
+        for i in range(count)
+    ]
+
+
+def _draw_static_layer(canvas: Any) -> None:
+    width, height = canvas._pagesize
+    canvas.setStrokeColor(colors.HexColor("#2c3e50"))
+    canvas.setLineWidth(12)
+    canvas.rect(20, 20, width - 40, height - 40)
+    canvas.setStrokeColor(colors.HexColor("#3498db"))
+    canvas.setLineWidth(2)
+    canvas.rect(36, 36, width - 72, height - 72)
+    canvas.setFillColor(colors.HexColor("#2c3e50"))
+    canvas.setFont("Helvetica-Bold", 40)
+    canvas.drawCentredString(width / 2, height - 130, "CERTIFICADO")
+    canvas.setFont("Helvetica", 14)
+    canvas.drawCentredString(width / 2, height - 170, "Certificamos que")
+    canvas.drawCentredString(width / 2, 250, "concluiu com êxito o curso")
+    for x in (width / 3, 2 * width / 3):
+        canvas.line(x - 90, 120, x + 90, 120)
+    canvas.setFont("Helvetica", 10)
+    canvas.drawCentredString(width / 3, 105, "Coordenação")
+    canvas.drawCentredString(2 * width / 3, 105, "Direção")
+
+
+def _draw_variable_fields(canvas: Any, data: Dict[str, Any]) -> None:
+    width, _ = canvas._pagesize
+    canvas.setFont("Helvetica-Bold", 28)
+    canvas.drawCentredString(width / 2, 300, data["student_name"])
+    canvas.setFont("Helvetica", 12)
+    canvas.drawCentredString(width / 2, 275, f"CPF: {data['student_cpf']}")
+    canvas.setFont("Helvetica-Bold", 18)
+    canvas.drawCentredString(width / 2, 220, f"{data['course_name']} ({data['course_workload']}h)")
+    canvas.setFont("Helvetica", 9)
+    canvas.drawString(50, 50, f"Emitido em {data['issue_date'].strftime('%d/%m/%Y')} - UUID {data['uuid']}")
+
+
+@TemplateRegistry.register
+class BenchmarkReportLabTemplate(CertificateTemplate):
+    """Template ReportLab de referência: redesenha tudo em cada certificado."""
+
+    @property
+    def name(self) -> str:
+        return "bench_reportlab"
+
+    @property
+    def description(self) -> str:
+        return "Benchmark: ReportLab (desenho completo)"
+
+    def draw(self, canvas: Any, data: Dict[str, Any]) -> None:
+        _draw_static_layer(canvas)
+        _draw_variable_fields(canvas, data)
+
+
+@TemplateRegistry.register
+class BenchmarkStampedTemplate(StampedTemplate):
+    """Mesmo desenho do template de referência, com a camada estática estampada."""
+
+    @property
+    def name(self) -> str:
+        return "bench_stamped"
+
+    @property
+    def description(self) -> str:
+        return "Benchmark: ReportLab (camada estática estampada)"
+
+    def draw_static(self, canvas: Any) -> None:
+        _draw_static_layer(canvas)
+
+    def draw_fields(self, canvas: Any, data: Dict[str, Any]) -> None:
+        _draw_variable_fields(canvas, data)
+
+
+def peak_rss_mb() -> float:
+    """Pico de memória residente do processo atual, em MB (None se indisponível)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB, macOS em bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+def environment_info() -> Dict[str, Any]:
+    """Metadados do ambiente para comparar execuções ao longo do tempo."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(results: Dict[str, Any], output_path: str) -> None:
+    """Grava os resultados em JSON (criando o diretório se necessário)."""
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"✓ Resultados gravados em {output_path}")
@@ -0,0 +1,225 @@
+"""
+Teste de carga: inscrições simultâneas em uma turma disputada.
+
+Dispara `--requests` inscrições (1.000 por padrão, um aluno diferente em cada)
+ao mesmo tempo em uma turma com `--slots` vagas (100 por padrão), usando
+`--threads` threads liberadas juntas por uma barreira. Cada chamada usa a
+própria sessão, como uma requisição em POST /enrollments/.
+
+Roda o cenário com a versão anterior (lê `available_slots`, confere em Python
+e grava `available_slots - 1`) e com `enroll_in_class` atual (UPDATE
+condicional + índice único). Para a versão atual verifica as contagens exatas:
+inscrições == vagas, `available_slots` == 0, uma resposta de sucesso por vaga e
+"No available slots" para as demais; também reenvia inscrições já feitas e
+confere que são recusadas sem consumir vagas. Sai com código 1 se alguma
+verificação falhar.
+
+Executa: python -m benchmarks.enrollment_contention --requests 1000 --slots 100
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints.enrollments import enroll_in_class
+from app.db.session import Base, create_db_engine
+from app.models.class_model import Class
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+from benchmarks.common import environment_info, write_results
+
+
+def legacy_enroll(db, class_id: int, current_student: Student) -> Dict[str, Any]:
+    """Inscrição como era feita antes: leitura, checagem em Python e escrita."""
+    class_obj = db.query(Class).filter(Class.id == class_id).first()
+    if class_obj.available_slots <= 0:
+        raise HTTPException(status_code=400, detail="No available slots in this class")
+    existing = db.query(Enrollment).filter(
+        Enrollment.student_id == current_student.id,
+        Enrollment.class_id == class_id
+    ).first()
+    if existing:
+        raise HTTPException(status_code=400, detail="You are already enrolled in this class")
+    enrollment = Enrollment(student_id=current_student.id, class_id=class_id)
+    db.add(enrollment)
+    class_obj.available_slots -= 1
+    db.commit()
+    return {"enrollment_id": enrollment.id}
+
+
+def seed(engine, students: int, slots: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Course), [{"name": "Curso", "description": "Curso sintético", "workload": 40}])
+        conn.execute(insert(Class), [{
+            "course_id": 1,
+            "name": "Turma disputada",
+            "total_slots": slots,
+            "available_slots": slots,
+            "certificate_template": "default",
+            "is_open": True,
+        }])
+        conn.execute(insert(Student), [
+            {"name": f"Aluno {i}", "email": f"aluno{i}@example.com", "cpf": f"{i:011d}"}
+            for i in range(students)
+        ])
+
+
+def fire(SessionLocal, enroll: Callable, student_ids: List[int], threads: int) -> Dict[str, Any]:
+    """Executa uma inscrição por aluno, todas liberadas ao mesmo tempo."""
+    barrier = threading.Barrier(min(threads, len(student_ids)))
+    outcomes: Counter = Counter()
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def call(student_id: int) -> None:
+        try:
+            barrier.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        db = SessionLocal()
+        start = time.perf_counter()
+        try:
+            enroll(db=db, class_id=1, current_student=Student(id=student_id))
+            outcome = "enrolled"
+        except HTTPException as exc:
+            outcome = exc.detail
+        except OperationalError:
+            db.rollback()
+            outcome = "database error"
+        finally:
+            db.close()
+        elapsed = time.perf_counter() - start
+        with lock:
+            outcomes[outcome] += 1
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(call, student_ids))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "outcomes": dict(outcomes),
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(student_ids) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+def class_state(SessionLocal) -> Dict[str, int]:
+    with SessionLocal() as db:
+        enrolled = db.scalar(select(func.count(Enrollment.id)).where(Enrollment.class_id == 1))
+        available = db.scalar(select(Class.available_slots).where(Class.id == 1))
+    return {"enrollments": enrolled, "available_slots": available}
+
+
+def run_scenario(database_uri: str, enroll: Callable, args) -> Dict[str, Any]:
+    engine = create_db_engine(database_uri)
+    try:
+        seed(engine, args.requests, args.slots)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        result = fire(SessionLocal, enroll, list(range(1, args.requests + 1)), args.threads)
+        result.update(class_state(SessionLocal))
+        result["oversold"] = max(result["enrollments"] - args.slots, 0)
+        return result
+    finally:
+        engine.dispose()
+
+
+def check_atomic(database_uri: str, result: Dict[str, Any], args) -> List[str]:
+    """Verificações da versão atual; retorna as falhas encontradas."""
+    failures = []
+    expected = {
+        "enrolled": args.slots,
+        "No available slots in this class": args.requests - args.slots,
+    }
+    if result["outcomes"] != expected:
+        failures.append(f"outcomes {result['outcomes']} != {expected}")
+    if result["enrollments"] != args.slots:
+        failures.append(f"enrollments {result['enrollments']} != {args.slots}")
+    if result["available_slots"] != 0:
+        failures.append(f"available_slots {result['available_slots']} != 0")
+    if args.min_rps and result["requests_per_s"] < args.min_rps:
+        failures.append(f"throughput {result['requests_per_s']} req/s < {args.min_rps}")
+
+    # Reenvio de alunos já inscritos com vagas sobrando: o índice único recusa
+    # e o rollback devolve a vaga reservada
+    engine = create_db_engine(database_uri)
+    try:
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with engine.begin() as conn:
+            conn.execute(Class.__table__.update().values(available_slots=args.slots))
+        with SessionLocal() as db:
+            enrolled_ids = list(db.scalars(select(Enrollment.student_id).limit(args.slots)))
+        retry = fire(SessionLocal, enroll_in_class, enrolled_ids, args.threads)
+        state = class_state(SessionLocal)
+    finally:
+        engine.dispose()
+    expected_retry = {"You are already enrolled in this class": len(enrolled_ids)}
+    if retry["outcomes"] != expected_retry:
+        failures.append(f"duplicate outcomes {retry['outcomes']} != {expected_retry}")
+    if state != {"enrollments": args.slots, "available_slots": args.slots}:
+        failures.append(f"after duplicates {state}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--slots", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--min-rps", type=float, default=0, help="vazão mínima exigida da versão atual (req/s)")
+    parser.add_argument("--database-uri", help="banco vazio a usar no lugar de um SQLite temporário (um por cenário)", nargs=2, metavar=("LEGACY_URI", "ATOMIC_URI"))
+    parser.add_argument("--output", default="benchmarks/results/enrollment_contention.json")
+    args = parser.parse_args()
+
+    results = {
+        "environment": environment_info(),
+        "requests": args.requests,
+        "slots": args.slots,
+        "threads": args.threads,
+    }
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        uris = args.database_uri or [
+            f"sqlite:///{os.path.join(tmp, f'{name}.db')}" for name in ("legacy", "atomic")
+        ]
+        for (name, enroll), uri in zip((("legacy", legacy_enroll), ("atomic", enroll_in_class)), uris):
+            results[name] = run_scenario(uri, enroll, args)
+            if name == "atomic":
+                failures = check_atomic(uri, results[name], args)
+
+    print(f"{'versão':<8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>9} {'inscrições':>11} {'vagas':>6} {'excesso':>8}")
+    for name in ("legacy", "atomic"):
+        r = results[name]
+        print(f"{name:<8} {r['requests_per_s']:>8} {r['p50_ms']:>8} {r['p95_ms']:>9} {r['enrollments']:>11} {r['available_slots']:>6} {r['oversold']:>8}")
+        print(f"         {r['outcomes']}")
+
+    results["failures"] = failures
+    write_results(results, args.output)
+    if failures:
+        for failure in failures:
+            print(f"✗ {failure}")
+        sys.exit(1)
+    print("✓ Contagens exatas: nenhuma vaga vendida em excesso nem inscrição duplicada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Benchmark: pico de logins x latência de um endpoint não relacionado.
+
+Popula um banco SQLite temporário com estudantes (senha com custo
+`PASSWORD_BCRYPT_ROUNDS`, 10 por padrão aqui) e alguns cursos e, durante
+`--duration` segundos, mantém `--logins` clientes fazendo POST /students/login
+em sequência enquanto `--readers` clientes consultam GET /courses/with-classes
+(um endpoint `def`, que depende do threadpool do Starlette).
+
+O cenário roda contra o login como era antes (`def`, bcrypt no threadpool) e
+contra o login atual (`async def`, bcrypt no pool de processos com fila
+limitada). Reporta logins/s, respostas 503 e a latência das leituras. As
+requisições vão pelo transporte ASGI do httpx, no mesmo processo.
+
+Executa: python -m benchmarks.login_storm --logins 400 --readers 20 --duration 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+_tmp_dir = tempfile.TemporaryDirectory()
+# Precisa valer antes de importar `app`: o engine e o pool de senhas são criados na importação
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(_tmp_dir.name, 'login.db')}"
+os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "10")
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import auth, courses
+from app.core import security
+from app.core.config import settings
+from app.db.session import Base, dispose_async_engine, engine, get_db
+from app.models.class_model import Class
+from app.models.course import Course
+from app.models.student import Student
+from app.schemas.student import StudentLogin
+from app.schemas.token import Token
+from benchmarks.common import environment_info, write_results
+
+PASSWORD = "senha-benchmark"
+
+
+# ========== LOGIN SÍNCRONO (versão anterior) ==========
+
+legacy_router = APIRouter()
+
+
+@legacy_router.post("/students/login", response_model=Token)
+def legacy_login(login_data: StudentLogin, db: Session = Depends(get_db)) -> Any:
+    student = db.query(Student).filter(Student.email == login_data.email).first()
+    if not student or not security.verify_password(login_data.password, student.hashed_password):
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+    return {"access_token": security.create_access_token(student.id), "token_type": "bearer"}
+
+
+def build_apps() -> Dict[str, FastAPI]:
+    legacy = FastAPI()
+    legacy.include_router(legacy_router)
+    legacy.include_router(courses.router, prefix="/courses")
+
+    current = FastAPI()
+    current.include_router(auth.router)
+    current.include_router(courses.router, prefix="/courses")
+    return {"threadpool": legacy, "process_pool": current}
+
+
+def seed(args) -> None:
+    Base.metadata.create_all(bind=engine)
+    hashed = security.get_password_hash(PASSWORD)
+    with engine.begin() as conn:
+        conn.execute(insert(Course), [
+            {"name": f"Curso {i}", "description": "Curso sintético", "workload": 40}
+            for i in range(args.courses)
+        ])
+        conn.execute(insert(Class), [
+            {
+                "course_id": i % args.courses + 1,
+                "name": f"Turma {i}",
+                "total_slots": 50,
+                "available_slots": 50,
+                "certificate_template": "default",
+                "is_open": True,
+            }
+            for i in range(args.courses * 2)
+        ])
+        conn.execute(insert(Student), [
+            {"name": f"Aluno {i}", "email": f"aluno{i}@example.com", "cpf": f"{i:011d}", "hashed_password": hashed}
+            for i in range(args.students)
+        ])
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+async def run_scenario(app: FastAPI, args) -> Dict[str, Any]:
+    counter = itertools.count()
+    login_latencies: List[float] = []
+    read_latencies: List[float] = []
+    statuses: Counter = Counter()
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        deadline = time.perf_counter() + args.duration
+
+        async def login_worker():
+            while time.perf_counter() < deadline:
+                n = next(counter) % args.students
+                start = time.perf_counter()
+                response = await client.post(
+                    "/students/login", json={"email": f"aluno{n}@example.com", "password": PASSWORD}
+                )
+                statuses[response.status_code] += 1
+                if response.status_code == 200:
+                    login_latencies.append(time.perf_counter() - start)
+                elif response.status_code == 503:
+                    await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+
+        async def read_worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get("/courses/with-classes")
+                if response.status_code == 200:
+                    read_latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(login_worker() for _ in range(args.logins)),
+            *(read_worker() for _ in range(args.readers)),
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "logins": summarize(login_latencies, elapsed),
+        "login_statuses": dict(statuses),
+        "reads": summarize(read_latencies, elapsed),
+    }
+
+
+async def run_all(args) -> Dict[str, Any]:
+    results = {}
+    for name, app in build_apps().items():
+        results[name] = await run_scenario(app, args)
+    results["process_pool"]["pool"] = security.password_hasher.stats()
+    await dispose_async_engine()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=400, help="clientes fazendo login em sequência")
+    parser.add_argument("--readers", type=int, default=20, help="clientes consultando /courses/with-classes")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--output", default="benchmarks/results/login_storm.json")
+    args = parser.parse_args()
+
+    seed(args)
+    results = {
+        "environment": environment_info(),
+        "logins": args.logins,
+        "readers": args.readers,
+        "duration_s": args.duration,
+        "bcrypt_rounds": settings.PASSWORD_BCRYPT_ROUNDS,
+    }
+    try:
+        results.update(asyncio.run(run_all(args)))
+    finally:
+        security.password_hasher.shutdown()
+        engine.dispose()
+        _tmp_dir.cleanup()
+
+    print(f"{'modo':<13} {'logins/s':>9} {'503':>6} {'leituras/s':>11} {'leit. p50 ms':>13} {'leit. p95 ms':>13}")
+    for name in ("threadpool", "process_pool"):
+        r = results[name]
+        print(
+            f"{name:<13} {r['logins']['requests_per_s']:>9} {r['login_statuses'].get(503, 0):>6} "
+            f"{r['reads']['requests_per_s']:>11} {r['reads']['p50_ms']!s:>13} {r['reads']['p95_ms']!s:>13}"
+        )
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: paginação por OFFSET x por cursor (keyset) em GET /students/.
+
+Popula um banco SQLite temporário (padrão: 200.000 estudantes) e mede o tempo
+de buscar a página N (1, 100, 1.000...) com `offset(skip).limit(limit)`, como
+era antes, e com `paginate` a partir do cursor da página anterior. Com OFFSET o
+banco percorre e descarta todas as linhas anteriores; com cursor o custo
+deveria ser o mesmo em qualquer página.
+
+Executa: python -m benchmarks.pagination --students 200000 --pages 1 100 1000 --output benchmarks/results/pagination.json
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import encode_cursor, paginate
+from app.db.session import Base
+from app.models.student import Student
+from benchmarks.common import environment_info, write_results
+
+
+def seed_students(engine, students: int) -> None:
+    """Popula a tabela de estudantes com inserts em lote."""
+    Base.metadata.create_all(bind=engine)
+    batch = 10000
+    with engine.begin() as conn:
+        for start in range(0, students, batch):
+            conn.execute(insert(Student), [
+                {"name": f"Aluno {i}", "email": f"aluno{i}@bench.local", "cpf": f"{i:011d}"}
+                for i in range(start, min(start + batch, students))
+            ])
+
+
+def offset_page(db, page: int, limit: int) -> List[Any]:
+    """Implementação anterior de list_all_students."""
+    return db.query(Student).offset((page - 1) * limit).limit(limit).all()
+
+
+def keyset_page(db, page: int, limit: int) -> List[Any]:
+    # Os ids são sequenciais, então o cursor que o cliente receberia ao fim
+    # da página anterior é o id da sua última linha
+    cursor = encode_cursor([(page - 1) * limit]) if page > 1 else None
+    rows, _ = paginate(db.query(Student), [Student.id], cursor, limit)
+    return rows
+
+
+def measure(engine, func: Callable, page: int, limit: int, repeat: int) -> Dict[str, Any]:
+    SessionLocal = sessionmaker(bind=engine)
+    timings = []
+    for _ in range(repeat):
+        db = SessionLocal()
+        start = time.perf_counter()
+        rows = func(db, page, limit)
+        timings.append(time.perf_counter() - start)
+        db.close()
+
+    expected_first_id = (page - 1) * limit + 1
+    assert rows and rows[0].id == expected_first_id, "página retornou linhas inesperadas"
+    return {
+        "page": page,
+        "rows": len(rows),
+        "best_ms": round(min(timings) * 1000, 2),
+        "mean_ms": round(sum(timings) / len(timings) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmarks/results/pagination.json")
+    args = parser.parse_args()
+
+    pages = [p for p in args.pages if (p - 1) * args.limit < args.students]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'pagination.db')}")
+        seed_students(engine, args.students)
+
+        results = {
+            "environment": environment_info(),
+            "students": args.students,
+            "limit": args.limit,
+            "offset": [measure(engine, offset_page, p, args.limit, args.repeat) for p in pages],
+            "keyset": [measure(engine, keyset_page, p, args.limit, args.repeat) for p in pages],
+        }
+        engine.dispose()
+
+    print(f"{'página':>8} {'offset (ms)':>12} {'cursor (ms)':>12}")
+    for off, key in zip(results["offset"], results["keyset"]):
+        print(f"{off['page']:>8} {off['best_ms']:>12.2f} {key['best_ms']:>12.2f}")
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark: requisições autenticadas com e sem o cache de autenticação.
+
+Popula um banco SQLite temporário com `--students` estudantes e faz
+`--requests` chamadas a GET /students/me (distribuídas entre os estudantes,
+com `--clients` clientes concorrentes), primeiro com o cache desligado (um
+SELECT em `students` por requisição, como antes) e depois ligado. Conta os
+SELECTs na tabela `students` e mede req/s.
+
+Ao final confere a invalidação: depois de um PUT /students/me, o GET seguinte
+precisa refletir o novo nome. Sai com código 1 se falhar.
+
+Executa: python -m benchmarks.principal_cache --requests 5000 --students 100
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+_tmp_dir = tempfile.TemporaryDirectory()
+# Precisa valer antes de importar `app`: o engine é criado na importação
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(_tmp_dir.name, 'principal.db')}"
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event, insert
+
+from app.api import deps
+from app.api.v1.endpoints import students
+from app.core import security
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.session import Base, dispose_async_engine, engine
+from app.models.student import Student
+from benchmarks.common import environment_info, write_results
+
+
+def seed(args) -> List[str]:
+    """Popula o banco e retorna um token por estudante."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Student), [
+            {"name": f"Aluno {i}", "email": f"aluno{i}@example.com", "cpf": f"{i:011d}"}
+            for i in range(args.students)
+        ])
+    return [security.create_access_token(i + 1) for i in range(args.students)]
+
+
+class SelectCounter:
+    """Conta os SELECTs que leem a tabela `students`."""
+
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM students" in statement:
+            self.count += 1
+
+
+async def run_scenario(app: FastAPI, tokens: List[str], counter: SelectCounter, args) -> Dict[str, Any]:
+    sequence = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+    counter.count = 0
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            nonlocal errors
+            while (n := next(sequence)) < args.requests:
+                start = time.perf_counter()
+                response = await client.get(
+                    "/students/me", headers={"Authorization": f"Bearer {tokens[n % len(tokens)]}"}
+                )
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "errors": errors,
+        "student_selects": counter.count,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+    }
+
+
+async def check_invalidation(app: FastAPI, token: str) -> List[str]:
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get("/students/me", headers=headers)
+        await client.put("/students/me", headers=headers, json={"name": "Nome Atualizado"})
+        name = (await client.get("/students/me", headers=headers)).json()["name"]
+    return [] if name == "Nome Atualizado" else [f"GET após PUT retornou nome desatualizado: {name!r}"]
+
+
+async def run_all(tokens: List[str], args) -> Dict[str, Any]:
+    app = FastAPI()
+    app.include_router(students.router, prefix="/students")
+    counter = SelectCounter()
+
+    results: Dict[str, Any] = {}
+    for name, max_entries in (("no_cache", 0), ("cache", settings.PRINCIPAL_CACHE_MAX_ENTRIES)):
+        deps.principal_cache = TTLCache(max_entries, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+        results[name] = await run_scenario(app, tokens, counter, args)
+        results[name]["cache"] = deps.principal_cache.stats()
+    results["failures"] = await check_invalidation(app, tokens[0])
+    await dispose_async_engine()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--output", default="benchmarks/results/principal_cache.json")
+    args = parser.parse_args()
+
+    tokens = seed(args)
+    results = {
+        "environment": environment_info(),
+        "requests": args.requests,
+        "students": args.students,
+        "clients": args.clients,
+    }
+    try:
+        results.update(asyncio.run(run_all(tokens, args)))
+    finally:
+        engine.dispose()
+        _tmp_dir.cleanup()
+
+    print(f"{'modo':<9} {'req/s':>8} {'SELECTs':>8} {'acertos':>8} {'p50 ms':>8} {'p95 ms':>8} {'erros':>6}")
+    for name in ("no_cache", "cache"):
+        r = results[name]
+        print(
+            f"{name:<9} {r['requests_per_s']:>8} {r['student_selects']:>8} {r['cache']['hit_rate']:>8} "
+            f"{r['p50_ms']!s:>8} {r['p95_ms']!s:>8} {r['errors']:>6}"
+        )
+
+    write_results(results, args.output)
+    if results["failures"]:
+        for failure in results["failures"]:
+            print(f"✗ {failure}")
+        sys.exit(1)
+    print("✓ Perfil atualizado visível na requisição seguinte")
+
+
+if __name__ == "__main__":
+    main()
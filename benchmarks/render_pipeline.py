@@ -0,0 +1,112 @@
+"""
+Benchmark do pipeline de renderização de certificados.
+
+Mede, sem rede e com dados sintéticos:
+- por template (ReportLab e HTML/xhtml2pdf): renders/s, pico de RSS e bytes por PDF;
+- geração do ZIP completo (iter_bulk_certificates_zip) para vários tamanhos de turma.
+
+Cada medição roda em um processo novo, para que o pico de RSS seja do próprio caso.
+
+Executa: python -m benchmarks.render_pipeline --output benchmarks/results/render.json
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List
+
+from benchmarks.common import environment_info, make_template_data, make_certificates, peak_rss_mb, write_results
+from app.services.pdf_service import iter_bulk_certificates_zip, prepare_bulk_jobs
+from app.services.templates.registry import TemplateRegistry
+
+
+def _measure_template(template_name: str, renders: int) -> Dict[str, Any]:
+    template = TemplateRegistry.get_template(template_name)
+    data = [make_template_data(i) for i in range(renders)]
+
+    # Aquecimento (imports, fontes, cache de templates)
+    template.render_bytes(data[0])
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for item in data:
+        total_bytes += len(template.render_bytes(item))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "template": template_name,
+        "renders": renders,
+        "seconds": round(elapsed, 4),
+        "renders_per_sec": round(renders / elapsed, 2),
+        "bytes_per_pdf": total_bytes // renders,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _measure_bulk_zip(template_name: str, class_size: int, workers: int) -> Dict[str, Any]:
+    certificates = make_certificates(class_size, template_name)
+    jobs = prepare_bulk_jobs(certificates, db=None)
+
+    zip_bytes = 0
+    start = time.perf_counter()
+    for chunk in iter_bulk_certificates_zip(jobs, workers=workers):
+        zip_bytes += len(chunk)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "template": template_name,
+        "class_size": class_size,
+        "workers": workers,
+        "seconds": round(elapsed, 4),
+        "zip_bytes": zip_bytes,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _run_isolated(func, *args) -> Dict[str, Any]:
+    """Executa a medição em um processo novo e captura falhas como resultado."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        try:
+            return executor.submit(func, *args).result()
+        except Exception as e:
+            return {"args": list(args), "error": f"{type(e).__name__}: {e}"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--templates", nargs="+", default=None, help="Templates a medir (padrão: todos os registrados)")
+    parser.add_argument("--renders", type=int, default=50, help="Renderizações por template")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 2000], help="Tamanhos de turma para o ZIP")
+    parser.add_argument("--zip-template", default="default")
+    parser.add_argument("--workers", type=int, default=0, help="Workers do pool no ZIP (0 = serial)")
+    parser.add_argument("--output", default="benchmarks/results/render_pipeline.json")
+    args = parser.parse_args()
+
+    template_names: List[str] = args.templates or [t["id"] for t in TemplateRegistry.list_templates()]
+
+    results: Dict[str, Any] = {"environment": environment_info(), "templates": [], "bulk_zip": []}
+
+    print(f"{'template':<18} {'renders/s':>10} {'KB/PDF':>8} {'RSS (MB)':>9}")
+    for name in template_names:
+        result = _run_isolated(_measure_template, name, args.renders)
+        results["templates"].append(result)
+        if "error" in result:
+            print(f"{name:<18} erro: {result['error']}")
+        else:
+            print(f"{name:<18} {result['renders_per_sec']:>10.2f} {result['bytes_per_pdf'] / 1024:>8.1f} {result['peak_rss_mb']:>9}")
+
+    print(f"\n{'alunos':>8} {'ZIP (s)':>9} {'ZIP (MB)':>9} {'RSS (MB)':>9}")
+    for size in args.sizes:
+        result = _run_isolated(_measure_bulk_zip, args.zip_template, size, args.workers)
+        results["bulk_zip"].append(result)
+        if "error" in result:
+            print(f"{size:>8} erro: {result['error']}")
+        else:
+            print(f"{size:>8} {result['seconds']:>9.2f} {result['zip_bytes'] / (1024 * 1024):>9.2f} {result['peak_rss_mb']:>9}")
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
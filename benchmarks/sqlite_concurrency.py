@@ -0,0 +1,180 @@
+"""
+Benchmark: leituras e inscrições concorrentes no SQLite, engine antigo x perfil atual.
+
+Popula um banco SQLite temporário com turmas e estudantes e, durante
+`--duration` segundos, roda em threads:
+
+- leitores: a lista paginada de alunos de uma turma (join estudante/inscrição)
+- escritores: uma inscrição (INSERT + UPDATE de vagas + COMMIT), como em POST /enrollments/
+
+O mesmo cenário roda com o engine anterior (só `check_same_thread=False`,
+journal em modo rollback) e com `create_db_engine` (WAL, synchronous=NORMAL,
+cache, mmap, busy_timeout e pool dimensionado). Mede operações/s, latências
+e erros "database is locked".
+
+Executa: python -m benchmarks.sqlite_concurrency --readers 8 --writers 4 --duration 10
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base, create_db_engine
+from app.models.class_model import Class
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+from benchmarks.common import environment_info, write_results
+
+ROSTER_SQL = text("""
+    SELECT students.id, students.name, students.email, enrollments.enrollment_date
+    FROM students JOIN enrollments ON enrollments.student_id = students.id
+    WHERE enrollments.class_id = :class_id
+    ORDER BY students.name, enrollments.id
+    LIMIT 50
+""")
+
+
+def legacy_engine(database_uri: str):
+    """Engine como era criado antes do perfil do SQLite."""
+    return create_engine(database_uri, connect_args={"check_same_thread": False})
+
+
+def seed(engine, students: int, classes: int, enrollments_per_class: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Course), [{"name": "Curso", "description": "Curso sintético", "workload": 40}])
+        conn.execute(insert(Class), [
+            {
+                "course_id": 1,
+                "name": f"Turma {i}",
+                "total_slots": students,
+                "available_slots": students - enrollments_per_class,
+                "certificate_template": "default",
+                "is_open": True,
+            }
+            for i in range(classes)
+        ])
+        conn.execute(insert(Student), [
+            {"name": f"Aluno {i}", "email": f"aluno{i}@bench.local", "cpf": f"{i:011d}"}
+            for i in range(students)
+        ])
+        conn.execute(insert(Enrollment), [
+            {"student_id": s, "class_id": c}
+            for c in range(1, classes + 1)
+            for s in range(1, enrollments_per_class + 1)
+        ])
+
+
+def run_scenario(engine, args) -> Dict[str, Any]:
+    SessionLocal = sessionmaker(bind=engine)
+    # Cada escrita usa um par (aluno, turma) ainda não inscrito
+    pairs = itertools.count()
+    deadline = time.perf_counter() + args.duration
+    latencies: Dict[str, List[float]] = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    lock = threading.Lock()
+
+    def read_op(db, n):
+        db.execute(ROSTER_SQL, {"class_id": n % args.classes + 1}).all()
+
+    def write_op(db, n):
+        i = next(pairs)
+        student_id = args.enrollments_per_class + 1 + i % (args.students - args.enrollments_per_class)
+        class_id = i // (args.students - args.enrollments_per_class) % args.classes + 1
+        db.execute(insert(Enrollment).values(student_id=student_id, class_id=class_id))
+        db.execute(
+            text("UPDATE classes SET available_slots = available_slots - 1 WHERE id = :id"),
+            {"id": class_id},
+        )
+        db.commit()
+
+    def worker(kind: str, op: Callable):
+        local: List[float] = []
+        failed = 0
+        n = 0
+        while time.perf_counter() < deadline:
+            db = SessionLocal()
+            start = time.perf_counter()
+            try:
+                op(db, n)
+                local.append(time.perf_counter() - start)
+            except OperationalError:
+                db.rollback()
+                failed += 1
+            finally:
+                db.close()
+            n += 1
+        with lock:
+            latencies[kind].extend(local)
+            errors[kind] += failed
+
+    threads = [threading.Thread(target=worker, args=("read", read_op)) for _ in range(args.readers)]
+    threads += [threading.Thread(target=worker, args=("write", write_op)) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with engine.connect() as conn:
+        journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+
+    result = {"journal_mode": journal_mode}
+    for kind, values in latencies.items():
+        values.sort()
+        result[kind] = {
+            "ops": len(values),
+            "ops_per_s": round(len(values) / args.duration, 1),
+            "errors": errors[kind],
+            "p50_ms": round(statistics.median(values) * 1000, 2) if values else None,
+            "p95_ms": round(values[int(len(values) * 0.95) - 1] * 1000, 2) if values else None,
+            "max_ms": round(values[-1] * 1000, 2) if values else None,
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument("--enrollments-per-class", type=int, default=500)
+    parser.add_argument("--output", default="benchmarks/results/sqlite_concurrency.json")
+    args = parser.parse_args()
+
+    results = {
+        "environment": environment_info(),
+        "readers": args.readers,
+        "writers": args.writers,
+        "duration_s": args.duration,
+    }
+    for name, factory in (("legacy", legacy_engine), ("tuned", create_db_engine)):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = factory(f"sqlite:///{os.path.join(tmp, 'concurrency.db')}")
+            seed(engine, args.students, args.classes, args.enrollments_per_class)
+            results[name] = run_scenario(engine, args)
+            engine.dispose()
+
+    print(f"{'engine':<8} {'journal':<8} {'tipo':<6} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>9} {'max ms':>9} {'erros':>6}")
+    for name in ("legacy", "tuned"):
+        r = results[name]
+        for kind in ("read", "write"):
+            k = r[kind]
+            print(f"{name:<8} {r['journal_mode']:<8} {kind:<6} {k['ops_per_s']:>8} {k['p50_ms']!s:>8} {k['p95_ms']!s:>9} {k['max_ms']!s:>9} {k['errors']:>6}")
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Migration: Add composite and unique indexes for the hot lookups
+
+This migration:
+1. Adds a unique index on enrollments (student_id, class_id)
+2. Adds an index on enrollments (class_id)
+3. Adds a unique index on certificates (student_id, course_id)
+4. Adds an index on classes (course_id, is_active)
+
+It only runs CREATE INDEX IF NOT EXISTS (no table rebuild), so it can run
+against a live database and be re-run safely. Each index is built in its own
+transaction, so writers wait for one index at a time, never for the whole run.
+
+The unique indexes are not created while duplicated enrollments or
+certificates (same student and course) exist; they are listed so they can be
+resolved by hand first.
+
+That the API lookups are planned with these indexes is checked by
+tests/test_query_plans.py, against the queries the endpoints actually emit.
+"""
+
+import sqlite3
+import os
+
+
+INDEXES = [
+    ("uq_enrollments_student_class", "CREATE UNIQUE INDEX IF NOT EXISTS uq_enrollments_student_class ON enrollments (student_id, class_id)"),
+    ("ix_enrollments_class_id", "CREATE INDEX IF NOT EXISTS ix_enrollments_class_id ON enrollments (class_id)"),
+    ("ix_certificates_student_course", "CREATE UNIQUE INDEX IF NOT EXISTS ix_certificates_student_course ON certificates (student_id, course_id)"),
+    ("ix_classes_course_active", "CREATE INDEX IF NOT EXISTS ix_classes_course_active ON classes (course_id, is_active)"),
+]
+
+
+def find_duplicate_enrollments(cursor):
+    """Return (student_id, class_id, count) for pairs enrolled more than once."""
+    cursor.execute("""
+        SELECT student_id, class_id, COUNT(*)
+        FROM enrollments
+        GROUP BY student_id, class_id
+        HAVING COUNT(*) > 1
+    """)
+    return cursor.fetchall()
+
+
+def find_duplicate_certificates(cursor):
+    """Return (student_id, course_id, count) for students with more than one certificate per course."""
+    cursor.execute("""
+        SELECT student_id, course_id, COUNT(*)
+        FROM certificates
+        GROUP BY student_id, course_id
+        HAVING COUNT(*) > 1
+    """)
+    return cursor.fetchall()
+
+
+def migrate():
+    """Execute the migration."""
+    db_path = "certify.db"
+
+    if not os.path.exists(db_path):
+        print(f"❌ Database file {db_path} not found!")
+        return False
+
+    try:
+        # isolation_level=None: each CREATE INDEX commits on its own
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        cursor = conn.cursor()
+
+        print("🔄 Applying migration...")
+
+        duplicates = find_duplicate_enrollments(cursor)
+        if duplicates:
+            print(f"   ⚠️  Found {len(duplicates)} duplicated enrollment(s) (student_id, class_id, count):")
+            for row in duplicates[:20]:
+                print(f"      {row}")
+            print("   Remove the extra rows (and fix available_slots) before running this migration again.")
+            conn.close()
+            return False
+
+        duplicates = find_duplicate_certificates(cursor)
+        if duplicates:
+            print(f"   ⚠️  Found {len(duplicates)} duplicated certificate(s) (student_id, course_id, count):")
+            for row in duplicates[:20]:
+                print(f"      {row}")
+            print("   Keep one certificate per student and course (the UUID already handed out) before running this migration again.")
+            conn.close()
+            return False
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing = {row[0] for row in cursor.fetchall()}
+
+        for index_name, statement in INDEXES:
+            if index_name in existing:
+                print(f"   ℹ️  {index_name} already exists")
+                continue
+            print(f"   📦 Creating {index_name}...")
+            cursor.execute(statement)
+            print(f"   ✅ {index_name} created")
+
+        print("\n✅ Migration completed successfully!")
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        if 'conn' in locals():
+            conn.close()
+        return False
+
+
+def rollback():
+    """Drop the indexes created by this migration."""
+    db_path = "certify.db"
+
+    if not os.path.exists(db_path):
+        print(f"❌ Database file {db_path} not found!")
+        return False
+
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    for index_name, _ in INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+        print(f"   🗑️  {index_name} dropped")
+    conn.close()
+    return True
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "migrate"
+
+    if command == "rollback":
+        sys.exit(0 if rollback() else 1)
+    else:
+        if migrate():
+            print("\n🎉 Migration successful!")
+        else:
+            print("\n⚠️  Migration failed. Please check the errors above.")
+            sys.exit(1)
@@ -0,0 +1,92 @@
+"""
+Migration: Normalize enrollment dates and index the class roster by date
+
+This migration:
+1. Rewrites enrollment_date values saved by CURRENT_TIMESTAMP
+   ("YYYY-MM-DD HH:MM:SS") in the format SQLAlchemy uses
+   ("YYYY-MM-DD HH:MM:SS.ffffff"), so the stored text sorts like the dates
+2. Adds an index on enrollments (class_id, enrollment_date, id)
+
+The roster (GET /classes/{id}/students?sort=enrollment_date) pages with
+`enrollment_date > cursor` on the raw column; mixed formats would make rows
+with the same timestamp compare as different and be skipped between pages.
+
+Both steps can be re-run safely.
+"""
+
+import sqlite3
+import os
+
+
+INDEX = "CREATE INDEX IF NOT EXISTS ix_enrollments_class_date ON enrollments (class_id, enrollment_date, id)"
+
+
+def migrate():
+    """Execute the migration."""
+    db_path = "certify.db"
+
+    if not os.path.exists(db_path):
+        print(f"❌ Database file {db_path} not found!")
+        return False
+
+    try:
+        conn = sqlite3.connect(db_path, timeout=30)
+        cursor = conn.cursor()
+
+        print("🔄 Applying migration...")
+
+        cursor.execute("""
+            UPDATE enrollments
+            SET enrollment_date = strftime('%Y-%m-%d %H:%M:%S', enrollment_date) || '.000000'
+            WHERE length(enrollment_date) = 19
+        """)
+        print(f"   ✅ {cursor.rowcount} enrollment date(s) normalized")
+        conn.commit()
+
+        print("   📦 Creating ix_enrollments_class_date...")
+        cursor.execute(INDEX)
+        conn.commit()
+        print("   ✅ ix_enrollments_class_date created")
+
+        print("\n✅ Migration completed successfully!")
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        if 'conn' in locals():
+            conn.close()
+        return False
+
+
+def rollback():
+    """Drop the index created by this migration (dates stay normalized)."""
+    db_path = "certify.db"
+
+    if not os.path.exists(db_path):
+        print(f"❌ Database file {db_path} not found!")
+        return False
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("DROP INDEX IF EXISTS ix_enrollments_class_date")
+    conn.commit()
+    conn.close()
+    print("   🗑️  ix_enrollments_class_date dropped")
+    return True
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "migrate"
+
+    if command == "rollback":
+        sys.exit(0 if rollback() else 1)
+    else:
+        if migrate():
+            print("\n🎉 Migration successful!")
+        else:
+            print("\n⚠️  Migration failed. Please check the errors above.")
+            sys.exit(1)
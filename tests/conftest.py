@@ -0,0 +1,157 @@
+"""
+Fixtures compartilhadas pelos testes.
+
+As variáveis de ambiente precisam valer antes de importar `app`: o engine, os
+caches e os diretórios de arquivos são configurados na importação.
+"""
+
+import os
+import re
+import tempfile
+
+_tmp_dir = tempfile.mkdtemp(prefix="certify-tests-")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(_tmp_dir, 'app.db')}"
+os.environ["PDF_CACHE_DIR"] = os.path.join(_tmp_dir, "pdf_cache")
+os.environ["STUDENT_IMPORT_DIR"] = os.path.join(_tmp_dir, "student_imports")
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401  (registra todos os modelos em Base.metadata)
+from app.db.session import Base, create_db_engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine SQLite em arquivo, com as tabelas criadas, exclusivo do teste."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+class QueryCounter:
+    """Conta os comandos SQL enviados ao banco enquanto está ativo."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+class PlanRecorder:
+    """Grava os SELECTs executados no engine para explicá-los depois."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def plans(self):
+        with self.engine.connect() as conn:
+            return [
+                " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+                for statement, parameters in self.statements
+            ]
+
+    def uses_index(self, index_name: str) -> bool:
+        pattern = re.compile(rf"INDEX {index_name}\b")
+        return any(pattern.search(plan) for plan in self.plans())
+
+
+@pytest.fixture
+def count_queries(engine):
+    return lambda: QueryCounter(engine)
+
+
+def seed_class(db, students: int, template: str = "default"):
+    """Cria um curso, uma turma e `students` alunos inscritos nela. Retorna a turma."""
+    from app.models.class_model import Class
+    from app.models.course import Course
+    from app.models.enrollment import Enrollment
+    from app.models.student import Student
+
+    course = Course(name="Curso", description="Curso de teste", workload=40)
+    db.add(course)
+    db.flush()
+    class_obj = Class(
+        course_id=course.id, name="Turma", total_slots=max(students, 1),
+        available_slots=max(students, 1), certificate_template=template, is_open=True,
+    )
+    db.add(class_obj)
+    db.flush()
+    for i in range(students):
+        student = Student(name=f"Aluno {i}", email=f"aluno{i}@example.com", cpf=f"{i:011d}")
+        db.add(student)
+        db.flush()
+        db.add(Enrollment(student_id=student.id, class_id=class_obj.id))
+    db.commit()
+    return class_obj
+
+
+@pytest.fixture
+def app_db():
+    """
+    Banco da aplicação (`app.db.session.engine`, o mesmo do engine assíncrono),
+    com as tabelas criadas e apagadas ao final do teste.
+    """
+    from app.db import session
+
+    Base.metadata.create_all(bind=session.engine)
+    db = session.SessionLocal()
+    yield db
+    db.close()
+    Base.metadata.drop_all(bind=session.engine)
+
+
+def call_app(app, requests):
+    """
+    Executa `requests(client)` com um httpx.AsyncClient ligado ao `app` e fecha o
+    engine assíncrono no mesmo event loop ao final. Retorna o resultado.
+    """
+    import asyncio
+
+    import httpx
+
+    from app.db.session import dispose_async_engine
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await requests(client)
+        finally:
+            await dispose_async_engine()
+
+    return asyncio.run(run())
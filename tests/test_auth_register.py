@@ -0,0 +1,48 @@
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import auth
+from app.core import security
+from app.models.student import Student
+from tests.conftest import call_app
+
+PAYLOAD = {"name": "João Silva", "email": "joao@example.com", "cpf": "52998224725", "password": "senha123"}
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(auth.router)
+    return app
+
+
+def register(app, payload=PAYLOAD):
+    async def requests(client):
+        return await client.post("/students/register", json=payload)
+    return call_app(app, requests)
+
+
+def test_register_creates_student(app, app_db):
+    response = register(app)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == PAYLOAD["email"]
+    assert app_db.query(Student).count() == 1
+
+
+@pytest.mark.parametrize("field, detail", [("email", "Email already registered"), ("cpf", "CPF already registered")])
+def test_concurrent_registration_returns_400(app, app_db, monkeypatch, field, detail):
+    other = {"email": "outro@example.com", "cpf": "11144477735", field: PAYLOAD[field]}
+
+    async def hash_while_another_request_registers(password):
+        # Simula um registro concorrente que termina enquanto a senha é processada
+        app_db.add(Student(name="Outro", hashed_password="x", **other))
+        app_db.commit()
+        return security.get_password_hash(password, rounds=4)
+
+    monkeypatch.setattr(security.password_hasher, "hash", hash_while_another_request_registers)
+    response = register(app)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": detail}
+    assert app_db.query(Student).count() == 1
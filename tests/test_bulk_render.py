@@ -0,0 +1,124 @@
+import io
+import zipfile
+from concurrent.futures import Future
+
+import pytest
+from fastapi import FastAPI
+from pypdf import PdfReader
+
+from app.api import deps
+from app.api.v1.endpoints import certificates
+from app.services import pdf_service
+from app.services.certificate_service import issue_class_certificates
+from app.services.pdf_service import iter_bulk_certificates_zip, iter_rendered_pdfs, prepare_bulk_jobs
+from tests.conftest import call_app, seed_class
+
+
+@pytest.fixture
+def jobs(db):
+    """Lote de 5 certificados `classic_stamped` (ReportLab, rápido de renderizar)."""
+    class_obj = seed_class(db, students=5, template="classic_stamped")
+    return prepare_bulk_jobs(issue_class_certificates(db, class_obj, class_obj.course), db)
+
+
+def rendered_text(rendered):
+    """(nome no ZIP, texto do PDF): os bytes mudam a cada render (data e ID do documento)."""
+    return [(arcname, PdfReader(io.BytesIO(pdf_bytes)).pages[0].extract_text()) for arcname, pdf_bytes in rendered]
+
+
+def test_process_pool_keeps_the_serial_order(jobs):
+    serial = rendered_text(iter_rendered_pdfs(jobs, workers=1))
+    parallel = rendered_text(iter_rendered_pdfs(jobs, workers=2))
+
+    assert parallel == serial
+    assert [arcname for arcname, _ in serial] == [arcname for _, arcname, _, _ in jobs]
+    assert all(f"Aluno {i}" in text for i, (_, text) in enumerate(serial))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failing_certificate_is_recorded_and_skipped(jobs, workers):
+    broken_uuid, broken_arcname, _, broken_data = jobs[1]
+    del broken_data["student_name"]
+    failures = []
+
+    rendered = list(iter_rendered_pdfs(jobs, workers=workers, failures=failures))
+
+    assert failures == [broken_uuid]
+    assert [arcname for arcname, _ in rendered] == [arcname for _, arcname, _, _ in jobs if arcname != broken_arcname]
+
+
+class RecordingExecutor:
+    """Executor síncrono que conta as renderizações submetidas e ainda não consumidas."""
+
+    instances = []
+
+    def __init__(self, max_workers):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        RecordingExecutor.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        result = future.result
+
+        def consume(*a):
+            self.in_flight -= 1
+            return result(*a)
+        future.result = consume
+        return future
+
+
+def test_in_flight_renders_are_bounded_by_twice_the_workers(monkeypatch):
+    RecordingExecutor.instances.clear()
+    monkeypatch.setattr(pdf_service, "ProcessPoolExecutor", RecordingExecutor)
+    monkeypatch.setattr(pdf_service, "_render_certificate_bytes", lambda template_name, data: b"%PDF-" + data["uuid"].encode())
+    jobs = [(f"uuid{i}", f"{i}.pdf", "default", {"uuid": f"uuid{i}"}) for i in range(20)]
+
+    rendered = iter_rendered_pdfs(jobs, workers=3)
+    first = next(rendered)
+    [executor] = RecordingExecutor.instances
+    # Antes de entregar o primeiro PDF só 2 * workers renders foram submetidos
+    assert first == ("0.pdf", b"%PDF-uuid0")
+    assert executor.in_flight == 6
+
+    assert len(list(rendered)) == 19
+    assert executor.max_in_flight == 6
+    assert executor.in_flight == 0
+
+
+def test_streamed_zip_is_valid_and_sent_per_certificate(jobs):
+    chunks = list(iter_bulk_certificates_zip(jobs, workers=1))
+
+    # Uma parte por certificado e o diretório central no fim
+    assert len(chunks) == len(jobs) + 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zipf:
+        assert zipf.testzip() is None
+        assert zipf.namelist() == [arcname for _, arcname, _, _ in jobs]
+        assert all(zipf.read(name).startswith(b"%PDF-") for name in zipf.namelist())
+
+
+def test_bulk_class_endpoint_streams_a_valid_zip(app_db):
+    class_obj = seed_class(app_db, students=3, template="classic_stamped")
+    app = FastAPI()
+    app.include_router(certificates.router, prefix="/certificates")
+    app.dependency_overrides[deps.get_current_active_superuser] = lambda: None
+
+    async def requests(client):
+        return await client.post("/certificates/bulk-class", params={"class_id": class_obj.id})
+
+    response = call_app(app, requests)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zipf:
+        assert zipf.testzip() is None
+        assert len(zipf.namelist()) == 3
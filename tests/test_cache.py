@@ -0,0 +1,55 @@
+from app.core.cache import TTLCache
+
+
+def test_set_and_get():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_stale_read_is_not_cached_after_invalidation():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    version = cache.version()          # leitor começa a consultar o banco
+    cache.invalidate("a")              # escritor faz commit e invalida
+    cache.set("a", "stale", version=version)
+    assert cache.get("a") is None
+
+
+def test_read_started_after_invalidation_is_cached():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.invalidate("a")
+    version = cache.version()
+    cache.set("a", "fresh", version=version)
+    assert cache.get("a") == "fresh"
+
+
+def test_invalidation_of_other_key_does_not_block_set():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    version = cache.version()
+    cache.invalidate("b")
+    cache.set("a", "fresh", version=version)
+    assert cache.get("a") == "fresh"
+
+
+def test_forgotten_invalidations_still_reject_older_reads():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    version = cache.version()
+    for key in ("a", "b", "c", "d"):   # "a" sai do registro de invalidações
+        cache.invalidate(key)
+    cache.set("a", "stale", version=version)
+    assert cache.get("a") is None
+
+
+def test_clear_rejects_reads_started_before_it():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    version = cache.version()
+    cache.clear()
+    cache.set("a", "stale", version=version)
+    assert cache.get("a") is None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TTLCache(max_entries=0, ttl_seconds=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
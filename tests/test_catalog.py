@@ -0,0 +1,84 @@
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import classes, courses
+from app.models.class_model import Class
+from app.models.course import Course
+from tests.conftest import call_app, seed_class
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(courses.router, prefix="/courses")
+    app.include_router(classes.router, prefix="/classes")
+    return app
+
+
+@pytest.fixture
+def catalog(app_db):
+    """5 cursos ativos (ids 1-5) e um inativo (id 6); o curso 1 tem a turma de seed_class."""
+    seed_class(app_db, students=2)
+    app_db.add_all([Course(name=f"Curso {i}", workload=10) for i in range(2, 6)])
+    app_db.add(Course(name="Curso removido", workload=10, is_active=False))
+    app_db.add(Class(course_id=1, name="Turma removida", total_slots=5, available_slots=5, is_active=False))
+    app_db.commit()
+
+
+def get(app, url, **params):
+    async def requests(client):
+        return await client.get(url, params=params)
+    return call_app(app, requests)
+
+
+def read_all_pages(app, url, limit):
+    items, pages, params = [], 0, {"limit": limit}
+    while True:
+        page = get(app, url, **params).json()
+        items.extend(page["items"])
+        pages += 1
+        if not page["next_cursor"]:
+            return items, pages
+        params["cursor"] = page["next_cursor"]
+
+
+def test_read_courses_lists_active_courses(app, catalog):
+    response = get(app, "/courses/")
+
+    assert response.status_code == 200
+    assert [course["name"] for course in response.json()["items"]] == ["Curso", "Curso 2", "Curso 3", "Curso 4", "Curso 5"]
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize("url", ["/courses/", "/courses/with-classes"])
+def test_course_pages_follow_the_cursor(app, catalog, url):
+    items, pages = read_all_pages(app, url, limit=2)
+
+    assert [course["id"] for course in items] == [1, 2, 3, 4, 5]
+    assert pages == 3
+
+
+def test_invalid_course_cursor_is_rejected(app, catalog):
+    assert get(app, "/courses/", cursor="nao-e-um-cursor").status_code == 400
+
+
+def test_courses_with_classes_counts_enrollments(app, catalog):
+    first = get(app, "/courses/with-classes", limit=1).json()["items"][0]
+
+    assert first["total_classes"] == 1
+    assert [(c["name"], c["enrolled_students"]) for c in first["classes"]] == [("Turma", 2)]
+
+
+def test_get_class(app, catalog):
+    response = get(app, "/classes/1")
+
+    assert response.status_code == 200
+    assert (response.json()["name"], response.json()["course_id"], response.json()["is_open"]) == ("Turma", 1, True)
+
+
+@pytest.mark.parametrize("class_id", [2, 999])
+def test_get_inactive_or_missing_class_returns_404(app, catalog, class_id):
+    response = get(app, f"/classes/{class_id}")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Class not found"}
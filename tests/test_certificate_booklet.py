@@ -0,0 +1,95 @@
+import io
+import tempfile
+
+import pytest
+from fastapi import FastAPI
+from pypdf import PdfReader
+
+from app.api import deps
+from app.api.v1.endpoints import certificates
+from app.core.config import settings
+from app.services.certificate_service import issue_class_certificates
+from app.services.pdf_service import prepare_bulk_jobs, write_class_booklet
+from app.services.templates.registry import TemplateRegistry
+from app.services.templates.stamped import StampedTemplate
+from tests.conftest import call_app, seed_class
+
+
+@pytest.fixture
+def app(app_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    seed_class(app_db, students=2)
+    app = FastAPI()
+    app.include_router(certificates.router, prefix="/certificates")
+    app.dependency_overrides[deps.get_current_active_superuser] = lambda: None
+    return app
+
+
+def request_booklet(app):
+    async def requests(client):
+        return await client.post("/certificates/bulk-class", params={"class_id": 1, "output": "booklet"})
+    return call_app(app, requests)
+
+
+def test_booklet_temp_file_is_removed_after_download(app, tmp_path, monkeypatch):
+    def fake_booklet(jobs, output):
+        output.write(b"%PDF-caderno")
+        return len(jobs)
+
+    monkeypatch.setattr(certificates, "write_class_booklet", fake_booklet)
+    response = request_booklet(app)
+
+    assert response.status_code == 200
+    assert response.content == b"%PDF-caderno"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_partial_booklet_is_removed_when_rendering_fails(app, tmp_path, monkeypatch):
+    def fake_booklet(jobs, output):
+        output.write(b"%PDF-parcial")
+        raise RuntimeError("falha na renderização")
+
+    monkeypatch.setattr(certificates, "write_class_booklet", fake_booklet)
+    with pytest.raises(RuntimeError):
+        request_booklet(app)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_booklet_is_refused_above_the_page_limit(app, tmp_path, monkeypatch):
+    def fake_booklet(jobs, output):
+        raise AssertionError("o caderno não deveria ser gerado")
+
+    monkeypatch.setattr(certificates, "write_class_booklet", fake_booklet)
+    monkeypatch.setattr(settings, "CERTIFICATE_BOOKLET_MAX_PAGES", 1)
+    response = request_booklet(app)
+
+    assert response.status_code == 400
+    assert "limited to 1 certificates (2 in this class)" in response.json()["detail"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_classic_stamped_booklet_shares_the_static_layer(db):
+    assert isinstance(TemplateRegistry.get_template("classic_stamped"), StampedTemplate)
+
+    class_obj = seed_class(db, students=3, template="classic_stamped")
+    jobs = prepare_bulk_jobs(issue_class_certificates(db, class_obj, class_obj.course), db)
+    output = io.BytesIO()
+
+    assert write_class_booklet(jobs, output) == 3
+    pages = PdfReader(output).pages
+    assert len(pages) == 3
+    assert "Aluno 2" in pages[2].extract_text()
+    static_forms = {page["/Resources"]["/XObject"].raw_get("/FormXob.Static_classic_stamped").idnum for page in pages}
+    assert len(static_forms) == 1
+
+
+def test_classic_stamped_pages_use_the_template_page_size(db):
+    template = TemplateRegistry.get_template("classic_stamped")
+    class_obj = seed_class(db, students=1, template="classic_stamped")
+    jobs = prepare_bulk_jobs(issue_class_certificates(db, class_obj, class_obj.course), db)
+    output = io.BytesIO()
+    write_class_booklet(jobs, output)
+
+    page = PdfReader(output).pages[0]
+    assert (float(page.mediabox.width), float(page.mediabox.height)) == pytest.approx(template.pagesize)
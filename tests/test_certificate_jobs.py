@@ -0,0 +1,151 @@
+import os
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from app.models.certificate import Certificate
+from app.models.certificate_job import CertificateJob
+from app.services import certificate_jobs, pdf_service
+from app.services.certificate_jobs import CertificateJobRunner
+from tests.conftest import seed_class
+
+
+@pytest.fixture
+def runner(engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(certificate_jobs, "SessionLocal", sessionmaker(autoflush=False, bind=engine))
+    monkeypatch.setattr(certificate_jobs, "JOBS_DIR", str(tmp_path / "jobs"))
+    runner = CertificateJobRunner(workers=1, lease_seconds=60, retention_hours=24)
+    yield runner
+    runner.shutdown()
+
+
+def fake_render(failing=()):
+    def render(template_name, data):
+        if data["uuid"] in failing:
+            raise RuntimeError("template quebrado")
+        return b"%PDF-" + data["uuid"].encode()
+    return render
+
+
+def test_failed_renders_mark_job_partial(db, runner, monkeypatch):
+    class_obj = seed_class(db, students=3)
+    job = CertificateJob(class_id=class_obj.id)
+    db.add(job)
+    db.commit()
+
+    # Emite antes para saber qual UUID vai falhar
+    from app.services.certificate_service import issue_class_certificates
+    certificates = issue_class_certificates(db, class_obj, class_obj.course)
+    failing = certificates[1].uuid
+    monkeypatch.setattr(pdf_service, "_render_certificate_bytes", fake_render({failing}))
+
+    runner._run(job.id)
+
+    db.refresh(job)
+    assert job.status == "partial"
+    assert job.total == 3
+    assert job.processed == 2
+    assert job.failed == 1
+    assert job.failed_uuids == [failing]
+    with zipfile.ZipFile(job.artifact_path) as zipf:
+        assert len(zipf.namelist()) == 2
+        assert not any(failing in name for name in zipf.namelist())
+
+
+def test_all_renders_failing_marks_job_failed(db, runner, monkeypatch):
+    class_obj = seed_class(db, students=2)
+    job = CertificateJob(class_id=class_obj.id)
+    db.add(job)
+    db.commit()
+
+    def broken(template_name, data):
+        raise RuntimeError("template quebrado")
+    monkeypatch.setattr(pdf_service, "_render_certificate_bytes", broken)
+
+    runner._run(job.id)
+
+    db.refresh(job)
+    assert job.status == "failed"
+    assert job.artifact_path is None
+
+
+def test_job_with_live_lease_is_not_processed_twice(db, runner, monkeypatch):
+    class_obj = seed_class(db, students=2)
+    job = CertificateJob(
+        class_id=class_obj.id, status="running", claimed_by="outro-worker",
+        lease_expires_at=datetime.utcnow() + timedelta(minutes=5),
+    )
+    db.add(job)
+    db.commit()
+    monkeypatch.setattr(pdf_service, "_render_certificate_bytes", fake_render())
+
+    runner._run(job.id)
+
+    db.refresh(job)
+    assert job.status == "running"
+    assert job.claimed_by == "outro-worker"
+    assert db.query(Certificate).count() == 0
+
+
+def test_job_with_expired_lease_is_taken_over(db, runner, monkeypatch):
+    class_obj = seed_class(db, students=2)
+    job = CertificateJob(
+        class_id=class_obj.id, status="running", claimed_by="worker-morto",
+        lease_expires_at=datetime.utcnow() - timedelta(seconds=1),
+    )
+    db.add(job)
+    db.commit()
+    monkeypatch.setattr(pdf_service, "_render_certificate_bytes", fake_render())
+
+    runner._run(job.id)
+
+    db.refresh(job)
+    assert job.status == "completed"
+    assert job.processed == 2
+    assert os.path.exists(job.artifact_path)
+
+
+def test_only_one_runner_claims_a_pending_job(db, engine, tmp_path, monkeypatch):
+    class_obj = seed_class(db, students=1)
+    job = CertificateJob(class_id=class_obj.id)
+    db.add(job)
+    db.commit()
+
+    first = CertificateJobRunner(workers=1, lease_seconds=60, retention_hours=24)
+    second = CertificateJobRunner(workers=1, lease_seconds=60, retention_hours=24)
+    session = sessionmaker(autoflush=False, bind=engine)
+    with session() as a, session() as b:
+        assert first._claim(a, job.id) is True
+        assert second._claim(b, job.id) is False
+
+
+def test_purge_expired_removes_old_artifacts(db, runner, tmp_path):
+    class_obj = seed_class(db, students=1)
+    jobs_dir = tmp_path / "jobs"
+    jobs_dir.mkdir()
+    old = datetime.utcnow() - timedelta(hours=25)
+    jobs = {}
+    for name, status, finished_at in [("old", "completed", old), ("recent", "completed", datetime.utcnow()), ("failed", "failed", old)]:
+        # Jobs terminados têm o ZIP; os que falharam deixam só os PDFs parciais
+        artifact = None
+        if status != "failed":
+            artifact = str(jobs_dir / f"{name}.zip")
+            (jobs_dir / f"{name}.zip").write_bytes(b"zip")
+        (jobs_dir / name).mkdir()
+        jobs[name] = CertificateJob(id=name, class_id=class_obj.id, status=status, artifact_path=artifact)
+        db.add(jobs[name])
+        db.flush()
+        db.execute(update(CertificateJob).where(CertificateJob.id == name).values(updated_at=finished_at))
+    db.commit()
+
+    assert runner.purge_expired() == 1
+
+    db.expire_all()
+    assert (jobs["old"].status, jobs["old"].artifact_path) == ("expired", None)
+    assert sorted(os.listdir(jobs_dir)) == ["recent", "recent.zip"]
+    assert jobs["recent"].status == "completed"
+    assert jobs["failed"].status == "failed"
+    assert runner.purge_expired() == 0
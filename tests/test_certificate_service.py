@@ -0,0 +1,109 @@
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.api.v1.endpoints import certificates
+from app.db import session
+from app.db.session import Base, create_db_engine
+from app.models.certificate import Certificate
+from app.services.certificate_service import issue_class_certificates
+from tests.conftest import QueryCounter, call_app, seed_class
+
+
+def count_issue_queries(tmp_path, students: int, repeat: bool = False) -> int:
+    """Consultas feitas por `issue_class_certificates` em uma turma com `students` alunos."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / f'issue_{students}_{repeat}.db'}")
+    Base.metadata.create_all(bind=engine)
+    try:
+        with sessionmaker(autoflush=False, bind=engine)() as db:
+            class_obj = seed_class(db, students=students)
+            course = class_obj.course
+            if repeat:
+                issue_class_certificates(db, class_obj, course)
+            db.expire_all()
+            with QueryCounter(engine) as counter:
+                certificates = issue_class_certificates(db, class_obj, course)
+            assert len(certificates) == students
+            assert db.query(Certificate).count() == students
+        return counter.count
+    finally:
+        engine.dispose()
+
+
+def test_query_count_does_not_grow_with_class_size(tmp_path):
+    assert count_issue_queries(tmp_path, 1) == count_issue_queries(tmp_path, 50)
+
+
+def test_reissue_query_count_does_not_grow_with_class_size(tmp_path):
+    assert count_issue_queries(tmp_path, 1, repeat=True) == count_issue_queries(tmp_path, 50, repeat=True)
+
+
+def test_reissue_reuses_existing_certificates(db):
+    class_obj = seed_class(db, students=3)
+    first = issue_class_certificates(db, class_obj, class_obj.course)
+    second = issue_class_certificates(db, class_obj, class_obj.course)
+
+    assert [c.uuid for c in second] == [c.uuid for c in first]
+    assert db.query(Certificate).count() == 3
+
+
+def test_empty_class_issues_nothing(db):
+    class_obj = seed_class(db, students=0)
+    assert issue_class_certificates(db, class_obj, class_obj.course) == []
+
+
+def test_second_certificate_for_the_same_course_is_rejected(db):
+    class_obj = seed_class(db, students=1)
+    db.add_all([Certificate(student_id=1, course_id=class_obj.course_id) for _ in range(2)])
+
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+
+def issue_concurrently_before_insert(engine, student_id, course_id):
+    """Grava um certificado por outra conexão logo antes do próximo INSERT em certificates."""
+    issued = []
+
+    def before_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO certificates") and not issued:
+            issued.append(True)
+            with engine.begin() as other:
+                other.execute(insert(Certificate), {"uuid": "concorrente", "student_id": student_id, "course_id": course_id})
+
+    event.listen(engine, "before_cursor_execute", before_insert)
+    return lambda: event.remove(engine, "before_cursor_execute", before_insert)
+
+
+def test_concurrent_issue_reuses_the_certificate_issued_first(engine, db):
+    class_obj = seed_class(db, students=2)
+    stop = issue_concurrently_before_insert(engine, student_id=1, course_id=class_obj.course_id)
+    try:
+        certificates = issue_class_certificates(db, class_obj, class_obj.course)
+    finally:
+        stop()
+
+    assert [(c.student_id, c.uuid == "concorrente") for c in certificates] == [(1, True), (2, False)]
+    assert db.query(Certificate).count() == 2
+
+
+def test_concurrent_single_certificate_returns_the_one_issued_first(app_db):
+    class_obj = seed_class(app_db, students=1)
+    app = FastAPI()
+    app.include_router(certificates.router, prefix="/certificates")
+    app.dependency_overrides[deps.get_current_active_superuser] = lambda: None
+
+    async def requests(client):
+        return await client.post("/certificates/single", params={"student_id": 1, "class_id": class_obj.id})
+
+    stop = issue_concurrently_before_insert(session.engine, student_id=1, course_id=class_obj.course_id)
+    try:
+        response = call_app(app, requests)
+    finally:
+        stop()
+
+    assert response.status_code == 200
+    assert response.json()["uuid"] == "concorrente"
+    assert app_db.query(Certificate).count() == 1
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app.db import session
+from app.db.session import create_async_db_engine, create_db_engine
+
+
+@pytest.mark.parametrize("uri", ["sqlite://", "sqlite:///:memory:", "sqlite:///file::memory:?uri=true"])
+def test_memory_sqlite_uses_static_pool(uri):
+    engine = create_db_engine(uri)
+    try:
+        assert isinstance(engine.pool, StaticPool)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER)"))
+        # Todas as conexões enxergam o mesmo banco em memória
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 0
+    finally:
+        engine.dispose()
+
+
+def test_file_sqlite_uses_sized_queue_pool(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    try:
+        assert isinstance(engine.pool, QueuePool)
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize("uri", ["sqlite+aiosqlite://", "sqlite+aiosqlite:///:memory:"])
+def test_async_memory_sqlite_uses_static_pool(uri):
+    async def check():
+        engine = create_async_db_engine(uri)
+        try:
+            assert isinstance(engine.pool, StaticPool)
+            async with engine.connect() as conn:
+                return (await conn.execute(text("SELECT 1"))).scalar()
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(check()) == 1
+
+
+def test_async_engine_is_created_on_first_use(monkeypatch):
+    # Importar o módulo não cria o engine assíncrono; um backend sem driver
+    # assíncrono só falha quando ele é pedido
+    monkeypatch.setattr(session, "_async_engine", None)
+    monkeypatch.setattr(session.settings, "SQLALCHEMY_DATABASE_URI", "mysql://user@localhost/db")
+    with pytest.raises(ValueError):
+        session.get_async_engine()
@@ -0,0 +1,242 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+
+from app.api import deps
+from app.api.v1.endpoints import enrollments
+from app.models.class_model import Class
+from app.models.course import Course
+from app.models.student import Student
+from tests.conftest import call_app, seed_class
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(enrollments.router, prefix="/enrollments")
+    return app
+
+
+def enroll(app, student: Student, class_id: int):
+    app.dependency_overrides[deps.get_current_active_student] = lambda: student
+
+    async def requests(client):
+        return await client.post("/enrollments/", params={"class_id": class_id})
+    return call_app(app, requests)
+
+
+def test_already_enrolled_student_in_full_class(app, app_db):
+    class_obj = seed_class(app_db, students=1)
+    class_obj.available_slots = 0
+    app_db.commit()
+
+    response = enroll(app, app_db.get(Student, 1), class_obj.id)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "You are already enrolled in this class"}
+
+
+def test_duplicate_enrollment_keeps_the_slot(app, app_db):
+    class_obj = seed_class(app_db, students=1)
+    class_obj.available_slots = 5
+    app_db.commit()
+
+    response = enroll(app, app_db.get(Student, 1), class_obj.id)
+
+    assert response.status_code == 400
+    app_db.expire_all()
+    assert app_db.get(Class, class_obj.id).available_slots == 5
+
+
+def test_full_class_rejects_new_students(app, app_db):
+    class_obj = seed_class(app_db, students=1)
+    class_obj.available_slots = 0
+    student = Student(name="Novo", email="novo@example.com", cpf="52998224725")
+    app_db.add(student)
+    app_db.commit()
+
+    response = enroll(app, student, class_obj.id)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "No available slots in this class"}
+
+
+def test_enrollment_reserves_a_slot(app, app_db):
+    class_obj = seed_class(app_db, students=0)
+    student = Student(name="Novo", email="novo@example.com", cpf="52998224725")
+    app_db.add(student)
+    app_db.commit()
+
+    response = enroll(app, student, class_obj.id)
+
+    assert response.status_code == 200
+    app_db.expire_all()
+    assert app_db.get(Class, class_obj.id).available_slots == 0
+
+
+@pytest.fixture
+def import_class(app, app_db):
+    """Turma aberta e vazia (3 vagas) e 4 alunos cadastrados. Retorna o id da turma."""
+    seed_class(app_db, students=4)
+    class_obj = Class(course_id=1, name="Turma B", total_slots=3, available_slots=3, is_open=True)
+    app_db.add(class_obj)
+    app_db.commit()
+    app.dependency_overrides[deps.get_current_active_superuser] = lambda: None
+    return class_obj.id
+
+
+def import_file(app, body: bytes, format: str = "csv", chunk_size: int = 7):
+    async def chunks():
+        # Pedaços pequenos: registros e caracteres UTF-8 chegam divididos
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    async def requests(client):
+        return await client.post("/enrollments/import", params={"format": format}, content=chunks())
+    return call_app(app, requests)
+
+
+def test_import_csv(app, app_db, import_class):
+    body = f"class_id,cpf,email\r\n{import_class},,aluno0@example.com\r\n{import_class},,aluno1@example.com\r\n"
+
+    report = import_file(app, body.encode()).json()
+
+    assert (report["total_rows"], report["enrolled"], report["failed"]) == (2, 2, 0)
+    assert report["enrolled_by_class"] == {str(import_class): 2}
+    app_db.expire_all()
+    assert app_db.get(Class, import_class).available_slots == 1
+
+
+def test_import_ndjson(app, app_db, import_class):
+    body = "\n".join([
+        f'{{"class_id": {import_class}, "email": "aluno0@example.com"}}',
+        "",
+        '{"class_id": 999, "email": "aluno1@example.com"}',
+        "[1, 2]",
+    ])
+
+    report = import_file(app, body.encode(), format="ndjson").json()
+
+    assert (report["total_rows"], report["enrolled"]) == (3, 1)
+    assert [(error["row"], error["detail"]) for error in report["errors"]] == [
+        (3, "Class not found"),
+        (4, "Each line must be a JSON object"),
+    ]
+
+
+def test_import_csv_with_quoted_newlines(app, app_db, import_class):
+    body = (
+        "class_id,cpf,email,observacao\n"
+        f'{import_class},,aluno0@example.com,"Transferido\nda turma A, com ""nota"""\n'
+        f"{import_class},,ninguem@example.com,\n"
+        f'{import_class},,aluno1@example.com,"ç\n\nã"\n'
+    )
+
+    report = import_file(app, body.encode()).json()
+
+    assert (report["total_rows"], report["enrolled"]) == (3, 2)
+    assert [(error["row"], error["detail"]) for error in report["errors"]] == [(4, "Student not found")]
+
+
+def test_import_stops_at_class_capacity_mid_batch(app, app_db, import_class, monkeypatch):
+    monkeypatch.setattr(enrollments.settings, "ENROLLMENT_IMPORT_BATCH_SIZE", 2)
+    body = "class_id,email\n" + "".join(f"{import_class},aluno{i}@example.com\n" for i in range(4))
+
+    report = import_file(app, body.encode()).json()
+
+    # Primeiro lote: 2 vagas; segundo lote: 1 vaga para 2 linhas
+    assert (report["enrolled"], report["failed"]) == (3, 1)
+    assert report["errors"] == [{"row": 5, "class_id": import_class, "student": "aluno3@example.com", "detail": "No available slots in this class"}]
+    app_db.expire_all()
+    assert app_db.get(Class, import_class).available_slots == 0
+
+
+def test_import_reports_duplicated_rows(app, app_db, import_class):
+    body = (
+        "class_id,email\n"
+        f"{import_class},aluno0@example.com\n"
+        f"{import_class},aluno0@example.com\n"
+        "1,aluno1@example.com\n"
+    )
+
+    report = import_file(app, body.encode()).json()
+
+    assert report["enrolled"] == 1
+    assert [(error["row"], error["detail"]) for error in report["errors"]] == [
+        (3, "Duplicated row"),
+        (4, "Student is already enrolled in this class"),
+    ]
+
+
+@pytest.fixture
+def available(app, app_db):
+    """
+    Turmas 1-4 abertas com vagas (1 e 2 no curso 1, 3 e 4 no curso 2); 5
+    fechada, 6 lotada e 7 removida ficam fora da listagem.
+    """
+    seed_class(app_db, students=2)
+    app_db.add(Course(name="Curso 2", workload=10))
+    app_db.add_all([
+        Class(course_id=1, name="Turma março", total_slots=5, available_slots=5, start_date=datetime(2026, 3, 1)),
+        Class(course_id=2, name="Turma abril", total_slots=5, available_slots=5, start_date=datetime(2026, 4, 1)),
+        Class(course_id=2, name="Turma maio", total_slots=5, available_slots=5, start_date=datetime(2026, 5, 1)),
+        Class(course_id=1, name="Turma fechada", total_slots=5, available_slots=5, is_open=False),
+        Class(course_id=1, name="Turma lotada", total_slots=5, available_slots=0),
+        Class(course_id=2, name="Turma removida", total_slots=5, available_slots=5, is_active=False),
+    ])
+    app_db.commit()
+    app.dependency_overrides[deps.get_current_active_student] = lambda: None
+
+
+def list_available(app, **params):
+    async def requests(client):
+        return await client.get("/enrollments/classes/available", params=params)
+    return call_app(app, requests)
+
+
+def test_available_classes_lists_open_classes_with_slots(app, available):
+    response = list_available(app)
+
+    assert response.status_code == 200
+    page = response.json()
+    assert [item["id"] for item in page["items"]] == [1, 2, 3, 4]
+    assert page["next_cursor"] is None
+    first = page["items"][0]
+    assert (first["name"], first["course_name"], first["enrollment_count"]) == ("Turma", "Curso", 2)
+    assert page["items"][2]["course_name"] == "Curso 2"
+
+
+@pytest.mark.parametrize("params, ids", [
+    ({"course_id": 2}, [3, 4]),
+    ({"starts_after": "2026-03-15T00:00:00"}, [3, 4]),
+    ({"starts_before": "2026-04-01T00:00:00"}, [2, 3]),
+    ({"course_id": 2, "starts_after": "2026-03-15T00:00:00", "starts_before": "2026-04-15T00:00:00"}, [3]),
+])
+def test_available_classes_filters(app, available, params, ids):
+    response = list_available(app, **params)
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == ids
+
+
+def test_available_classes_pages_follow_the_cursor(app, available):
+    ids, pages, params = [], 0, {"limit": 3}
+    while True:
+        page = list_available(app, **params).json()
+        ids.extend(item["id"] for item in page["items"])
+        pages += 1
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert ids == [1, 2, 3, 4]
+    assert pages == 2
+    # O cursor continua valendo com os filtros aplicados
+    first = list_available(app, course_id=2, limit=1).json()
+    second = list_available(app, course_id=2, limit=1, cursor=first["next_cursor"]).json()
+    assert [item["id"] for item in first["items"] + second["items"]] == [3, 4]
+
+
+def test_available_classes_rejects_an_invalid_cursor(app, available):
+    assert list_available(app, cursor="nao-e-base64!").status_code == 400
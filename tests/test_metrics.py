@@ -0,0 +1,31 @@
+from fastapi import FastAPI
+
+from app.api import deps
+from app.api.v1.endpoints import metrics
+from app.core.config import settings
+from tests.conftest import call_app
+
+
+def read_metrics():
+    app = FastAPI()
+    app.include_router(metrics.router, prefix="/metrics")
+    app.dependency_overrides[deps.get_current_active_superuser] = lambda: None
+
+    async def requests(client):
+        return await client.get("/metrics/")
+    return call_app(app, requests)
+
+
+def test_metrics_include_template_cache():
+    response = read_metrics()
+
+    assert response.status_code == 200
+    assert set(response.json()["template_cache"]) == {"hits", "misses", "entries"}
+
+
+def test_metrics_include_pdf_cache():
+    response = read_metrics()
+
+    stats = response.json()["pdf_cache"]
+    assert {"hits", "misses", "evictions", "entries", "size_bytes", "max_bytes"} <= set(stats)
+    assert stats["max_bytes"] == settings.PDF_CACHE_MAX_MB * 1024 * 1024
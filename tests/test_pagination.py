@@ -0,0 +1,100 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from sqlalchemy import text
+
+from app.api import deps
+from app.api.v1.endpoints import classes
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db import session
+from app.models.enrollment import Enrollment
+from tests.conftest import PlanRecorder, call_app, seed_class
+
+
+@pytest.mark.parametrize("values", [
+    [datetime(2026, 3, 1, 12, 30, 15, 250000), 7],
+    [datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc), 7],
+    [date(2026, 3, 1), 7],
+    ["Aluno 1", 42],
+])
+def test_cursor_round_trip(values):
+    assert decode_cursor(encode_cursor(values), len(values)) == values
+
+
+@pytest.mark.parametrize("cursor", ["nao-e-base64!", encode_cursor([1]), encode_cursor([{"dt": "ontem"}, 1])])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, 2)
+    assert exc_info.value.status_code == 400
+
+
+@pytest.fixture
+def roster(app_db):
+    """
+    Turma com 7 alunos: nomes e datas de inscrição repetidos, para que as
+    páginas terminem no meio de grupos empatados.
+    """
+    class_obj = seed_class(app_db, students=7)
+    base = datetime(2026, 3, 1, 9, 0)
+    enrollments = app_db.query(Enrollment).order_by(Enrollment.id).all()
+    for i, enrollment in enumerate(enrollments):
+        enrollment.student.name = ["Ana", "Bruno", "Ana", "Ana", "Bruno", "Carla", "Ana"][i]
+        enrollment.enrollment_date = base + timedelta(days=[2, 1, 1, 2, 1, 0, 2][i])
+    app_db.commit()
+    return class_obj, enrollments
+
+
+def roster_app():
+    app = FastAPI()
+    app.include_router(classes.router, prefix="/classes")
+    app.dependency_overrides[deps.get_current_active_superuser] = lambda: None
+    return app
+
+
+def read_all_pages(class_id, sort, limit):
+    async def requests(client):
+        ids, pages, params = [], 0, {"sort": sort, "limit": limit}
+        while True:
+            response = await client.get(f"/classes/{class_id}/students", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            ids.extend(item["id"] for item in page["items"])
+            pages += 1
+            if not page["next_cursor"]:
+                return ids, pages
+            params["cursor"] = page["next_cursor"]
+
+    return call_app(roster_app(), requests)
+
+
+@pytest.mark.parametrize("sort, key", [
+    ("name", lambda e: (e.student.name, e.id)),
+    ("enrollment_date", lambda e: (e.enrollment_date, e.id)),
+])
+def test_roster_pages_have_no_duplicated_or_skipped_rows(roster, sort, key):
+    class_obj, enrollments = roster
+
+    ids, pages = read_all_pages(class_obj.id, sort, limit=2)
+
+    assert ids == [e.student_id for e in sorted(enrollments, key=key)]
+    assert pages == 4
+
+
+def test_roster_by_enrollment_date_uses_class_date_index(roster):
+    class_obj, _ = roster
+
+    with PlanRecorder(session.engine) as recorder:
+        read_all_pages(class_obj.id, "enrollment_date", limit=2)
+
+    assert recorder.uses_index("ix_enrollments_class_date")
+    roster_plans = [plan for plan in recorder.plans() if "enrollments" in plan]
+    assert not any("TEMP B-TREE" in plan for plan in roster_plans)
+
+
+def test_enrollment_dates_are_stored_in_one_text_format(app_db):
+    seed_class(app_db, students=2)
+
+    stored = app_db.execute(text("SELECT enrollment_date FROM enrollments")).scalars().all()
+
+    assert all(len(value) == len("2026-03-01 09:00:00.000000") for value in stored)
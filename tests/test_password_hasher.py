@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.api.v1.endpoints import auth
+from app.core import security
+from app.core.security import PasswordHasher
+from app.models.student import Student
+from tests.conftest import call_app
+
+
+def thread_hasher(max_pending: int = 8) -> PasswordHasher:
+    """PasswordHasher com threads no lugar do pool de processos (enxerga os monkeypatches)."""
+    hasher = PasswordHasher(workers=2, max_pending=max_pending)
+    hasher._executor = ThreadPoolExecutor(2)
+    return hasher
+
+
+def test_operations_above_max_pending_are_rejected(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(security, "get_password_hash", lambda password: release.wait(5) and f"hash-{password}")
+    hasher = thread_hasher(max_pending=2)
+
+    async def run():
+        running = [asyncio.create_task(hasher.hash(password)) for password in ("a", "b")]
+        await asyncio.sleep(0)  # as duas ocupam as vagas antes da terceira
+        with pytest.raises(HTTPException) as exc_info:
+            await hasher.hash("c")
+        release.set()
+        return exc_info.value, await asyncio.gather(*running)
+
+    rejected, results = asyncio.run(run())
+    hasher.shutdown()
+
+    assert (rejected.status_code, rejected.headers) == (503, {"Retry-After": "1"})
+    assert results == ["hash-a", "hash-b"]
+    stats = hasher.stats()
+    assert (stats["pending"], stats["max_pending_seen"], stats["rejected"]) == (0, 2, 1)
+    assert stats["completed"] == {"hash": 2, "verify": 0}
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(auth.router)
+    return app
+
+
+@pytest.fixture
+def student(app_db):
+    student = Student(
+        name="João Silva", email="joao@example.com", cpf="52998224725",
+        hashed_password=security.get_password_hash("senha123", rounds=4),
+    )
+    app_db.add(student)
+    app_db.commit()
+    return student
+
+
+def login(app, password="senha123"):
+    async def requests(client):
+        return await client.post("/students/login", json={"email": "joao@example.com", "password": password})
+    return call_app(app, requests)
+
+
+def test_login_returns_503_with_retry_after_when_the_pool_is_full(app, student, monkeypatch):
+    hasher = thread_hasher(max_pending=1)
+    hasher._pending = 1  # uma operação já ocupa a única vaga
+    monkeypatch.setattr(security, "password_hasher", hasher)
+
+    response = login(app)
+    hasher.shutdown()
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_login_rehashes_password_with_the_current_cost(app, app_db, student, monkeypatch):
+    hasher = thread_hasher()
+    monkeypatch.setattr(security, "password_hasher", hasher)
+    monkeypatch.setattr(security.settings, "PASSWORD_BCRYPT_ROUNDS", 5)
+    assert security.needs_rehash(student.hashed_password)
+
+    response = login(app)
+    hasher.shutdown()
+
+    assert response.status_code == 200
+    app_db.refresh(student)
+    assert not security.needs_rehash(student.hashed_password)
+    assert security.verify_password("senha123", student.hashed_password)
+    assert hasher.stats()["rehashed"] == 1
+    # Com o custo atual, o próximo login não refaz o hash
+    assert login(app).status_code == 200
+    assert hasher.stats()["rehashed"] == 1
+
+
+def test_login_succeeds_when_the_rehash_is_refused(app, app_db, student, monkeypatch):
+    hasher = thread_hasher()
+    monkeypatch.setattr(security, "password_hasher", hasher)
+    monkeypatch.setattr(security.settings, "PASSWORD_BCRYPT_ROUNDS", 5)
+    old_hash = student.hashed_password
+
+    async def pool_full(password):
+        raise HTTPException(status_code=503, detail="busy", headers={"Retry-After": "1"})
+
+    monkeypatch.setattr(hasher, "hash", pool_full)
+    response = login(app)
+    hasher.shutdown()
+
+    assert response.status_code == 200
+    app_db.refresh(student)
+    assert student.hashed_password == old_hash
+    assert hasher.stats()["rehashed"] == 0
@@ -0,0 +1,129 @@
+import importlib.util
+import os
+import sys
+import threading
+
+import pytest
+
+from app.services import pdf_cache as pdf_cache_module
+from app.services.pdf_cache import PdfCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PdfCache(str(tmp_path), max_bytes=100)
+
+
+def test_put_and_get(cache):
+    cache.put("uuid1_a", b"pdf")
+
+    assert cache.get("uuid1_a") == b"pdf"
+    assert cache.get("uuid1_b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_new_version_replaces_previous_one(cache, tmp_path):
+    cache.put("uuid1_a", b"old")
+    cache.put("uuid2_a", b"other")
+    cache.put("uuid1_b", b"new")
+
+    assert cache.get("uuid1_a") is None
+    assert cache.get("uuid1_b") == b"new"
+    assert cache.get("uuid2_a") == b"other"
+    assert sorted(os.listdir(tmp_path)) == ["uuid1_b.pdf", "uuid2_a.pdf"]
+    assert cache.stats()["size_bytes"] == len(b"new") + len(b"other")
+
+
+def test_evicts_least_recently_used(cache):
+    cache.put("uuid1_a", b"x" * 40)
+    cache.put("uuid2_a", b"x" * 40)
+    cache.get("uuid1_a")
+    cache.put("uuid3_a", b"x" * 40)
+
+    assert cache.get("uuid2_a") is None
+    assert cache.get("uuid1_a") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_index_is_rebuilt_from_disk(cache, tmp_path):
+    cache.put("uuid1_a", b"old")
+    os.utime(tmp_path / "uuid1_a.pdf", (1, 1))
+    cache.put("uuid2_a", b"other")
+    # Versão anterior deixada por um processo que não chegou a removê-la
+    (tmp_path / "uuid1_b.pdf").write_bytes(b"new")
+
+    reloaded = PdfCache(str(tmp_path), max_bytes=100)
+
+    assert reloaded.get("uuid1_b") == b"new"
+    assert reloaded.get("uuid1_a") is None
+    assert not (tmp_path / "uuid1_a.pdf").exists()
+    assert reloaded.stats()["entries"] == 2
+
+
+def test_missing_file_is_a_miss(cache, tmp_path):
+    cache.put("uuid1_a", b"pdf")
+    os.remove(tmp_path / "uuid1_a.pdf")
+
+    assert cache.get("uuid1_a") is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["size_bytes"] == 0
+
+
+def test_file_io_happens_outside_the_lock(cache, monkeypatch):
+    held_during_io = []
+    real_replace, real_remove = os.replace, os.remove
+
+    def replace(src, dst):
+        held_during_io.append(cache._lock.locked())
+        return real_replace(src, dst)
+
+    def remove(path):
+        held_during_io.append(cache._lock.locked())
+        return real_remove(path)
+
+    monkeypatch.setattr(pdf_cache_module.os, "replace", replace)
+    monkeypatch.setattr(pdf_cache_module.os, "remove", remove)
+    cache.put("uuid1_a", b"old")
+    cache.put("uuid1_b", b"new")
+
+    assert held_during_io and not any(held_during_io)
+
+
+def test_concurrent_puts_keep_one_version_per_certificate(cache, tmp_path):
+    def writer(version):
+        for i in range(20):
+            cache.put(f"uuid{i}_{version}", b"pdf")
+
+    threads = [threading.Thread(target=writer, args=(version,)) for version in "abcd"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats()["size_bytes"] == 3 * cache.stats()["entries"] <= 100
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{key}.pdf" for key in cache._entries)
+
+
+def load_template_module(path, color, monkeypatch):
+    path.write_text(
+        "from app.services.templates.stamped import StampedTemplate\n\n\n"
+        "class Template(StampedTemplate):\n"
+        "    name = 'teste'\n"
+        "    description = 'teste'\n\n"
+        "    def draw_static(self, canvas):\n"
+        f"        canvas.setFillColor('{color}')\n"
+    )
+    spec = importlib.util.spec_from_file_location("template_teste", path)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, spec.name, module)
+    spec.loader.exec_module(module)
+    return module.Template()
+
+
+def test_template_version_follows_its_source(tmp_path, monkeypatch):
+    source = tmp_path / "template_teste.py"
+    red = load_template_module(source, "red", monkeypatch)
+
+    assert load_template_module(source, "red", monkeypatch).version == red.version
+    assert load_template_module(source, "blue", monkeypatch).version != red.version
@@ -0,0 +1,108 @@
+import pytest
+from fastapi import FastAPI
+
+from app.api import deps
+from app.api.v1.endpoints import metrics, students
+from app.core import security
+from app.db import session
+from app.models.student import Student
+from app.models.user import User
+from tests.conftest import QueryCounter, call_app
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    deps.principal_cache.clear()
+    yield
+    deps.principal_cache.clear()
+
+
+@pytest.fixture
+def student(app_db):
+    student = Student(
+        name="João Silva", email="joao@example.com", cpf="52998224725",
+        hashed_password=security.get_password_hash("senha123", rounds=4),
+    )
+    app_db.add(student)
+    app_db.commit()
+    return student
+
+
+def students_app():
+    app = FastAPI()
+    app.include_router(students.router, prefix="/students")
+    return app
+
+
+def auth(principal):
+    return {"Authorization": f"Bearer {security.create_access_token(principal.id)}"}
+
+
+def get_me(app, student):
+    async def requests(client):
+        return await client.get("/students/me", headers=auth(student))
+    return call_app(app, requests)
+
+
+def test_authenticated_student_is_served_from_the_cache(app_db, student):
+    app = students_app()
+    get_me(app, student)
+
+    with QueryCounter(session.engine) as counter:
+        assert get_me(app, student).status_code == 200
+
+    assert counter.count == 0
+
+
+def test_password_change_evicts_the_cached_student(app_db, student, monkeypatch):
+    async def fast_hash(password):
+        return security.get_password_hash(password, rounds=4)
+
+    monkeypatch.setattr(security.password_hasher, "hash", fast_hash)
+    app = students_app()
+    get_me(app, student)
+
+    async def requests(client):
+        return await client.put("/students/me", headers=auth(student), json={"password": "nova-senha"})
+
+    assert call_app(app, requests).status_code == 200
+    assert deps.principal_cache.get(("students", student.id)) is None
+
+    get_me(app, student)
+    cached = deps.principal_cache.get(("students", student.id))
+    assert security.verify_password("nova-senha", cached["hashed_password"])
+
+
+def test_deactivated_student_is_refused_after_eviction(app_db, student):
+    app = students_app()
+    assert get_me(app, student).status_code == 200
+
+    student.is_active = False
+    app_db.commit()
+    # Sem invalidar, o cache ainda serve o estudante ativo até o TTL expirar
+    assert get_me(app, student).status_code == 200
+
+    deps.invalidate_principal(student)
+    response = get_me(app, student)
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Inactive student account"}
+
+
+def test_revoked_admin_is_refused_after_eviction(app_db):
+    admin = User(email="admin@example.com", hashed_password="x", is_active=True, is_superuser=True)
+    app_db.add(admin)
+    app_db.commit()
+    app = FastAPI()
+    app.include_router(metrics.router, prefix="/metrics")
+
+    async def requests(client):
+        return await client.get("/metrics/", headers=auth(admin))
+
+    assert call_app(app, requests).status_code == 200
+
+    admin.is_superuser = False
+    app_db.commit()
+    deps.invalidate_principal(admin)
+
+    assert call_app(app, requests).status_code == 400
@@ -0,0 +1,54 @@
+"""
+Os índices da migração 002 conferidos contra as consultas reais da API: cada
+teste executa o endpoint/serviço, grava os SELECTs emitidos e roda
+EXPLAIN QUERY PLAN em cada um com os mesmos parâmetros.
+"""
+
+from fastapi import FastAPI
+
+from app.api import deps
+from app.api.v1.endpoints import courses, enrollments
+from app.db import session
+from app.models.student import Student
+from app.services.certificate_service import issue_class_certificates
+from tests.conftest import PlanRecorder, call_app, seed_class
+
+
+def test_issue_class_certificates_uses_enrollment_and_certificate_indexes(engine, db):
+    class_obj = seed_class(db, students=3)
+
+    with PlanRecorder(engine) as recorder:
+        issue_class_certificates(db, class_obj, class_obj.course)
+
+    assert recorder.uses_index("ix_enrollments_class_id")
+    assert recorder.uses_index("ix_certificates_student_course")
+
+
+def test_enroll_in_class_uses_unique_enrollment_index(app_db):
+    class_obj = seed_class(app_db, students=1)
+    student = app_db.get(Student, 1)
+    app = FastAPI()
+    app.include_router(enrollments.router, prefix="/enrollments")
+    app.dependency_overrides[deps.get_current_active_student] = lambda: student
+
+    async def requests(client):
+        return await client.post("/enrollments/", params={"class_id": class_obj.id})
+
+    with PlanRecorder(session.engine) as recorder:
+        assert call_app(app, requests).status_code == 400
+
+    assert recorder.uses_index("uq_enrollments_student_class")
+
+
+def test_courses_with_classes_uses_course_active_index(app_db):
+    seed_class(app_db, students=1)
+    app = FastAPI()
+    app.include_router(courses.router, prefix="/courses")
+
+    async def requests(client):
+        return await client.get("/courses/with-classes")
+
+    with PlanRecorder(session.engine) as recorder:
+        assert call_app(app, requests).status_code == 200
+
+    assert recorder.uses_index("ix_classes_course_active")
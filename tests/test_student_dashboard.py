@@ -0,0 +1,75 @@
+import pytest
+from fastapi import FastAPI
+
+from app.api import deps
+from app.api.v1.endpoints import students
+from app.db import session
+from app.models.class_model import Class
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+from app.services.certificate_service import issue_class_certificates
+from tests.conftest import QueryCounter, call_app, seed_class
+
+
+def dashboard(app_db, student_id: int):
+    student = app_db.get(Student, student_id)
+    app = FastAPI()
+    app.include_router(students.router, prefix="/students")
+    app.dependency_overrides[deps.get_current_active_student] = lambda: student
+
+    async def requests(client):
+        with QueryCounter(session.engine) as counter:
+            response = await client.get("/students/me/dashboard")
+        return response, counter.count
+    return call_app(app, requests)
+
+
+def add_class(app_db, course_id: int, name: str, is_open: bool = True) -> Class:
+    class_obj = Class(course_id=course_id, name=name, total_slots=5, available_slots=5, is_open=is_open)
+    app_db.add(class_obj)
+    app_db.commit()
+    return class_obj
+
+
+def test_dashboard_lists_enrollments_and_certificate_count(app_db):
+    first = seed_class(app_db, students=2)
+    issue_class_certificates(app_db, first, first.course)
+    second = add_class(app_db, first.course_id, "Turma fechada", is_open=False)
+    app_db.add(Enrollment(student_id=1, class_id=second.id))
+    app_db.commit()
+
+    response, _ = dashboard(app_db, student_id=1)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["student"]["email"] == "aluno0@example.com"
+    assert body["certificates_count"] == 1
+    assert [(e["class_name"], e["course_name"], e["is_open"]) for e in body["enrollments"]] == [
+        ("Turma", "Curso", True),
+        ("Turma fechada", "Curso", False),
+    ]
+
+
+def test_dashboard_of_student_without_enrollments(app_db):
+    seed_class(app_db, students=0)
+    app_db.add(Student(name="Novo", email="novo@example.com", cpf="52998224725"))
+    app_db.commit()
+
+    response, _ = dashboard(app_db, student_id=1)
+
+    assert response.json()["enrollments"] == []
+    assert response.json()["certificates_count"] == 0
+
+
+@pytest.mark.parametrize("enrollments", [1, 10])
+def test_dashboard_runs_one_query(app_db, enrollments):
+    class_obj = seed_class(app_db, students=1)
+    for i in range(enrollments - 1):
+        extra = add_class(app_db, class_obj.course_id, f"Turma {i}")
+        app_db.add(Enrollment(student_id=1, class_id=extra.id))
+    app_db.commit()
+
+    response, queries = dashboard(app_db, student_id=1)
+
+    assert len(response.json()["enrollments"]) == enrollments
+    assert queries == 1
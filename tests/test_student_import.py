@@ -0,0 +1,118 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.orm import sessionmaker
+
+from app.core import security
+from app.models.student import Student
+from app.models.student_import_job import StudentImportJob
+from app.schemas.student import StudentImportRow
+from app.services import student_import
+from app.services.student_import import StudentImportRunner, _prepare_batch
+
+HASH = security.get_password_hash("senha123", rounds=4)
+
+
+def row(**fields):
+    return {"name": "João Silva", "email": "joao@example.com", "cpf": "52998224725", **fields}
+
+
+@pytest.mark.parametrize("fields", [{"password": "senha123"}, {"hashed_password": HASH}])
+def test_row_accepts_exactly_one_password(fields):
+    assert StudentImportRow.model_validate(row(**fields))
+
+
+@pytest.mark.parametrize("fields", [
+    {},
+    {"password": "", "hashed_password": ""},
+    {"password": "senha123", "hashed_password": HASH},
+])
+def test_row_requires_exactly_one_password(fields):
+    with pytest.raises(ValidationError, match="exatamente um entre password e hashed_password"):
+        StudentImportRow.model_validate(row(**fields))
+
+
+def test_batch_reports_rows_without_password(db):
+    students, errors = _prepare_batch(db, [(2, row()), (3, row(email="maria@example.com", cpf="11144477735", hashed_password=HASH))], None, {})
+
+    assert [student["email"] for student in students] == ["maria@example.com"]
+    assert students[0]["hashed_password"] == HASH
+    assert errors == [{
+        "row": 2, "cpf": "52998224725", "email": "joao@example.com",
+        "detail": "informe exatamente um entre password e hashed_password",
+    }]
+
+
+@pytest.fixture
+def import_job(db, engine, tmp_path, monkeypatch):
+    """Job pendente com 6 estudantes em CSV (lotes de 2 linhas)."""
+    monkeypatch.setattr(student_import, "SessionLocal", sessionmaker(autoflush=False, bind=engine))
+    monkeypatch.setattr(student_import, "errors_path", lambda job_id: str(tmp_path / f"{job_id}.errors.ndjson"))
+    source = tmp_path / "alunos.csv"
+    source.write_text("name,email,cpf,hashed_password\n" + "".join(
+        f"Aluno {i},aluno{i}@example.com,{i:011d},{HASH}\n" for i in range(6)
+    ))
+    job = StudentImportJob(format="csv", source_path=str(source))
+    db.add(job)
+    db.commit()
+    return job
+
+
+def make_runner():
+    return StudentImportRunner(hash_workers=0, batch_size=2, lease_seconds=60)
+
+
+def test_runner_imports_job(db, import_job):
+    make_runner()._run(import_job.id)
+
+    db.refresh(import_job)
+    assert (import_job.status, import_job.imported, import_job.processed, import_job.resume_line) == ("completed", 6, 6, 7)
+    assert db.query(Student).count() == 6
+
+
+def test_job_with_live_lease_is_not_run_twice(db, import_job):
+    import_job.status = "running"
+    import_job.claimed_by = "outro-worker"
+    import_job.lease_expires_at = datetime.utcnow() + timedelta(minutes=5)
+    db.commit()
+
+    make_runner()._run(import_job.id)
+
+    db.refresh(import_job)
+    assert import_job.claimed_by == "outro-worker"
+    assert import_job.processed == 0
+    assert db.query(Student).count() == 0
+
+
+def test_two_runners_import_each_student_once(db, import_job):
+    runners = [make_runner(), make_runner()]
+    threads = [threading.Thread(target=runner._run, args=(import_job.id,)) for runner in runners]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    db.refresh(import_job)
+    assert (import_job.status, import_job.imported, import_job.failed) == ("completed", 6, 0)
+    assert db.query(Student).count() == 6
+
+
+def test_batch_is_rolled_back_when_the_lease_is_lost(db, import_job, monkeypatch):
+    runner = make_runner()
+    real_import_batch = runner._import_batch
+
+    def import_batch_then_lose_lease(session, job, batch, executor, errors_file):
+        real_import_batch(session, job, batch, executor, errors_file)
+        # Depois do primeiro lote, outro worker assume o job (posse expirada)
+        db.query(StudentImportJob).filter(StudentImportJob.id == job.id).update({"claimed_by": "outro-worker"})
+        db.commit()
+
+    monkeypatch.setattr(runner, "_import_batch", import_batch_then_lose_lease)
+    runner._run(import_job.id)
+
+    db.refresh(import_job)
+    assert import_job.claimed_by == "outro-worker"
+    assert (import_job.processed, import_job.resume_line) == (2, 3)
+    assert db.query(Student).count() == 2
@@ -0,0 +1,96 @@
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import students
+from app.db.session import get_async_engine
+from app.models.certificate import Certificate
+from app.models.course import Course
+from app.services.certificate_service import certificates_by_cpf_cache, issue_class_certificates
+from tests.conftest import QueryCounter, call_app, seed_class
+
+
+@pytest.fixture
+def app():
+    certificates_by_cpf_cache.clear()
+    app = FastAPI()
+    app.include_router(students.router, prefix="/students")
+    yield app
+    certificates_by_cpf_cache.clear()
+
+
+def add_certificates(db, student_id: int, count: int) -> None:
+    """Um certificado por curso novo (o índice único permite só um por aluno e curso)."""
+    courses = [Course(name=f"Curso extra {i}", workload=10) for i in range(count)]
+    db.add_all(courses)
+    db.flush()
+    db.add_all(
+        Certificate(student_id=student_id, course_id=course.id, template_id="default", data_snapshot={})
+        for course in courses
+    )
+    db.commit()
+
+
+def lookup_queries(app, cpf: str):
+    async def requests(client):
+        with QueryCounter(get_async_engine().sync_engine) as counter:
+            response = await client.get(f"/students/cpf/{cpf}/certificates")
+        return response, counter.count
+    return call_app(app, requests)
+
+
+def test_query_count_does_not_grow_with_certificates(app, app_db):
+    seed_class(app_db, students=2)
+    add_certificates(app_db, student_id=1, count=1)
+    add_certificates(app_db, student_id=2, count=20)
+
+    one, one_queries = lookup_queries(app, f"{0:011d}")
+    many, many_queries = lookup_queries(app, f"{1:011d}")
+
+    assert one.json()["total_certificates"] == 1
+    assert many.json()["total_certificates"] == 20
+    assert one_queries == many_queries == 1
+
+
+def test_cached_lookup_skips_the_database(app, app_db):
+    seed_class(app_db, students=1)
+    cpf = f"{0:011d}"
+    lookup_queries(app, cpf)
+
+    response, queries = lookup_queries(app, cpf)
+    assert response.status_code == 200
+    assert queries == 0
+
+
+def test_issuing_certificates_invalidates_cached_lookup(app, app_db):
+    class_obj = seed_class(app_db, students=1)
+    cpf = f"{0:011d}"
+
+    before, _ = lookup_queries(app, cpf)
+    assert before.json()["total_certificates"] == 0
+
+    issue_class_certificates(app_db, class_obj, class_obj.course)
+
+    after, queries = lookup_queries(app, cpf)
+    assert queries == 1
+    assert after.json()["total_certificates"] == 1
+
+
+def test_unknown_cpf_returns_404(app, app_db):
+    response, _ = lookup_queries(app, "99999999999")
+    assert response.status_code == 404
+
+
+def test_lookup_lists_only_the_students_certificates(app, app_db):
+    class_obj = seed_class(app_db, students=2)
+    issue_class_certificates(app_db, class_obj, class_obj.course)
+    add_certificates(app_db, student_id=1, count=1)
+
+    response, _ = lookup_queries(app, f"{0:011d}")
+
+    body = response.json()
+    assert body["student"] == {"name": "Aluno 0", "cpf": f"{0:011d}", "email": "aluno0@example.com"}
+    assert [(c["course_name"], c["download_url"]) for c in body["certificates"]] == [
+        ("Curso", "/api/v1/certificates/1/download"),
+        ("Curso extra 0", "/api/v1/certificates/3/download"),
+    ]
+    assert body["total_certificates"] == 2
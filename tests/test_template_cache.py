@@ -0,0 +1,33 @@
+import os
+
+from jinja2 import Environment
+
+from app.services.templates.html_template import TemplateCache
+
+
+def test_digest_follows_file_content(tmp_path):
+    cache = TemplateCache(Environment())
+    path = tmp_path / "certificado.html"
+    path.write_text("<p>{{ student_name }}</p>")
+
+    first = cache.digest(str(path))
+    assert cache.get(str(path)).render(student_name="Ana") == "<p>Ana</p>"
+    assert cache.digest(str(path)) == first
+
+    path.write_text("<h1>{{ student_name }}</h1>")
+    os.utime(path, (1, 1))
+
+    assert cache.digest(str(path)) != first
+    assert cache.stats() == {"hits": 2, "misses": 2, "entries": 1}
+
+
+def test_digest_after_clear_reloads_the_template(tmp_path):
+    cache = TemplateCache(Environment())
+    path = tmp_path / "certificado.html"
+    path.write_text("<p>{{ student_name }}</p>")
+    digest = cache.digest(str(path))
+
+    cache.clear()
+
+    assert cache.digest(str(path)) == digest
+    assert cache.stats()["entries"] == 1